@@ -0,0 +1,238 @@
+"""Local stand-in for the Sejm API and a Mattermost webhook, used by the benchmarks"""
+
+import gzip
+import hashlib
+import json
+import random
+import threading
+import time
+from datetime import datetime, timedelta
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlsplit
+
+ENDPOINTS = ("interpellations", "writtenQuestions")
+
+MINISTRIES = [
+    "Minister Zdrowia", "Minister Finansów", "Minister Edukacji", "Minister Infrastruktury",
+    "Minister Sprawiedliwości", "Minister Obrony Narodowej", "Minister Klimatu i Środowiska",
+    "Minister Spraw Wewnętrznych i Administracji", "Minister Rolnictwa i Rozwoju Wsi"
+]
+
+CLUBS = ["KO", "PiS", "PSL-TD", "Polska2050-TD", "Lewica", "Konfederacja", "Razem"]
+
+TOPICS = [
+    "ochrony zdrowia", "budowy obwodnicy", "finansowania szkół", "cen energii", "rolnictwa",
+    "transportu publicznego", "bezpieczeństwa", "ochrony środowiska", "cyfryzacji urzędów"
+]
+
+class FakeSejmApi:
+    """Synthetic Sejm API data with request counters and received webhook messages"""
+
+    def __init__(self, mp_count, items_per_type, seed=1, latency=0.0, term="10"):
+        self.mp_count = mp_count
+        self.items_per_type = items_per_type
+        self.latency = latency
+        self.term = term
+        self.random = random.Random(seed)
+        self.lock = threading.Lock()
+        self.items = {}
+        self.items_by_mp = {}
+        self.responses = {}
+        self.server = None
+        self.reset_counters()
+        self.generate()
+
+    def generate(self):
+        """Generate MPs, interpellations and written questions with replies"""
+        start = datetime(2023, 11, 13)
+        for endpoint in ENDPOINTS:
+            items = []
+            for num in range(1, self.items_per_type + 1):
+                receipt_date = start + timedelta(days=self.random.randint(0, 600))
+                authors = self.random.sample(range(1, self.mp_count + 1), min(self.mp_count, self.random.choice([1, 1, 1, 2, 3])))
+                item = {
+                    'num': num,
+                    'term': int(self.term),
+                    'title': f"w sprawie {self.random.choice(TOPICS)} ({endpoint} {num})",
+                    'from': [str(author) for author in authors],
+                    'to': self.random.sample(MINISTRIES, self.random.choice([1, 1, 2])),
+                    'receiptDate': receipt_date.strftime("%Y-%m-%d"),
+                    'sentDate': receipt_date.strftime("%Y-%m-%d"),
+                    'lastModified': (receipt_date + timedelta(days=1)).strftime("%Y-%m-%dT%H:%M:%S"),
+                    'links': [{'href': f"https://www.sejm.gov.pl/Sejm10.nsf/{endpoint}.xsp?key={num}", 'rel': "web"}],
+                    'replies': []
+                }
+                for _ in range(self.random.choice([0, 0, 1, 1, 2])):
+                    self.add_reply(item, receipt_date + timedelta(days=self.random.randint(5, 60)))
+                items.append(item)
+            self.items[endpoint] = items
+
+            index = {}
+            for item in items:
+                for author in item['from']:
+                    index.setdefault(author, []).append(item)
+            self.items_by_mp[endpoint] = index
+
+    def add_reply(self, item, date):
+        """Append a reply to an item"""
+        reply_number = len(item['replies']) + 1
+        item['replies'].append({
+            'key': f"R{item['num']}-{reply_number}-{self.random.randint(0, 10 ** 6)}",
+            'from': self.random.choice(item['to']),
+            'prolongation': self.random.random() < 0.15,
+            'onlyAttachment': False,
+            'receiptDate': date.strftime("%Y-%m-%d"),
+            'lastModified': date.strftime("%Y-%m-%dT%H:%M:%S")
+        })
+        item['lastModified'] = date.strftime("%Y-%m-%dT%H:%M:%S")
+
+    def add_new_replies(self, count):
+        """Add replies to random items and return the time of the change"""
+        with self.lock:
+            now = datetime.now()
+            for _ in range(count):
+                endpoint = self.random.choice(ENDPOINTS)
+                self.add_reply(self.random.choice(self.items[endpoint]), now)
+            self.responses.clear()
+            return time.time()
+
+    def reset_counters(self):
+        """Reset request counters and received webhook messages"""
+        with self.lock:
+            self.requests = {}
+            self.bytes_sent = 0
+            self.webhooks = []
+
+    def count_request(self, kind, size):
+        with self.lock:
+            self.requests[kind] = self.requests.get(kind, 0) + 1
+            self.bytes_sent += size
+
+    def get_list(self, endpoint, query):
+        """Get a page of a list endpoint filtered like the real API"""
+        if 'from' in query:
+            items = self.items_by_mp[endpoint].get(query['from'][0], [])
+        else:
+            items = self.items[endpoint]
+
+        if 'modifiedSince' in query:
+            modified_since = query['modifiedSince'][0]
+            items = [item for item in items if item['lastModified'] >= modified_since]
+
+        offset = int(query.get('offset', ['0'])[0])
+        limit = int(query.get('limit', ['50'])[0])
+        return items[offset:offset + limit]
+
+    def get_response(self, path, query):
+        """Get (kind, payload) for a GET path, or None if it does not exist"""
+        parts = path.strip('/').split('/')
+        if len(parts) < 3 or parts[0] != "sejm" or parts[1] != f"term{self.term}":
+            return None
+
+        resource = parts[2:]
+        if resource[0] in ENDPOINTS and len(resource) == 1:
+            return "list", self.get_list(resource[0], query)
+
+        if resource[0] in ENDPOINTS and len(resource) == 2 and resource[1].isdigit():
+            num = int(resource[1])
+            if not 1 <= num <= self.items_per_type:
+                return None
+            return "detail", self.items[resource[0]][num - 1]
+
+        if resource == ["MP"]:
+            return "mp", [self.get_mp(mp_id) for mp_id in range(1, self.mp_count + 1)]
+
+        if resource[0] == "MP" and len(resource) == 2 and resource[1].isdigit():
+            return "mp", self.get_mp(int(resource[1]))
+
+        return None
+
+    def get_mp(self, mp_id):
+        return {
+            'id': mp_id,
+            'firstLastName': f"Poseł Testowy {mp_id}",
+            'club': CLUBS[mp_id % len(CLUBS)],
+            'active': True
+        }
+
+    def start(self, port=0):
+        """Start serving in a background thread and return the base URL"""
+        self.server = FakeServer(('127.0.0.1', port), make_handler(self))
+        threading.Thread(target=self.server.serve_forever, name="fake-sejm-api", daemon=True).start()
+        return f"http://127.0.0.1:{self.server.server_address[1]}"
+
+    def stop(self):
+        if self.server is not None:
+            self.server.shutdown()
+            self.server.server_close()
+            self.server = None
+
+class FakeServer(ThreadingHTTPServer):
+    """Threading server with a listen backlog large enough for many parallel workers"""
+    daemon_threads = True
+    request_queue_size = 1024
+
+def make_handler(api):
+    """Build a request handler class bound to a FakeSejmApi"""
+
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+
+        def do_GET(self):
+            if api.latency:
+                time.sleep(api.latency)
+
+            url = urlsplit(self.path)
+            with api.lock:
+                cached = api.responses.get(self.path)
+
+            if cached is None:
+                with api.lock:
+                    result = api.get_response(url.path, parse_qs(url.query))
+                if result is None:
+                    self.send_body(404, b'{"error": "not found"}', "other")
+                    return
+                kind, payload = result
+                body = json.dumps(payload, ensure_ascii=False).encode('utf-8')
+                cached = (kind, body, '"%s"' % hashlib.md5(body).hexdigest())
+                with api.lock:
+                    api.responses[self.path] = cached
+
+            kind, body, etag = cached
+            if self.headers.get('If-None-Match') == etag:
+                api.count_request(kind, 0)
+                self.send_response(304)
+                self.send_header('ETag', etag)
+                self.send_header('Content-Length', '0')
+                self.end_headers()
+                return
+
+            self.send_body(200, body, kind, etag)
+
+        def do_POST(self):
+            length = int(self.headers.get('Content-Length', 0))
+            body = self.rfile.read(length)
+            with api.lock:
+                api.webhooks.append((time.time(), len(body)))
+            self.send_body(200, b"ok", "webhook")
+
+        def send_body(self, status, body, kind, etag=None):
+            headers = {'Content-Type': "application/json"}
+            if etag:
+                headers['ETag'] = etag
+            if 'gzip' in self.headers.get('Accept-Encoding', '') and len(body) > 1024:
+                body = gzip.compress(body, compresslevel=1)
+                headers['Content-Encoding'] = "gzip"
+
+            api.count_request(kind, len(body))
+            self.send_response(status)
+            for name, value in headers.items():
+                self.send_header(name, value)
+            self.send_header('Content-Length', str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, format, *args):
+            pass
+
+    return Handler
@@ -0,0 +1,165 @@
+"""Benchmark InterpelBot end to end against a local stand-in of the Sejm API
+
+Every scenario (number of MPs x fetch mode) runs the bot four times as a separate process,
+with its own config and data directory:
+
+  cold     - first run, no stored state
+  warm     - nothing changed in the API (response validators are collected)
+  idle     - nothing changed again (conditional requests can be answered with 304)
+  changes  - new replies were added just before the run
+
+For each run the wall time, peak memory (RSS), API requests by kind, bytes sent by the fake
+API and Mattermost messages are measured; for the "changes" run also the notification
+latency (time from the API change to the webhook receiving the message).
+
+Example:
+  python benchmarks/run_benchmarks.py --mps 1,10,100,460 --items 3000 --output results.json
+  python benchmarks/run_benchmarks.py --compare results.json
+"""
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+
+from fake_sejm_api import FakeSejmApi
+
+BOT_PATH = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "interpelbot.py")
+
+sys.path.insert(0, os.path.dirname(BOT_PATH))
+from interpelbot import get_percentile  # noqa: E402
+
+PHASES = ("cold", "warm", "idle", "changes")
+
+def run_bot(config_path, data_dir):
+    """Run the bot once as a child process; returns (seconds, peak RSS in MB or None, exit code)"""
+    env = dict(os.environ, INTERPELBOT_CONFIG=config_path, INTERPELBOT_DATA_DIR=data_dir)
+    env.pop('MATTERMOST_WEBHOOK_URL', None)
+
+    started_at = time.perf_counter()
+    process = subprocess.Popen([sys.executable, BOT_PATH], env=env, stdout=subprocess.DEVNULL, stderr=subprocess.PIPE)
+    if hasattr(os, 'wait4'):
+        # wait4 reports resource usage of this child only
+        _, status, usage = os.wait4(process.pid, 0)
+        process.returncode = os.waitstatus_to_exitcode(status)
+        peak_rss = usage.ru_maxrss / 1024
+    else:
+        process.wait()
+        peak_rss = None
+    seconds = time.perf_counter() - started_at
+
+    stderr = process.stderr.read().decode('utf-8', 'replace')
+    process.stderr.close()
+    if process.returncode:
+        print(stderr, file=sys.stderr)
+    return seconds, peak_rss, process.returncode
+
+def run_scenario(mp_count, fetch_mode, args):
+    """Run all phases of a scenario and return their measurements"""
+    api = FakeSejmApi(mp_count, args.items, seed=args.seed, latency=args.latency_ms / 1000)
+    base_url = api.start()
+
+    results = []
+    with tempfile.TemporaryDirectory(prefix="interpelbot-bench-") as work_dir:
+        data_dir = os.path.join(work_dir, "data")
+        config_path = os.path.join(work_dir, "config.json")
+        config = {
+            'sejm_term': api.term,
+            'sejm_api_url': base_url,
+            'mattermost_webhook_url': f"{base_url}/hook",
+            'mps': [{'id': str(mp_id), 'mattermost_users': f"@posel{mp_id}"} for mp_id in range(1, mp_count + 1)],
+            'fetch_mode': fetch_mode,
+            'max_workers': args.workers,
+            'state_backend': args.state_backend,
+            'incremental_sync': args.incremental,
+            'log_level': "warning",
+            'notifications': {'rate_per_second': 0, 'workers': args.workers}
+        }
+        with open(config_path, 'w', encoding='utf-8') as f:
+            json.dump(config, f)
+
+        for phase in PHASES:
+            changed_at = None
+            if phase == "changes":
+                changed_at = api.add_new_replies(args.new_replies)
+            api.reset_counters()
+
+            seconds, peak_rss, exit_code = run_bot(config_path, data_dir)
+
+            with api.lock:
+                requests = dict(api.requests)
+                bytes_sent = api.bytes_sent
+                webhooks = list(api.webhooks)
+
+            latencies = [received_at - changed_at for received_at, _ in webhooks] if changed_at else []
+            results.append({
+                'mps': mp_count,
+                'mode': fetch_mode,
+                'phase': phase,
+                'seconds': round(seconds, 3),
+                'peak_rss_mb': round(peak_rss, 1) if peak_rss is not None else None,
+                'requests': sum(count for kind, count in requests.items() if kind != "webhook"),
+                'requests_by_kind': requests,
+                'bytes': bytes_sent,
+                'messages': len(webhooks),
+                'latency_p50': get_percentile(latencies, 0.5, 3),
+                'latency_max': round(max(latencies), 3) if latencies else None,
+                'exit_code': exit_code
+            })
+
+    api.stop()
+    return results
+
+def print_results(results, baseline=None):
+    """Print results as a table, with time changes against a baseline if given"""
+    baseline_times = {(row['mps'], row['mode'], row['phase']): row['seconds'] for row in baseline or []}
+
+    header = f"{'posłów':>6} {'tryb':<7} {'faza':<8} {'czas [s]':>9} {'RSS [MB]':>9} {'zapytań':>8} {'kB':>9} {'wiad.':>6} {'opóźn. p50':>10} {'zmiana':>8}"
+    print(header)
+    print("-" * len(header))
+    for row in results:
+        previous = baseline_times.get((row['mps'], row['mode'], row['phase']))
+        change = f"{(row['seconds'] - previous) / previous * 100:+.0f}%" if previous else ""
+        latency = f"{row['latency_p50']:.3f}" if row['latency_p50'] is not None else ""
+        rss = f"{row['peak_rss_mb']:.1f}" if row['peak_rss_mb'] is not None else ""
+        print(f"{row['mps']:>6} {row['mode']:<7} {row['phase']:<8} {row['seconds']:>9.3f} {rss:>9} "
+              f"{row['requests']:>8} {row['bytes'] / 1024:>9.0f} {row['messages']:>6} {latency:>10} {change:>8}")
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark InterpelBot against a local fake of the Sejm API")
+    parser.add_argument('--mps', default="1,10,100,460", help="comma-separated MP counts (default: 1,10,100,460)")
+    parser.add_argument('--modes', default="per_mp,bulk", help="comma-separated fetch modes (default: per_mp,bulk)")
+    parser.add_argument('--items', type=int, default=3000, help="interpellations and written questions each (default: 3000)")
+    parser.add_argument('--new-replies', type=int, default=50, help="replies added before the 'changes' run (default: 50)")
+    parser.add_argument('--workers', type=int, default=4, help="max_workers of the bot (default: 4)")
+    parser.add_argument('--state-backend', default="json", choices=("json", "sqlite"))
+    parser.add_argument('--incremental', action='store_true', help="enable incremental_sync")
+    parser.add_argument('--latency-ms', type=float, default=0, help="artificial latency of every API response")
+    parser.add_argument('--seed', type=int, default=1)
+    parser.add_argument('--output', help="save results as JSON")
+    parser.add_argument('--compare', help="JSON results of an earlier benchmark to compare times against")
+    args = parser.parse_args()
+
+    baseline = None
+    if args.compare:
+        with open(args.compare, 'r', encoding='utf-8') as f:
+            baseline = json.load(f)['results']
+
+    results = []
+    for mp_count in [int(value) for value in args.mps.split(',')]:
+        for fetch_mode in args.modes.split(','):
+            print(f"⏱️  {mp_count} posłów, tryb {fetch_mode}...", file=sys.stderr)
+            results.extend(run_scenario(mp_count, fetch_mode, args))
+
+    print_results(results, baseline)
+
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump({'settings': vars(args), 'results': results}, f, indent=2)
+        print(f"\n💾 Wyniki zapisano do {args.output}", file=sys.stderr)
+
+if __name__ == "__main__":
+    main()
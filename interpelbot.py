@@ -1,7 +1,31 @@
 import requests
-from datetime import datetime
+from requests.adapters import HTTPAdapter
+from datetime import datetime, timedelta, timezone
+from functools import lru_cache
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from dataclasses import dataclass, field
 import os
 import json
+import argparse
+import codecs
+import csv
+import gzip
+import hashlib
+import heapq
+import io
+import random
+import re
+import shutil
+import signal
+import sqlite3
+import tempfile
+import threading
+import time
+from email.utils import parsedate_to_datetime
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlsplit
 
 # Dodane: ładowanie zmiennych środowiskowych z pliku .env jeśli istnieje
 try:
@@ -10,8 +34,1131 @@ try:
 except ImportError:
     pass
 
+# File locking is only available on POSIX systems (Docker image, Linux/macOS hosts)
+try:
+    import fcntl
+except ImportError:
+    fcntl = None
+
+# Default number of MPs processed in parallel (overridable with "max_workers" in config.json)
+DEFAULT_MAX_WORKERS = 4
+
+# Default fetch mode: "per_mp" queries lists per MP, "bulk" pulls term-wide lists once
+DEFAULT_FETCH_MODE = "per_mp"
+
+# Default number of items requested per page of a Sejm API list (overridable with "api_page_size")
+DEFAULT_API_PAGE_SIZE = 500
+
+# Default list parsing mode (overridable with "streaming_json" in config.json) - parse list
+# responses item by item while they download instead of loading whole pages into memory
+DEFAULT_STREAMING_JSON = True
+JSON_STREAM_CHUNK_SIZE = 64 * 1024
+JSON_WHITESPACE = re.compile(r'[ \t\n\r]*')
+JSON_VALUE_DELIMITERS = frozenset(",] \t\n\r")
+
+# Default sync settings (overridable with "incremental_sync" and "full_sync_hours" in config.json)
+DEFAULT_INCREMENTAL_SYNC = False
+DEFAULT_FULL_SYNC_HOURS = 24
+
+# Default full sync interval with polling tiers - stored items are re-checked by tier in between
+DEFAULT_TIERED_FULL_SYNC_HOURS = 720
+
+# Overlap subtracted from the last sync time when asking the API for modified items
+INCREMENTAL_SYNC_OVERLAP = timedelta(days=1)
+
+# Polling tiers of stored items, from the hottest
+POLLING_TIERS = ("awaiting", "prolongation", "answered")
+
+# Default polling tier settings (overridable with the "polling" section in config.json)
+DEFAULT_POLLING_SETTINGS = {
+    'tiers': False,               # Re-check stored items through the detail endpoint by tier
+    'awaiting_hours': 6.0,        # Items without any reply
+    'prolongation_hours': 3.0,    # Items whose last reply is a prolongation (the answer is due)
+    'answered_hours': 168.0,      # Items with a final reply
+    'max_checks_per_mp': 100      # Detail requests per MP and run (the most overdue first)
+}
+
+# Sejm API list endpoints and the item type each of them produces
+INTERPELLATION_ENDPOINTS = (
+    ("interpellations", "INT"),
+    ("writtenQuestions", "ZAP")
+)
+
+# Default for sending If-None-Match/If-Modified-Since (overridable with "conditional_requests")
+DEFAULT_CONDITIONAL_REQUESTS = True
+
+# Returned by list fetchers when every requested page answered 304 Not Modified
+NOT_MODIFIED = object()
+
+# Default state backend: "json" keeps interpel_{mp_id}.json files, "sqlite" a single database
+DEFAULT_STATE_BACKEND = "json"
+
+# Schema of the SQLite state store
+STATE_DB_SCHEMA = """
+CREATE TABLE IF NOT EXISTS interpellations (
+    id TEXT NOT NULL,
+    type TEXT NOT NULL,
+    title TEXT,
+    url TEXT,
+    from_ids TEXT,
+    replies INTEGER NOT NULL DEFAULT 0,
+    submission_date TEXT,
+    data TEXT NOT NULL,
+    updated_at REAL NOT NULL,
+    PRIMARY KEY (id, type)
+);
+CREATE TABLE IF NOT EXISTS replies (
+    interpellation_id TEXT NOT NULL,
+    type TEXT NOT NULL,
+    position INTEGER NOT NULL,
+    key TEXT,
+    prolongation INTEGER NOT NULL DEFAULT 0,
+    last_modified TEXT,
+    receipt_date TEXT,
+    author TEXT,
+    PRIMARY KEY (interpellation_id, type, position)
+);
+CREATE INDEX IF NOT EXISTS replies_key_idx ON replies (key);
+CREATE TABLE IF NOT EXISTS mp_interpellations (
+    mp_id TEXT NOT NULL,
+    id TEXT NOT NULL,
+    type TEXT NOT NULL,
+    position INTEGER NOT NULL,
+    PRIMARY KEY (mp_id, id, type)
+);
+CREATE INDEX IF NOT EXISTS mp_interpellations_item_idx ON mp_interpellations (id, type);
+CREATE TABLE IF NOT EXISTS meta (
+    key TEXT PRIMARY KEY,
+    value TEXT
+);
+"""
+
+# Default for writing interpel_{mp_id}.json without indentation (overridable with "compact_json")
+DEFAULT_COMPACT_JSON = False
+
+# Default daemon settings (overridable with the "daemon" section in config.json)
+DEFAULT_DAEMON_SETTINGS = {
+    'interval_minutes': 60.0,   # Time between the starts of two check cycles
+    'jitter_seconds': 60.0,     # Random delay added to every interval
+    'mp_stagger_seconds': 0.0,  # Delay between starting consecutive MPs within a cycle
+    'health_port': 8080,        # Port of the /health endpoint (0 disables it)
+    'metrics': False            # Serve Prometheus metrics on /metrics of the health port
+}
+
+# Logging settings (overridable with "log_level" and "log_format" in config.json)
+LOG_LEVELS = {'debug': 10, 'info': 20, 'warning': 30, 'error': 40}
+DEFAULT_LOG_LEVEL = "info"
+DEFAULT_LOG_FORMAT = "text"  # "text" (plain lines) or "json" (one JSON object per line)
+
+# Cache hit/miss counters reported as hit rates in the run metrics
+CACHE_METRICS = {
+    'mp_cache': ('mp_cache_hits', 'mp_cache_misses'),
+    'submission_dates': ('submission_date_cache_hits', 'submission_date_cache_misses'),
+    'conditional_requests': ('http_not_modified', 'http_modified')
+}
+
+# Default notification delivery settings (overridable with the "notifications" section in config.json)
+DEFAULT_NOTIFICATION_SETTINGS = {
+    'workers': 4,                      # Messages delivered concurrently
+    'rate_per_second': 2.0,            # Maximum webhook calls per second (0 = unlimited)
+    'retries_per_run': 3,              # Immediate attempts per message within a run
+    'retry_base_seconds': 60.0,        # Base of the exponential backoff between runs
+    'max_attempts': 10,                # Runs after which a message is given up on
+    'digest': False,                   # Pack several answers into one message
+    'max_message_length': 16000,       # Mattermost accepts up to 16383 characters per post
+    'delivered_retention_days': 30     # How long delivered message IDs are remembered
+}
+
+# Longest delay between two delivery attempts of a message
+MAX_RETRY_DELAY_SECONDS = 6 * 3600
+
+# Default answer deadline settings (overridable with the "deadlines" section in config.json)
+DEFAULT_DEADLINE_SETTINGS = {
+    'enabled': False,         # Track answer deadlines and notify about missed ones
+    'answer_days': 21,        # Days the recipient has to answer (art. 192 ust. 4 Regulaminu Sejmu)
+    'prolongation_days': 30,  # Days added by a prolongation, counted from its receipt date
+    'reminder_days': 3        # Remind this many days before the deadline (0 disables reminders)
+}
+
+# State ID of items followed only through subscriptions (bulk mode), stored like an MP's items
+SUBSCRIPTIONS_STATE_ID = "subscriptions"
+
+# Text normalization for subscription matching (Polish letters folded to ASCII)
+POLISH_TO_ASCII = str.maketrans("ąćęłńóśźżĄĆĘŁŃÓŚŹŻ", "acelnoszzACELNOSZZ")
+NON_ALPHANUMERIC = re.compile(r'[^a-z0-9]+')
+
+# Dimensions of the response time statistics ("term" has a single group covering everything)
+STATS_DIMENSIONS = ("term", "type", "ministry", "mp")
+STATS_NO_REPLY_GROUP = "(brak odpowiedzi)"
+
+# Version of stats.json; statistics stored by another version are rebuilt from the stored results
+STATS_VERSION = 2
+
+# Default API snapshot settings (overridable with the "snapshots" section in config.json)
+DEFAULT_SNAPSHOT_SETTINGS = {
+    'record': False,   # Store raw API responses of every run (same as --record)
+    'keep_runs': 20    # Recorded runs kept in the data directory (older ones are pruned)
+}
+
+# Base URL of the Sejm API (overridable with "sejm_api_url" in config.json)
+SEJM_API_BASE_URL = "https://api.sejm.gov.pl"
+
+# Headers sent with every request made by the shared HTTP client
+DEFAULT_HTTP_HEADERS = {
+    'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/134.0.6998.205 Safari/537.36',
+    'Accept': 'application/json',
+    'Accept-Language': 'pl-PL,pl;q=0.9,en;q=0.8',
+    'Accept-Encoding': 'gzip, deflate'
+}
+
+# Default HTTP client settings (overridable with the "http" section in config.json)
+DEFAULT_HTTP_SETTINGS = {
+    'pool_size': 10,          # Keep-alive connections kept per host
+    'connect_timeout': 5,     # Seconds to establish a connection
+    'timeout': 30,            # Seconds to wait for a Sejm API response
+    'webhook_timeout': 10,    # Seconds to wait for a Mattermost response
+    'retries': 3,             # Retries of a failed Sejm API request
+    'retry_backoff': 0.5,     # Base of the jittered exponential delay between retries
+    'retry_max_delay': 30.0,  # Longest delay between retries (also caps Retry-After)
+    'circuit_failures': 5,    # Consecutive failures after which the API host is considered down
+    'circuit_reset': 60.0,    # Seconds to fail fast before probing the API host again
+    'list_budget': 90.0,      # Total seconds (all attempts) for one list page
+    'detail_budget': 20.0,    # Total seconds (all attempts) for one interpellation detail
+    'mp_budget': 15.0         # Total seconds (all attempts) for one MP lookup
+}
+
+# Status codes worth retrying - the request may succeed once the API recovers
+RETRYABLE_STATUS_CODES = (429, 500, 502, 503, 504)
+
+# Shared HTTP client state
+_http_session = None
+_circuit_breakers = {}
+_circuit_breakers_lock = threading.Lock()
+_http_session_lock = threading.Lock()
+_http_settings = dict(DEFAULT_HTTP_SETTINGS)
+_sejm_api_base_url = SEJM_API_BASE_URL
+
+# Default MP cache settings (overridable with "mp_cache_ttl_hours" and "mp_cache_prefetch" in config.json)
+DEFAULT_MP_CACHE_TTL_HOURS = 168
+DEFAULT_MP_CACHE_PREFETCH = False
+
+# In-memory MP id -> name/club cache, persisted per term in the data directory
+_mp_cache = {}
+_mp_cache_lock = threading.Lock()
+_mp_cache_dirty = set()
+_mp_cache_ttl = DEFAULT_MP_CACHE_TTL_HOURS * 3600
+
+# Response validators (ETag/Last-Modified) per URL, persisted in the data directory
+_http_cache = {}
+_http_cache_used = set()
+_http_cache_lock = threading.Lock()
+_conditional_requests = DEFAULT_CONDITIONAL_REQUESTS
+
+# Fetching and sync state (per-MP time of the last incremental and full sync)
+_api_page_size = DEFAULT_API_PAGE_SIZE
+_streaming_json = DEFAULT_STREAMING_JSON
+_incremental_sync = DEFAULT_INCREMENTAL_SYNC
+_full_sync_interval = DEFAULT_FULL_SYNC_HOURS * 3600
+_sync_state = {}
+_sync_state_lock = threading.Lock()
+_item_checks = {}
+_sync_states = {}
+_polling_settings = dict(DEFAULT_POLLING_SETTINGS)
+_polled_items = {}
+_sync_run_started_at = None
+_detail_workers = DEFAULT_MAX_WORKERS
+_detail_executor = None
+_detail_executor_workers = None
+_detail_executor_lock = threading.Lock()
+
+# Submission dates looked up in the detail endpoint during this run (cleared every daemon cycle), keyed by (term, id, type)
+_submission_date_cache = {}
+_submission_date_cache_lock = threading.Lock()
+
+# SQLite state store connection shared by all workers (one per term, see _state_term)
+_state_backend = DEFAULT_STATE_BACKEND
+_state_db = None
+_state_dbs = {}
+_state_db_lock = threading.Lock()
+
+# Term whose per-MP state is in use and the term owning the data root (sejm_term); others use data/term{N}
+_state_term = None
+_root_state_term = None
+_root_state_checked = None
+
+# Serialization settings for state files
+_compact_json = DEFAULT_COMPACT_JSON
+
+# Daemon mode: state kept in memory between cycles, shutdown signal and health status
+_keep_state_warm = False
+_results_cache = {}
+_results_cache_lock = threading.Lock()
+_shutdown_event = threading.Event()
+_prometheus_enabled = False
+_daemon_status = {'started_at': None, 'cycles': 0, 'last_cycle_started_at': None,
+                  'last_cycle_finished_at': None, 'last_success_at': None, 'interval': None, 'jitter': None}
+_daemon_status_lock = threading.Lock()
+
+# Notification outbox persisted in the data directory and delivery rate limiting
+_outbox = None
+_outbox_lock = threading.Lock()
+_delivery_rate_lock = threading.Lock()
+_delivery_next_slot = 0.0
+
+# Answer deadlines of unanswered items (key -> Deadline) and a heap of (fire time, key, stage, due date)
+_deadlines = None
+_deadline_heap = []
+_deadline_settings = dict(DEFAULT_DEADLINE_SETTINGS)
+_deadlines_lock = threading.Lock()
+_deadlines_dirty = False
+
+# Response time statistics per term, updated from changesets (see update_stats)
+_stats = None
+_stats_lock = threading.Lock()
+_stats_dirty = False
+
+# API snapshots: responses recorded during this run (url -> entry) or the manifest being replayed
+_snapshot_recording = None
+_snapshot_replay = None
+_snapshot_dir = None
+_snapshot_lock = threading.Lock()
+_dry_run = False
+
+# Logging state (the MP being processed is kept per worker thread)
+_log_level = LOG_LEVELS[DEFAULT_LOG_LEVEL]
+_log_format = DEFAULT_LOG_FORMAT
+_log_context = threading.local()
+
+# Metrics of the current run, the last finished run and totals since start (for /metrics)
+_run_metrics = None
+_last_run_metrics = None
+_metrics_totals = {'runs': 0, 'failed_runs': 0, 'http_requests': {}, 'http_bytes': {}, 'events': {}, 'stage_seconds': {}}
+_metrics_lock = threading.Lock()
+
+# Configuration loaded once per run (or per config.json change in daemon mode)
+_config = None
+_config_mtime = None
+_config_lock = threading.Lock()
+_mp_routes_index = {}
+_configured_mp_ids = {}
+_subscriptions = None
+
+# Per-MP locks guarding reads and writes of interpel_{mp_id}.json files
+_mp_file_locks = {}
+_mp_file_locks_guard = threading.Lock()
+
+@dataclass(slots=True)
+class Reply:
+    """A reply to an interpellation, with the fields kept in the state"""
+    key: str = ''
+    prolongation: bool = False
+    last_modified: str = ''
+    receipt_date: str = ''
+    author: str = ''
+    
+    def get_id(self, position):
+        """Identify the reply within its interpellation (by key, or by position if it has none)"""
+        return self.key or f"#{position}"
+    
+    @classmethod
+    def from_api(cls, data):
+        """Build a reply from a Sejm API reply object"""
+        return cls(
+            key=data.get('key', ''),
+            prolongation=data.get('prolongation', False),
+            last_modified=data.get('lastModified', ''),
+            receipt_date=data.get('receiptDate', ''),
+            author=data.get('from', '')  # Use 'from' field as author information
+        )
+    
+    @classmethod
+    def from_dict(cls, data):
+        """Build a reply from its stored form"""
+        return cls(
+            key=data.get('key', ''),
+            prolongation=data.get('prolongation', False),
+            last_modified=data.get('lastModified', ''),
+            receipt_date=data.get('receiptDate', ''),
+            author=data.get('author', '')
+        )
+    
+    def to_dict(self):
+        """Get the stored form of the reply"""
+        return {
+            'key': self.key,
+            'prolongation': self.prolongation,
+            'lastModified': self.last_modified,
+            'receiptDate': self.receipt_date,
+            'author': self.author
+        }
+
+@dataclass(slots=True)
+class Interpellation:
+    """An interpellation or written question with its replies"""
+    id: str
+    type: str
+    title: str = ''
+    url: object = ''
+    from_ids: str = ''
+    replies: int = 0
+    replies_data: tuple = ()
+    submission_date: str = None
+    first_response_date: str = None
+    days_to_response: int = None
+    recipients: tuple = ()    # Addressees from the API 'to' field (e.g. "Minister Zdrowia")
+    
+    @property
+    def key(self):
+        """Identify the item - numbers are only unique within a type"""
+        return (self.id, self.type)
+    
+    @property
+    def submitted_on(self):
+        """Submission date, or the earliest reply receipt date if the API gave none"""
+        return self.submission_date or min(
+            (reply.receipt_date for reply in self.replies_data if reply.receipt_date), default=None)
+    
+    def update_timing(self):
+        """Compute the first response date and days to it (at ingest, or once the submission date is known)"""
+        self.first_response_date = min(
+            (reply.last_modified for reply in self.replies_data if reply.last_modified), default=None)
+        submitted_on = self.submitted_on
+        if submitted_on and self.first_response_date:
+            self.days_to_response = calculate_days_between_dates(submitted_on, self.first_response_date)
+        else:
+            self.days_to_response = None
+    
+    @classmethod
+    def from_dict(cls, data):
+        """Build an interpellation from its stored form (timing is computed if it was not stored)"""
+        item = cls(
+            id=str(data.get('id', '')),
+            type=data.get('type', ''),
+            title=data.get('title', ''),
+            url=data.get('url', ''),
+            from_ids=data.get('from', ''),
+            replies=data.get('replies', 0),
+            replies_data=tuple(
+                Reply.from_dict(reply) for reply in data.get('replies_data') or () if isinstance(reply, dict)
+            ),
+            submission_date=data.get('submission_date'),
+            first_response_date=data.get('first_response_date'),
+            days_to_response=data.get('days_to_response'),
+            recipients=tuple(data.get('to') or ())
+        )
+        if 'first_response_date' not in data:
+            item.update_timing()
+        return item
+    
+    def to_dict(self):
+        """Get the stored form of the interpellation (the interpel_{mp_id}.json item format)"""
+        return {
+            'id': self.id,
+            'type': self.type,
+            'title': self.title,
+            'url': self.url,
+            'from': self.from_ids,  # Keep original IDs for now
+            'replies': self.replies,
+            'replies_data': [reply.to_dict() for reply in self.replies_data],
+            'submission_date': self.submission_date,
+            'first_response_date': self.first_response_date,
+            'days_to_response': self.days_to_response,
+            'to': list(self.recipients)
+        }
+
+@dataclass(slots=True)
+class NewAnswer:
+    """New replies to an interpellation, as reported to Mattermost"""
+    id: str
+    type: str
+    title: str
+    url: object
+    from_names: str
+    previous_replies: int
+    current_replies: int
+    new_count: int
+    has_prolongation: bool = False
+    reply_authors: tuple = ()
+    mattermost_users: str = ''
+    submission_date: str = None
+    first_response_date: str = None
+    days_to_response: int = None
+    reply_ids: tuple = ()
+    routes: tuple = ()    # (webhook URL, Mattermost users) pairs to notify - not stored in the outbox
+    
+    @property
+    def key(self):
+        """Identify the interpellation the answer belongs to"""
+        return (self.id, self.type)
+    
+    @classmethod
+    def from_dict(cls, data):
+        """Build a new answer from its stored form (the notification outbox)"""
+        return cls(
+            id=data['id'],
+            type=data['type'],
+            title=data.get('title', ''),
+            url=data.get('url', ''),
+            from_names=data.get('from', ''),
+            previous_replies=data.get('previous_replies', 0),
+            current_replies=data.get('current_replies', 0),
+            new_count=data.get('new_count', 0),
+            has_prolongation=data.get('has_prolongation', False),
+            reply_authors=tuple(data.get('reply_authors') or ()),
+            mattermost_users=data.get('mattermost_users', ''),
+            submission_date=data.get('submission_date'),
+            first_response_date=data.get('first_response_date'),
+            days_to_response=data.get('days_to_response'),
+            reply_ids=tuple(data.get('reply_ids') or ())
+        )
+    
+    def to_dict(self):
+        """Get the stored form of the new answer"""
+        return {
+            'id': self.id,
+            'type': self.type,
+            'title': self.title,
+            'url': self.url,
+            'from': self.from_names,
+            'previous_replies': self.previous_replies,
+            'current_replies': self.current_replies,
+            'new_count': self.new_count,
+            'has_prolongation': self.has_prolongation,
+            'reply_authors': list(self.reply_authors),
+            'mattermost_users': self.mattermost_users,
+            'submission_date': self.submission_date,
+            'first_response_date': self.first_response_date,
+            'days_to_response': self.days_to_response,
+            'reply_ids': list(self.reply_ids)
+        }
+
+@dataclass(slots=True)
+class Deadline:
+    """Answer deadline of an unanswered interpellation, as kept by the deadline engine"""
+    id: str
+    type: str
+    term: str
+    title: str = ''
+    url: object = ''
+    from_ids: str = ''
+    submission_date: str = None
+    due_date: str = None      # Last day to answer (YYYY-MM-DD)
+    prolonged: bool = False
+    notified: tuple = ()      # Stages already notified for this due date
+    recipients: tuple = ()
+    
+    @property
+    def key(self):
+        return f"{self.term}:{self.type}:{self.id}"
+    
+    @classmethod
+    def from_dict(cls, data):
+        """Build a deadline from its stored form (deadlines.json)"""
+        return cls(
+            id=data['id'],
+            type=data['type'],
+            term=data['term'],
+            title=data.get('title', ''),
+            url=data.get('url', ''),
+            from_ids=data.get('from', ''),
+            submission_date=data.get('submission_date'),
+            due_date=data.get('due_date'),
+            prolonged=data.get('prolonged', False),
+            notified=tuple(data.get('notified') or ()),
+            recipients=tuple(data.get('to') or ())
+        )
+    
+    def to_dict(self):
+        """Get the stored form of the deadline"""
+        return {
+            'id': self.id,
+            'type': self.type,
+            'term': self.term,
+            'title': self.title,
+            'url': self.url,
+            'from': self.from_ids,
+            'submission_date': self.submission_date,
+            'due_date': self.due_date,
+            'prolonged': self.prolonged,
+            'notified': list(self.notified),
+            'to': list(self.recipients)
+        }
+
+@dataclass(slots=True)
+class DeadlineAlert:
+    """A reminder about an upcoming deadline or a missed one, as reported to Mattermost"""
+    id: str
+    type: str
+    title: str
+    url: object
+    from_names: str
+    stage: str                # "reminder" or "overdue"
+    due_date: str
+    prolonged: bool = False
+    submission_date: str = None
+    mattermost_users: str = ''
+    
+    @classmethod
+    def from_dict(cls, data):
+        """Build an alert from its stored form (the notification outbox)"""
+        return cls(
+            id=data['id'],
+            type=data['type'],
+            title=data.get('title', ''),
+            url=data.get('url', ''),
+            from_names=data.get('from', ''),
+            stage=data['stage'],
+            due_date=data['due_date'],
+            prolonged=data.get('prolonged', False),
+            submission_date=data.get('submission_date'),
+            mattermost_users=data.get('mattermost_users', '')
+        )
+    
+    def to_dict(self):
+        """Get the stored form of the alert"""
+        return {
+            'id': self.id,
+            'type': self.type,
+            'title': self.title,
+            'url': self.url,
+            'from': self.from_names,
+            'stage': self.stage,
+            'due_date': self.due_date,
+            'prolonged': self.prolonged,
+            'submission_date': self.submission_date,
+            'mattermost_users': self.mattermost_users
+        }
+
+@dataclass(slots=True)
+class SubscriptionRule:
+    """A subscription from config - any of its clubs, ministries or keywords matches an item"""
+    name: str
+    mattermost_users: str = ''
+    webhook_url: str = None   # None posts to the main webhook
+    clubs: tuple = ()
+    ministries: tuple = ()
+    keywords: tuple = ()
+    
+    @classmethod
+    def from_config(cls, data, index):
+        def as_tuple(value):
+            if not value:
+                return ()
+            return (value,) if isinstance(value, str) else tuple(value)
+        
+        return cls(
+            name=data.get('name') or f"subscriptions[{index}]",
+            mattermost_users=data.get('mattermost_users', ''),
+            webhook_url=data.get('webhook_url') or None,
+            clubs=as_tuple(data.get('club')) + as_tuple(data.get('clubs')),
+            ministries=as_tuple(data.get('ministry')) + as_tuple(data.get('ministries')),
+            keywords=as_tuple(data.get('keywords'))
+        )
+
+class TitleMatcher:
+    """Aho-Corasick automaton finding every keyword in a normalized title in a single pass"""
+    __slots__ = ('goto', 'fail', 'outputs')
+    
+    def __init__(self, patterns):
+        """Build the automaton from a dict of pattern -> set of rule indexes"""
+        self.goto = [{}]
+        outputs = [set()]
+        for pattern, rule_indexes in patterns.items():
+            state = 0
+            for char in pattern:
+                next_state = self.goto[state].get(char)
+                if next_state is None:
+                    next_state = self.goto[state][char] = len(self.goto)
+                    self.goto.append({})
+                    outputs.append(set())
+                state = next_state
+            outputs[state].update(rule_indexes)
+        
+        # Failure links in breadth-first order, so shorter suffixes are always done first
+        self.fail = [0] * len(self.goto)
+        queue = deque(self.goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for char, next_state in self.goto[state].items():
+                queue.append(next_state)
+                fallback = self.fail[state]
+                while fallback and char not in self.goto[fallback]:
+                    fallback = self.fail[fallback]
+                self.fail[next_state] = self.goto[fallback].get(char, 0)
+                outputs[next_state] |= outputs[self.fail[next_state]]
+        self.outputs = [frozenset(output) for output in outputs]
+    
+    def match(self, text):
+        """Get indexes of rules with a keyword found in the text"""
+        goto, fail, outputs = self.goto, self.fail, self.outputs
+        state = 0
+        found = set()
+        for char in text:
+            while state and char not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(char, 0)
+            if outputs[state]:
+                found |= outputs[state]
+        return found
+
+class SubscriptionMatcher:
+    """Subscription rules compiled into club and ministry indexes and a title keyword automaton
+    
+    Every item is matched once, independently of the number of rules.
+    """
+    __slots__ = ('rules', 'clubs', 'ministries', 'titles')
+    
+    def __init__(self, rules):
+        self.rules = rules
+        self.clubs = {}
+        self.ministries = {}
+        keywords = {}
+        for index, rule in enumerate(rules):
+            for club in rule.clubs:
+                self.clubs.setdefault(normalize_text(club), set()).add(index)
+            for ministry in rule.ministries:
+                self.ministries.setdefault(normalize_text(ministry), set()).add(index)
+            for keyword in rule.keywords:
+                # Keywords match the beginning of a word, so "szpital" also finds "szpitali"
+                keywords.setdefault(" " + normalize_text(keyword), set()).add(index)
+        self.titles = TitleMatcher(keywords) if keywords else None
+    
+    def match(self, title, recipients, clubs):
+        """Get the rules matching an item, in config order"""
+        found = set()
+        if self.titles is not None:
+            found |= self.titles.match(f" {normalize_text(title)} ")
+        for recipient in recipients:
+            found |= self.ministries.get(normalize_text(recipient), set())
+        for club in clubs:
+            found |= self.clubs.get(normalize_text(club), set())
+        return [self.rules[index] for index in sorted(found)]
+
+@dataclass(slots=True)
+class ResponseStats:
+    """Item counts and a days-to-response histogram of a group of interpellations
+    
+    The histogram keeps one bucket per day, so it is exact, mergeable (bucket-wise sums) and
+    an item can be retracted when it changes.
+    """
+    items: int = 0
+    answered: int = 0
+    days: dict = field(default_factory=dict)   # Days to the first response -> number of items
+    
+    def add(self, answered, days, sign=1):
+        """Add an item (or retract it with sign=-1)"""
+        self.items += sign
+        if answered:
+            self.answered += sign
+        if days is not None:
+            count = self.days.get(days, 0) + sign
+            if count:
+                self.days[days] = count
+            else:
+                self.days.pop(days, None)
+    
+    def merge(self, other):
+        """Add the items of another group"""
+        self.items += other.items
+        self.answered += other.answered
+        for days, count in other.days.items():
+            self.days[days] = self.days.get(days, 0) + count
+    
+    @property
+    def timed(self):
+        return sum(self.days.values())
+    
+    def mean(self):
+        if not self.timed:
+            return None
+        return sum(days * count for days, count in self.days.items()) / self.timed
+    
+    def percentile(self, fraction):
+        """Get the nearest-rank percentile of days to response, or None without timed items"""
+        total = self.timed
+        if not total:
+            return None
+        rank = max(1, -(-total * fraction // 1))
+        seen = 0
+        for days in sorted(self.days):
+            seen += self.days[days]
+            if seen >= rank:
+                return days
+        return None
+    
+    @classmethod
+    def from_dict(cls, data):
+        return cls(items=data.get('items', 0), answered=data.get('answered', 0),
+                   days={int(days): count for days, count in (data.get('days') or {}).items()})
+    
+    def to_dict(self):
+        return {'items': self.items, 'answered': self.answered,
+                'days': {str(days): count for days, count in sorted(self.days.items())}}
+
+@dataclass(slots=True)
+class ItemChange:
+    """Difference between the stored and the current version of an interpellation"""
+    item: Interpellation
+    previous: Interpellation = None
+    added_replies: tuple = ()
+    removed_replies: tuple = ()
+    added_reply_ids: tuple = ()
+
+@dataclass(slots=True)
+class Changeset:
+    """Difference between the stored and the current results of an MP"""
+    added: list = field(default_factory=list)      # ItemChange of items not stored before
+    changed: list = field(default_factory=list)    # ItemChange of stored items whose data changed
+    removed: list = field(default_factory=list)    # Stored items no longer returned
+    initial: bool = False                          # Nothing was stored before
+    baseline_added: bool = False                   # Added items are a new baseline (subscriptions changed)
+    
+    def __bool__(self):
+        return bool(self.added or self.changed or self.removed)
+    
+    @property
+    def changed_items(self):
+        """Current versions of added and changed items"""
+        return [change.item for change in self.added + self.changed]
+    
+    @property
+    def with_new_replies(self):
+        """Changes of items that received replies not seen before"""
+        return [change for change in self.added + self.changed if change.added_replies]
+
+def configure_logging(config):
+    """Apply log level and format settings from config"""
+    global _log_level, _log_format
+    
+    level = str(config.get('log_level', DEFAULT_LOG_LEVEL)).lower()
+    log_format = config.get('log_format', DEFAULT_LOG_FORMAT)
+    _log_level = LOG_LEVELS.get(level, LOG_LEVELS[DEFAULT_LOG_LEVEL])
+    _log_format = log_format if log_format in ("text", "json") else DEFAULT_LOG_FORMAT
+    
+    if level not in LOG_LEVELS:
+        log(f"⚠️  Nieznany poziom logowania '{level}' - używam {DEFAULT_LOG_LEVEL}")
+    if log_format not in ("text", "json"):
+        log(f"⚠️  Nieznany format logowania '{log_format}' - używam {DEFAULT_LOG_FORMAT}")
+
+def log(message="", level=None, **fields):
+    """Write a log line - plain text, or one JSON object per line with log_format "json"
+    
+    Without an explicit level it is taken from the message prefix (❌ error, ⚠️ warning,
+    anything else info). Extra fields are appended to the line (or the JSON object).
+    """
+    if level is None:
+        prefix = message.lstrip()[:2]
+        level = "error" if prefix.startswith("❌") else "warning" if prefix.startswith("⚠") else "info"
+    if LOG_LEVELS[level] < _log_level:
+        return
+    
+    if _log_format == "json":
+        if not message.strip() and not fields:
+            return
+        record = {
+            'ts': datetime.now(timezone.utc).isoformat(timespec='milliseconds'),
+            'level': level,
+            'msg': message.strip()
+        }
+        mp_id = getattr(_log_context, 'mp_id', None)
+        if mp_id:
+            record['mp_id'] = mp_id
+        record.update(fields)
+        line = json.dumps(record, ensure_ascii=False, default=str)
+    else:
+        line = message
+        if fields:
+            line += " " + json.dumps(fields, ensure_ascii=False, default=str)
+    
+    print(line, flush=True)
+
+def start_run_metrics():
+    """Start collecting metrics of a new run"""
+    global _run_metrics
+    with _metrics_lock:
+        _run_metrics = {'started_at': time.time(), 'stages': {}, 'mps': {}, 'http': {}, 'counters': {}}
+
+def record_stage(stage, seconds):
+    """Add time spent in a stage to the run (and current MP) metrics"""
+    mp_id = getattr(_log_context, 'mp_id', None)
+    with _metrics_lock:
+        totals = _metrics_totals['stage_seconds']
+        totals[stage] = totals.get(stage, 0.0) + seconds
+        if _run_metrics is None:
+            return
+        stages = _run_metrics['stages']
+        stages[stage] = stages.get(stage, 0.0) + seconds
+        if mp_id:
+            mp_stages = _run_metrics['mps'].setdefault(mp_id, {})
+            mp_stages[stage] = mp_stages.get(stage, 0.0) + seconds
+
+@contextmanager
+def measure_stage(stage):
+    """Measure the duration of a block as a run stage (fetch, parse, details, diff, save, notify)"""
+    started_at = time.perf_counter()
+    try:
+        yield
+    finally:
+        record_stage(stage, time.perf_counter() - started_at)
+
+def count_event(name, count=1):
+    """Increment a run counter (cache hits, item counts, notifications)"""
+    with _metrics_lock:
+        events = _metrics_totals['events']
+        events[name] = events.get(name, 0) + count
+        if _run_metrics is not None:
+            counters = _run_metrics['counters']
+            counters[name] = counters.get(name, 0) + count
+
+def record_http_request(endpoint, status, size, seconds):
+    """Record a single HTTP request (status is None for connection errors and timeouts)
+    
+    Bodies of streamed responses are read later and added with record_http_bytes.
+    """
+    failed = status is None or status >= 500
+    status = str(status) if status is not None else "error"
+    with _metrics_lock:
+        requests_total = _metrics_totals['http_requests']
+        requests_total[(endpoint, status)] = requests_total.get((endpoint, status), 0) + 1
+        _metrics_totals['http_bytes'][endpoint] = _metrics_totals['http_bytes'].get(endpoint, 0) + size
+        if _run_metrics is None:
+            return
+        http = _run_metrics['http'].setdefault(endpoint, {'requests': 0, 'errors': 0, 'bytes': 0, 'latencies': []})
+        http['requests'] += 1
+        http['bytes'] += size
+        http['latencies'].append(seconds)
+        if failed:
+            http['errors'] += 1
+
+def record_http_bytes(endpoint, size):
+    """Add body bytes of a streamed response once they were read"""
+    with _metrics_lock:
+        _metrics_totals['http_bytes'][endpoint] = _metrics_totals['http_bytes'].get(endpoint, 0) + size
+        if _run_metrics is None:
+            return
+        http = _run_metrics['http'].setdefault(endpoint, {'requests': 0, 'errors': 0, 'bytes': 0, 'latencies': []})
+        http['bytes'] += size
+
+def get_percentile(values, fraction, digits=None):
+    """Get a nearest-rank percentile of a list of numbers (optionally rounded), or None if empty"""
+    if not values:
+        return None
+    ordered = sorted(values)
+    # The value at rank ceil(fraction * n), as in ResponseStats.percentile
+    rank = max(1, -(-len(ordered) * fraction // 1))
+    value = ordered[min(len(ordered), int(rank)) - 1]
+    return value if digits is None else round(value, digits)
+
+def finish_run_metrics(success):
+    """Build the metrics record of the finished run, log it and keep it for /metrics"""
+    global _run_metrics, _last_run_metrics
+    
+    with _metrics_lock:
+        metrics = _run_metrics
+        _run_metrics = None
+        _metrics_totals['runs'] += 1
+        if not success:
+            _metrics_totals['failed_runs'] += 1
+    if metrics is None:
+        return None
+    
+    counters = metrics['counters']
+    record = {
+        'success': bool(success),
+        'started_at': datetime.fromtimestamp(metrics['started_at'], timezone.utc).isoformat(timespec='seconds'),
+        'duration_seconds': round(time.time() - metrics['started_at'], 3),
+        'stages': {stage: round(seconds, 3) for stage, seconds in metrics['stages'].items()},
+        'mps': {
+            mp_id: {stage: round(seconds, 3) for stage, seconds in stages.items()}
+            for mp_id, stages in metrics['mps'].items()
+        },
+        'http': {
+            endpoint: {
+                'requests': http['requests'],
+                'errors': http['errors'],
+                'bytes': http['bytes'],
+                'latency_p50': get_percentile(http['latencies'], 0.5, 4),
+                'latency_p90': get_percentile(http['latencies'], 0.9, 4),
+                'latency_p99': get_percentile(http['latencies'], 0.99, 4)
+            }
+            for endpoint, http in metrics['http'].items()
+        },
+        'cache': {},
+        'counters': dict(counters)
+    }
+    for cache, (hits_name, misses_name) in CACHE_METRICS.items():
+        hits, misses = counters.get(hits_name, 0), counters.get(misses_name, 0)
+        if hits or misses:
+            record['cache'][cache] = {'hits': hits, 'misses': misses, 'hit_rate': round(hits / (hits + misses), 3)}
+    
+    with _metrics_lock:
+        _last_run_metrics = record
+    
+    log(f"📈 Metryki uruchomienia: {record['duration_seconds']:.2f} s", metrics=record)
+    return record
+
+def render_prometheus_metrics():
+    """Render totals since start and last run metrics in the Prometheus text format"""
+    with _metrics_lock:
+        totals = {key: dict(value) if isinstance(value, dict) else value for key, value in _metrics_totals.items()}
+        last_run = _last_run_metrics
+    
+    lines = []
+    def add(name, metric_type, help_text, samples):
+        lines.append(f"# HELP {name} {help_text}")
+        lines.append(f"# TYPE {name} {metric_type}")
+        for labels, value in samples:
+            label_text = ",".join(f'{key}="{value}"' for key, value in labels.items())
+            lines.append(f"{name}{{{label_text}}} {value}" if label_text else f"{name} {value}")
+    
+    add("interpelbot_runs_total", "counter", "Check runs since start", [({}, totals['runs'])])
+    add("interpelbot_failed_runs_total", "counter", "Check runs in which some MP failed", [({}, totals['failed_runs'])])
+    add("interpelbot_http_requests_total", "counter", "HTTP requests by endpoint kind and status",
+        [({'endpoint': endpoint, 'status': status}, count) for (endpoint, status), count in sorted(totals['http_requests'].items())])
+    add("interpelbot_http_response_bytes_total", "counter", "Response body bytes read (after decoding) by endpoint kind",
+        [({'endpoint': endpoint}, size) for endpoint, size in sorted(totals['http_bytes'].items())])
+    add("interpelbot_events_total", "counter", "Cache hits and misses, item and notification counts",
+        [({'event': event}, count) for event, count in sorted(totals['events'].items())])
+    add("interpelbot_stage_seconds_total", "counter", "Time spent in each stage (summed over workers)",
+        [({'stage': stage}, round(seconds, 6)) for stage, seconds in sorted(totals['stage_seconds'].items())])
+    
+    if last_run:
+        add("interpelbot_last_run_duration_seconds", "gauge", "Duration of the last run",
+            [({}, last_run['duration_seconds'])])
+        add("interpelbot_last_run_success", "gauge", "Whether every MP was processed in the last run",
+            [({}, 1 if last_run['success'] else 0)])
+        add("interpelbot_last_run_http_latency_seconds", "gauge", "HTTP latency percentiles of the last run",
+            [
+                ({'endpoint': endpoint, 'quantile': quantile}, round(http[name], 6))
+                for endpoint, http in sorted(last_run['http'].items())
+                for quantile, name in (("0.5", 'latency_p50'), ("0.9", 'latency_p90'), ("0.99", 'latency_p99'))
+                if http[name] is not None
+            ])
+    
+    return "\n".join(lines) + "\n"
+
+def get_data_dir():
+    """Get absolute path to the data directory"""
+    # Explicit override (e.g. benchmarks or several instances on one host)
+    if os.getenv('INTERPELBOT_DATA_DIR'):
+        return os.path.abspath(os.getenv('INTERPELBOT_DATA_DIR'))
+    
+    # Check if we're running in Docker (data directory mounted)
+    if os.path.isdir("/app/data"):
+        return "/app/data"
+    
+    # Otherwise use the data subdirectory in the script directory
+    return os.path.join(os.path.dirname(os.path.abspath(__file__)), "data")
+
+def is_root_state():
+    """Check whether the per-MP state of the active term is kept in the data root"""
+    return _state_term is None or _state_term == _root_state_term
+
+def get_state_dir():
+    """Get absolute path to the directory with per-MP state of the active term"""
+    if is_root_state():
+        return get_data_dir()
+    return os.path.join(get_data_dir(), f"term{_state_term}")
+
+def select_state_term(term, config):
+    """Switch per-MP state (results, sync state, SQLite store) to a term
+    
+    sejm_term keeps its state in the data root as before; other terms get data/term{N}.
+    """
+    global _state_term, _root_state_term
+    _state_term = str(term)
+    _root_state_term = str(config.get('sejm_term', '10'))
+
+def is_term_state_file(name):
+    """Check whether a file in a state directory belongs to the per-MP state of a term"""
+    return ((name.startswith("interpel_") and name.endswith(".json"))
+            or name == "sync_state.json" or name.startswith("interpelbot.db"))
+
+def get_root_state_owner():
+    """Get the term owning the per-MP state in the data root, or None if it was not recorded"""
+    data_dir = get_data_dir()
+    try:
+        with open(os.path.join(data_dir, "sync_state.json"), 'r', encoding='utf-8') as f:
+            term = json.load(f).get('term')
+        if term:
+            return str(term)
+    except (OSError, ValueError, AttributeError):
+        pass
+    
+    filename = os.path.join(data_dir, "interpelbot.db")
+    if os.path.exists(filename):
+        connection = sqlite3.connect(filename)
+        try:
+            row = connection.execute("SELECT value FROM meta WHERE key = 'term'").fetchone()
+            return str(row[0]) if row else None
+        except sqlite3.Error:
+            return None
+        finally:
+            connection.close()
+    return None
+
+def move_term_state(source, target):
+    """Move the per-MP state files of a term between directories; returns the number moved
+    
+    Nothing is moved if any of the files already exists in the target.
+    """
+    if not os.path.isdir(source):
+        return 0
+    names = [name for name in os.listdir(source) if is_term_state_file(name)]
+    conflicts = [name for name in names if os.path.exists(os.path.join(target, name))]
+    if conflicts:
+        raise OSError(f"{target} zawiera już {', '.join(sorted(conflicts)[:3])}")
+    
+    os.makedirs(target, exist_ok=True)
+    for name in names:
+        os.replace(os.path.join(source, name), os.path.join(target, name))
+    return len(names)
+
+def migrate_root_state(config):
+    """Hand the data root over to sejm_term when it changed (term rollover); returns False on failure
+    
+    MP IDs repeat across terms, so the state of the previous term is moved to data/term{N}
+    first, and state the new term already has in data/term{N} is moved into the root.
+    """
+    global _root_state_checked
+    term = str(config.get('sejm_term', '10'))
+    if _root_state_checked == term:
+        return True
+    
+    owner = get_root_state_owner()
+    if owner is not None and owner != term:
+        # Open stores point at files that are about to move
+        close_state_store(force=True)
+        data_dir = get_data_dir()
+        try:
+            moved = move_term_state(data_dir, os.path.join(data_dir, f"term{owner}"))
+            log(f"📦 Zmiana kadencji {owner} → {term}: przeniesiono stan kadencji {owner} ({moved} plików) do term{owner}/")
+            
+            new_term_dir = os.path.join(data_dir, f"term{term}")
+            restored = move_term_state(new_term_dir, data_dir)
+            if restored:
+                log(f"📦 Przeniesiono stan kadencji {term} ({restored} plików) z term{term}/ do katalogu danych")
+            if os.path.isdir(new_term_dir) and not os.listdir(new_term_dir):
+                os.rmdir(new_term_dir)
+        except OSError as e:
+            log(f"❌ Nie udało się przenieść stanu po zmianie kadencji: {e}")
+            return False
+    
+    _root_state_checked = term
+    return True
+
+def get_mp_term(mp_config, config):
+    """Get the term of an MP from config (sejm_term unless the MP sets its own)"""
+    return str(mp_config.get('term') or config.get('sejm_term', '10'))
+
 def get_data_file_path(mp_id):
     """Get absolute path to the data file for specific MP"""
+    if not is_root_state():
+        return os.path.join(get_state_dir(), f"interpel_{mp_id}.json")
+    
+    if os.getenv('INTERPELBOT_DATA_DIR'):
+        return os.path.join(get_data_dir(), f"interpel_{mp_id}.json")
+    
     # Get the directory where the script is located
     script_dir = os.path.dirname(os.path.abspath(__file__))
     
@@ -27,544 +1174,2519 @@ def get_data_file_path(mp_id):
 def get_mattermost_webhook_url():
     """Get Mattermost webhook URL from config or environment variable"""
     # Try to get from config first
-    config = load_config()
+    config = get_config()
     if config and config.get('mattermost_webhook_url'):
         return config.get('mattermost_webhook_url')
     
     # Fallback to environment variable
     return os.getenv('MATTERMOST_WEBHOOK_URL')
 
-def load_config():
-    """Load configuration from JSON file"""
-    config_file = os.path.join(os.path.dirname(os.path.abspath(__file__)), "config.json")
+def write_json_atomic(filename, data, indent=None):
+    """Write JSON to a file atomically (temp file + fsync + rename)
+    
+    The file is left untouched if its content would not change. Returns True if it was written.
+    """
+    content = json.dumps(data, ensure_ascii=False, indent=indent,
+                         separators=None if indent else (',', ':')).encode('utf-8')
+    
+    # Skip the write when the file already holds exactly this content
     try:
-        with open(config_file, 'r', encoding='utf-8') as f:
-            return json.load(f)
-    except Exception as e:
-        print(f"⚠️  Błąd podczas wczytywania konfiguracji: {e}")
-        return None
-
-def get_mattermost_users_for_interpellation(from_field, config):
-    """Get Mattermost users for all MPs who submitted the interpellation"""
-    if not from_field or not config:
-        return ""
+        if os.path.getsize(filename) == len(content):
+            with open(filename, 'rb') as f:
+                if hashlib.sha256(f.read()).digest() == hashlib.sha256(content).digest():
+                    return False
+    except OSError:
+        pass
     
-    # Split the from_field by comma to get individual MP IDs
-    mp_ids = [mp_id.strip() for mp_id in from_field.split(',') if mp_id.strip()]
+    directory = os.path.dirname(filename)
+    os.makedirs(directory, exist_ok=True)
     
-    # Get all Mattermost users for MPs in the config who submitted this interpellation
-    all_users = []
-    for mp_config in config.get('mps', []):
-        mp_id = mp_config.get('id')
-        if mp_id and mp_id in mp_ids:
-            mattermost_users = mp_config.get('mattermost_users', '')
-            if mattermost_users:
-                # Split by space and add individual users
-                users = [user.strip() for user in mattermost_users.split() if user.strip()]
-                all_users.extend(users)
-    
-    # Remove duplicates while preserving order
-    unique_users = []
-    for user in all_users:
-        if user not in unique_users:
-            unique_users.append(user)
+    fd, temp_filename = tempfile.mkstemp(dir=directory, prefix=".tmp-", suffix=".json")
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            f.write(content)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(temp_filename, filename)
+    except BaseException:
+        try:
+            os.unlink(temp_filename)
+        except OSError:
+            pass
+        raise
     
-    return " ".join(unique_users)
+    # Make the rename itself durable
+    if hasattr(os, 'O_DIRECTORY'):
+        dir_fd = os.open(directory, os.O_RDONLY | os.O_DIRECTORY)
+        try:
+            os.fsync(dir_fd)
+        finally:
+            os.close(dir_fd)
+    return True
 
-def calculate_days_between_dates(date1_str, date2_str):
-    """Calculate days between two dates in ISO format"""
-    try:
-        from datetime import datetime
-        
-        # Handle different date formats
-        def parse_date(date_str):
-            # Remove timezone info if present
-            date_str = date_str.replace('Z', '').replace('+00:00', '')
-            
-            # Try different formats
-            formats = [
-                '%Y-%m-%dT%H:%M:%S',  # 2024-01-23T22:01:02
-                '%Y-%m-%d',          # 2023-11-18
-                '%Y-%m-%d %H:%M:%S'  # 2024-01-23 22:01:02
-            ]
-            
-            for fmt in formats:
-                try:
-                    return datetime.strptime(date_str, fmt)
-                except ValueError:
-                    continue
-            
-            raise ValueError(f"Nie można sparsować daty: {date_str}")
-        
-        date1 = parse_date(date1_str)
-        date2 = parse_date(date2_str)
-        delta = date2 - date1
-        return delta.days
-        
-    except Exception as e:
-        print(f"⚠️  Błąd podczas obliczania dni między datami: {e}")
-        return None
+def get_run_lock_path():
+    """Get absolute path to the lock file preventing overlapping runs"""
+    return os.path.join(get_data_dir(), "interpelbot.lock")
 
-def get_interpellation_timing_info(replies_data):
-    """Get timing information for interpellation and first response"""
-    if not replies_data or not isinstance(replies_data, list):
-        return None, None, None
+def acquire_run_lock():
+    """Acquire the run lock without waiting
     
-    # Find the earliest receipt date (when interpellation was submitted)
-    receipt_dates = []
-    first_response_date = None
+    Returns the open lock file (to be passed to release_run_lock), or None if another run holds it.
+    """
+    filename = get_run_lock_path()
+    os.makedirs(os.path.dirname(filename), exist_ok=True)
+    lock_file = open(filename, 'a+')
+    if fcntl is None:
+        return lock_file
     
-    for reply in replies_data:
-        if isinstance(reply, dict):
-            receipt_date = reply.get('receiptDate', '')
-            if receipt_date:
-                receipt_dates.append(receipt_date)
-            
-            # Get the earliest lastModified as first response date
-            last_modified = reply.get('lastModified', '')
-            if last_modified and (first_response_date is None or last_modified < first_response_date):
-                first_response_date = last_modified
+    try:
+        fcntl.flock(lock_file.fileno(), fcntl.LOCK_EX | fcntl.LOCK_NB)
+    except OSError:
+        lock_file.close()
+        return None
+    
+    lock_file.seek(0)
+    lock_file.truncate()
+    lock_file.write(f"{os.getpid()}\n")
+    lock_file.flush()
+    return lock_file
+
+def release_run_lock(lock_file):
+    """Release the run lock acquired with acquire_run_lock"""
+    if fcntl is not None:
+        fcntl.flock(lock_file.fileno(), fcntl.LOCK_UN)
+    lock_file.close()
+
+def get_mp_file_lock(mp_id):
+    """Get the lock guarding the data file of a specific MP"""
+    with _mp_file_locks_guard:
+        lock = _mp_file_locks.get(mp_id)
+        if lock is None:
+            lock = _mp_file_locks[mp_id] = threading.Lock()
+        return lock
+
+def configure_http_client(config):
+    """Apply HTTP client settings from config and reset the shared session"""
+    global _http_session, _sejm_api_base_url
     
-    if not receipt_dates:
-        return None, None, None
+    settings = get_settings_section(config, 'http', DEFAULT_HTTP_SETTINGS)
     
-    # Get the earliest receipt date (when interpellation was submitted)
-    submission_date = min(receipt_dates)
+    # Every MP worker and every thread of the shared detail pool should keep its own connection alive
+    settings['pool_size'] = max(settings['pool_size'], 2 * get_max_workers(config or {}))
     
-    # Calculate days to first response
-    days_to_response = None
-    if first_response_date:
-        days_to_response = calculate_days_between_dates(submission_date, first_response_date)
+    base_url = ((config or {}).get('sejm_api_url') or SEJM_API_BASE_URL).rstrip('/')
     
-    return submission_date, first_response_date, days_to_response
+    with _http_session_lock:
+        # Keep warm connections when nothing changed (daemon mode)
+        if _http_session is not None and settings == _http_settings and base_url == _sejm_api_base_url:
+            return
+        if _http_session is not None:
+            _http_session.close()
+        _http_session = None
+        _http_settings.update(settings)
+        _sejm_api_base_url = base_url
 
-def get_interpellation_submission_date_from_api(interpellation_id, interpellation_type, term="10"):
-    """Get submission date from API for a specific interpellation"""
-    try:
-        # Try to get detailed information from API
-        if interpellation_type == "INT":
-            url = f"https://api.sejm.gov.pl/sejm/term{term}/interpellations/{interpellation_id}"
-        else:
-            url = f"https://api.sejm.gov.pl/sejm/term{term}/writtenQuestions/{interpellation_id}"
-        
-        headers = {
-            'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
-        }
-        
-        response = requests.get(url, headers=headers, timeout=30)
-        response.raise_for_status()
-        
-        data = response.json()
-        if isinstance(data, dict):
-            # Look for submission date in various possible fields
-            submission_date = data.get('submissionDate') or data.get('date') or data.get('created') or data.get('receiptDate')
-            return submission_date
-        
+def get_http_session():
+    """Get the shared HTTP session with keep-alive connection pooling"""
+    global _http_session
+    with _http_session_lock:
+        if _http_session is None:
+            session = requests.Session()
+            adapter = HTTPAdapter(
+                pool_connections=_http_settings['pool_size'],
+                pool_maxsize=_http_settings['pool_size']
+            )
+            session.mount('https://', adapter)
+            session.mount('http://', adapter)
+            session.headers.update(DEFAULT_HTTP_HEADERS)
+            _http_session = session
+        return _http_session
+
+class CircuitOpenError(requests.ConnectionError):
+    """Raised without sending a request while the circuit breaker of a host is open"""
+
+def check_circuit(host):
+    """Fail fast if the circuit breaker of a host is open"""
+    with _circuit_breakers_lock:
+        breaker = _circuit_breakers.get(host)
+        if not breaker or breaker['failures'] < _http_settings['circuit_failures']:
+            return
+        now = time.monotonic()
+        if now < breaker['open_until']:
+            raise CircuitOpenError(f"API {host} niedostępne - pomijam zapytanie")
+        # Half-open: let a single probe through, everyone else keeps failing fast
+        breaker['open_until'] = now + _http_settings['circuit_reset']
+
+def record_request_result(host, success):
+    """Update the circuit breaker of a host after a request"""
+    with _circuit_breakers_lock:
+        breaker = _circuit_breakers.setdefault(host, {'failures': 0, 'open_until': 0.0})
+        if success:
+            if breaker['failures'] >= _http_settings['circuit_failures']:
+                log(f"✅ API {host} znów odpowiada")
+            breaker['failures'] = 0
+            return
+        breaker['failures'] += 1
+        if breaker['failures'] == _http_settings['circuit_failures']:
+            log(f"🔌 API {host} nie odpowiada - wstrzymuję zapytania na {_http_settings['circuit_reset']:.0f}s")
+            breaker['open_until'] = time.monotonic() + _http_settings['circuit_reset']
+        elif breaker['failures'] > _http_settings['circuit_failures']:
+            breaker['open_until'] = time.monotonic() + _http_settings['circuit_reset']
+
+def get_retry_after(response):
+    """Get the delay in seconds requested with a Retry-After header, or None"""
+    value = response.headers.get('Retry-After')
+    if not value:
         return None
-        
-    except Exception as e:
-        print(f"⚠️  Błąd podczas pobierania daty złożenia z API: {e}")
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        return max(0.0, (parsedate_to_datetime(value) - datetime.now(parsedate_to_datetime(value).tzinfo)).total_seconds())
+    except (TypeError, ValueError):
         return None
 
-def send_mattermost_notification(message, webhook_url=None):
-    """Send notification to Mattermost channel"""
-    if not webhook_url:
-        webhook_url = get_mattermost_webhook_url()
+def get_retry_delay(attempt, retry_after=None):
+    """Get a full-jitter exponential delay before the next attempt, honoring Retry-After"""
+    delay = random.uniform(0, _http_settings['retry_backoff'] * 2 ** attempt)
+    if retry_after is not None:
+        delay = max(delay, retry_after)
+    return min(delay, _http_settings['retry_max_delay'])
+
+def http_get(url, timeout=None, endpoint='list', **kwargs):
+    """Send a GET request to the Sejm API through the shared HTTP session
     
-    if not webhook_url:
-        print("⚠️  Brak URL webhook Mattermost - pomijam powiadomienie")
-        return False
+    Transient failures (connection errors, timeouts, 429 and 5xx responses) are retried with
+    jittered backoff within the time budget of the endpoint kind ('list', 'detail' or 'mp').
+    Once a host keeps failing its circuit breaker opens and requests fail fast with
+    CircuitOpenError. The last response is returned if retries run out.
+    """
+    read_timeout = timeout or _http_settings['timeout']
+    connect_timeout = _http_settings['connect_timeout']
+    deadline = time.monotonic() + _http_settings[f'{endpoint}_budget']
+    host = urlsplit(url).netloc
+    attempts = max(0, _http_settings['retries']) + 1
     
-    try:
-        payload = {
-            "text": message,
-            "username": "InterpelBot",
-            "icon_emoji": ":parliament:"
-        }
-        
-        response = requests.post(webhook_url, json=payload, timeout=10)
-        response.raise_for_status()
-        
-        print(f"✅ Powiadomienie wysłane do Mattermost")
-        return True
-        
-    except Exception as e:
-        print(f"❌ Błąd podczas wysyłania powiadomienia: {e}")
-        return False
-
-def send_consolidated_notification(all_new_answers, term):
-    """Send separate notifications for each interpellation with new answers"""
-    if not all_new_answers:
-        return
+    if _snapshot_replay is not None:
+        return get_replayed_response(url, endpoint)
     
-    # Remove duplicates based on interpellation ID and type
-    unique_answers = {}
-    for answer in all_new_answers:
-        key = f"{answer['id']}_{answer['type']}"
-        if key not in unique_answers:
-            unique_answers[key] = answer
-        else:
-            # Merge Mattermost users if this is the same interpellation from different MPs
-            existing_users = unique_answers[key].get('mattermost_users', '')
-            new_users = answer.get('mattermost_users', '')
-            if existing_users and new_users:
-                # Combine users without duplicates
-                all_users = existing_users.split() + new_users.split()
-                unique_users = list(dict.fromkeys(all_users))  # Remove duplicates while preserving order
-                unique_answers[key]['mattermost_users'] = ' '.join(unique_users)
-    
-    # Convert back to list
-    unique_answers_list = list(unique_answers.values())
-    
-    print(f"📧 Wysyłam {len(unique_answers_list)} osobnych powiadomień dla każdej interpelacji...")
-    
-    # Send separate notification for each interpellation
-    for answer in unique_answers_list:
-        # Prepare individual notification message
-        message = f"## 🆕 Nowa odpowiedź na interpelację!\n\n"
-        message += f"#### {answer['title']} {answer['type']} ({answer['id']})\n"
-        
-        # Add information about MPs who submitted the interpellation
-        from_field = answer.get('from', '')
-        if from_field:
-            message += f"**Zapytanie złożył/a/li:** {from_field}\n"
-        
-        message += f"Odpowiedzi: {answer['previous_replies']} → {answer['current_replies']} (+{answer['new_count']})\n"
-        
-        # Add information about who provided the answers
-        reply_authors = answer.get('reply_authors', [])
-        if reply_authors:
-            authors_text = ", ".join(reply_authors)
-            message += f"**Odpowiada:** {authors_text}\n"
-        
-        # Add timing information
-        submission_date = None
-        days_to_response = None
-        
-        # Try to get timing info from the answer data if available
-        if 'submission_date' in answer:
-            submission_date = answer['submission_date']
-            if 'first_response_date' in answer:
-                days_to_response = calculate_days_between_dates(submission_date, answer['first_response_date'])
-        
-        if submission_date:
-            # Format submission date
-            try:
-                from datetime import datetime
-                sub_date = datetime.fromisoformat(submission_date.replace('Z', '+00:00'))
-                formatted_submission_date = sub_date.strftime("%d.%m.%Y")
-                message += f"**Złożono:** {formatted_submission_date}\n"
-            except:
-                message += f"**Złożono:** {submission_date}\n"
-        
-        if days_to_response is not None:
-            message += f"**Dni do odpowiedzi:** {days_to_response}\n"
+    for attempt in range(attempts):
+        check_circuit(host)
         
-        # Add prolongation information if available
-        if answer.get('has_prolongation', False):
-            message += f"⏰ **Przedłużenie terminu odpowiedzi**\n"
-        
-        # Extract href from URL object or use URL directly if it's a string
-        url_display = answer['url']['href'] if isinstance(answer['url'], dict) and 'href' in answer['url'] else answer['url']
-        message += f"{url_display}\n\n--------------------------------\n\n"
+        remaining = max(deadline - time.monotonic(), 1.0)
+        response, error, retry_after = None, None, None
+        started_at = time.perf_counter()
+        try:
+            response = get_http_session().get(
+                url, timeout=(min(connect_timeout, remaining), min(read_timeout, remaining)), **kwargs
+            )
+        except (requests.ConnectionError, requests.Timeout) as e:
+            error = e
+            record_http_request(endpoint, None, 0, time.perf_counter() - started_at)
+            record_request_result(host, False)
+        else:
+            size = 0 if kwargs.get('stream') else get_response_size(response)
+            record_http_request(endpoint, response.status_code, size, time.perf_counter() - started_at)
+            if response.status_code not in RETRYABLE_STATUS_CODES:
+                record_request_result(host, True)
+                return record_snapshot(url, response)
+            # Throttling means the API is up, so it does not count towards the breaker
+            if response.status_code != 429:
+                record_request_result(host, False)
+            retry_after = get_retry_after(response)
         
-        # Add Mattermost users for this specific interpellation
-        interpellation_users = answer.get('mattermost_users', '')
-        if interpellation_users:
-            message += f"{interpellation_users}\n"
+        delay = get_retry_delay(attempt, retry_after)
+        if attempt == attempts - 1 or time.monotonic() + delay + 1.0 > deadline:
+            break
         
-        # Send individual notification
-        send_mattermost_notification(message)
+        reason = error.__class__.__name__ if error else f"HTTP {response.status_code}"
+        log(f"🔁 Ponawiam zapytanie do API za {delay:.1f}s ({reason}, próba {attempt + 2}/{attempts})")
+        if _shutdown_event.wait(delay):
+            break
+    
+    if response is not None:
+        return record_snapshot(url, response)
+    raise error
 
-def load_previous_results(mp_id):
-    """Load previous results from JSON file for specific MP"""
-    filename = get_data_file_path(mp_id)
-    print(f"🔍 Sprawdzam plik dla posła {mp_id}: {filename}")
+def http_post(url, timeout=None, **kwargs):
+    """Send a POST request through the shared HTTP session"""
+    read_timeout = timeout or _http_settings['webhook_timeout']
+    started_at = time.perf_counter()
     try:
-        if os.path.exists(filename):
-            print(f"✅ Plik istnieje, wczytuję dane...")
-            with open(filename, 'r', encoding='utf-8') as f:
-                data = json.load(f)
-                print(f"📊 Wczytano {len(data)} interpelacji z pliku")
-                return data
-        else:
-            print(f"❌ Plik nie istnieje: {filename}")
+        response = get_http_session().post(url, timeout=(_http_settings['connect_timeout'], read_timeout), **kwargs)
+    except requests.RequestException:
+        record_http_request('webhook', None, 0, time.perf_counter() - started_at)
+        raise
+    record_http_request('webhook', response.status_code, get_response_size(response), time.perf_counter() - started_at)
+    return response
+
+def get_response_size(response):
+    """Get the size of a read response body in bytes (after gzip decoding, so chunked bodies count too)"""
+    return len(response.content or b"")
+
+def get_snapshot_dir():
+    """Get absolute path to the directory with recorded API snapshots"""
+    # Replays run against a temporary data directory, but read snapshots from the real one
+    if _snapshot_dir:
+        return _snapshot_dir
+    return os.path.join(get_data_dir(), "snapshots")
+
+def is_snapshot_mode():
+    """Check whether API responses are being recorded or replayed
+    
+    Both need complete responses, so conditional requests and incremental sync are disabled.
+    """
+    return _snapshot_recording is not None or _snapshot_replay is not None
+
+def get_snapshot_key(url):
+    """Get the URL relative to the API base URL, so snapshots replay against any sejm_api_url"""
+    if url.startswith(_sejm_api_base_url):
+        return url[len(_sejm_api_base_url):]
+    return url
+
+def get_snapshot_object_path(digest):
+    """Get absolute path to a compressed response body stored under its SHA-256"""
+    return os.path.join(get_snapshot_dir(), "objects", digest[:2], f"{digest}.json.gz")
+
+def start_snapshot_recording(config, force=False):
+    """Start recording API responses of this run if enabled in config (or forced with --record)"""
+    global _snapshot_recording
+    settings = get_settings_section(config, 'snapshots', DEFAULT_SNAPSHOT_SETTINGS)
+    with _snapshot_lock:
+        _snapshot_recording = {} if (force or settings['record']) else None
+
+def record_snapshot(url, response):
+    """Store the body of a Sejm API response while recording; returns the response
+    
+    Bodies are content-addressed, so pages that did not change between runs are stored once.
+    Reading the body here buffers it, so streamed responses are parsed from memory.
+    """
+    if _snapshot_recording is None:
+        return response
+    
+    content = response.content
+    digest = hashlib.sha256(content).hexdigest()
+    filename = get_snapshot_object_path(digest)
+    if not os.path.exists(filename):
+        os.makedirs(os.path.dirname(filename), exist_ok=True)
+        fd, temp_filename = tempfile.mkstemp(dir=os.path.dirname(filename), prefix=".tmp-")
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                f.write(gzip.compress(content))
+            os.replace(temp_filename, filename)
+        except BaseException:
+            try:
+                os.unlink(temp_filename)
+            except OSError:
+                pass
+            raise
+    
+    with _snapshot_lock:
+        if _snapshot_recording is not None:
+            _snapshot_recording[get_snapshot_key(url)] = {
+                'status': response.status_code,
+                'content_type': response.headers.get('Content-Type'),
+                'object': digest
+            }
+    return response
+
+def finish_snapshot_recording(config, success):
+    """Write the manifest of the recorded run and prune old runs"""
+    global _snapshot_recording
+    with _snapshot_lock:
+        responses, _snapshot_recording = _snapshot_recording, None
+    if responses is None:
+        return
+    
+    runs_dir = os.path.join(get_snapshot_dir(), "runs")
+    run_id = datetime.now().strftime("%Y%m%d-%H%M%S")
+    suffix = 1
+    while os.path.exists(os.path.join(runs_dir, f"{run_id}.json")):
+        suffix += 1
+        run_id = f"{datetime.now().strftime('%Y%m%d-%H%M%S')}-{suffix}"
+    
+    manifest = {
+        'run_id': run_id,
+        'recorded_at': datetime.now().isoformat(timespec='seconds'),
+        'term': str(config.get('sejm_term', '10')),
+        'fetch_mode': config.get('fetch_mode', DEFAULT_FETCH_MODE),
+        'api_page_size': _api_page_size,
+        'success': success,
+        'responses': responses
+    }
+    try:
+        write_json_atomic(os.path.join(runs_dir, f"{run_id}.json"), manifest)
+        log(f"📼 Zapisano nagranie {run_id} ({len(responses)} odpowiedzi API)")
+        prune_snapshots(get_settings_section(config, 'snapshots', DEFAULT_SNAPSHOT_SETTINGS)['keep_runs'])
+    except Exception as e:
+        log(f"⚠️  Błąd podczas zapisywania nagrania odpowiedzi API: {e}")
+
+def list_snapshot_runs():
+    """Get IDs of recorded runs, oldest first"""
+    runs_dir = os.path.join(get_snapshot_dir(), "runs")
+    if not os.path.isdir(runs_dir):
         return []
+    return sorted(name[:-len(".json")] for name in os.listdir(runs_dir) if name.endswith(".json"))
+
+def load_snapshot_run(run_id):
+    """Load the manifest of a recorded run"""
+    with open(os.path.join(get_snapshot_dir(), "runs", f"{run_id}.json"), 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+def prune_snapshots(keep_runs):
+    """Delete the oldest recorded runs beyond keep_runs and bodies no run refers to"""
+    runs = list_snapshot_runs()
+    if keep_runs <= 0 or len(runs) <= keep_runs:
+        return
+    
+    for run_id in runs[:-keep_runs]:
+        os.unlink(os.path.join(get_snapshot_dir(), "runs", f"{run_id}.json"))
+    
+    referenced = set()
+    for run_id in runs[-keep_runs:]:
+        referenced.update(entry['object'] for entry in load_snapshot_run(run_id)['responses'].values())
+    
+    objects_dir = os.path.join(get_snapshot_dir(), "objects")
+    removed_count = 0
+    for prefix in os.listdir(objects_dir):
+        for name in os.listdir(os.path.join(objects_dir, prefix)):
+            if name.split('.')[0] not in referenced:
+                os.unlink(os.path.join(objects_dir, prefix, name))
+                removed_count += 1
+    log(f"🧹 Usunięto {len(runs) - keep_runs} starych nagrań i {removed_count} nieużywanych odpowiedzi")
+
+def get_replayed_response(url, endpoint):
+    """Build a response for a GET request from the replayed snapshot (404 if it was not recorded)"""
+    entry = _snapshot_replay['responses'].get(get_snapshot_key(url))
+    response = requests.Response()
+    response.url = url
+    response.encoding = 'utf-8'
+    response._content_consumed = True
+    if entry is None:
+        log(f"⚠️  Brak odpowiedzi w nagraniu: {get_snapshot_key(url)}")
+        response.status_code = 404
+        response._content = b""
+    else:
+        with open(get_snapshot_object_path(entry['object']), 'rb') as f:
+            response._content = gzip.decompress(f.read())
+        response.status_code = entry['status']
+        if entry.get('content_type'):
+            response.headers['Content-Type'] = entry['content_type']
+    response.headers['Content-Length'] = str(len(response._content))
+    record_http_request(endpoint, response.status_code, len(response._content), 0.0)
+    return response
+
+def get_http_cache_path():
+    """Get absolute path to the HTTP response validator cache file"""
+    return os.path.join(get_data_dir(), "http_cache.json")
+
+def load_http_cache(config):
+    """Load cached response validators from disk and apply settings from config"""
+    global _conditional_requests
+    
+    _conditional_requests = bool(config.get('conditional_requests', DEFAULT_CONDITIONAL_REQUESTS)) and not is_snapshot_mode()
+    
+    # In daemon mode the validators stay in memory between cycles
+    with _http_cache_lock:
+        _http_cache_used.clear()
+        if _keep_state_warm and _http_cache:
+            return
+    
+    entries = {}
+    filename = get_http_cache_path()
+    try:
+        if _conditional_requests and os.path.exists(filename):
+            with open(filename, 'r', encoding='utf-8') as f:
+                entries = json.load(f).get('urls', {})
+    except Exception as e:
+        log(f"⚠️  Błąd podczas wczytywania pamięci podręcznej HTTP: {e}")
+    
+    with _http_cache_lock:
+        _http_cache.clear()
+        _http_cache.update(entries)
+
+def save_http_cache():
+    """Save cached response validators used in this run to disk
+    
+    URLs with modifiedSince change with the sync date, so validators not used in this run
+    would never match again and are dropped (in memory too).
+    """
+    if not _conditional_requests:
+        return
+    
+    with _http_cache_lock:
+        entries = {url: entry for url, entry in _http_cache.items() if url in _http_cache_used}
+        _http_cache.clear()
+        _http_cache.update(entries)
+    
+    try:
+        write_json_atomic(get_http_cache_path(), {'urls': entries})
+    except Exception as e:
+        log(f"⚠️  Błąd podczas zapisywania pamięci podręcznej HTTP: {e}")
+
+def update_http_cache(validators):
+    """Commit validators collected during a fetch once its results were saved"""
+    if not validators:
+        return
+    with _http_cache_lock:
+        _http_cache.update(validators)
+        _http_cache_used.update(validators)
+
+def get_conditional_validators(validators, has_previous_results):
+    """Get a validators dict enabling conditional requests, or None to fetch unconditionally
+    
+    Without stored results a 304 would leave nothing to compare against, so it is never requested.
+    """
+    if not _conditional_requests or not has_previous_results:
+        return None
+    return validators
+
+def http_get_conditional(url, **kwargs):
+    """Send a GET request with If-None-Match/If-Modified-Since from the validator cache
+    
+    Returns the response and the cache entry used (None if the URL was not cached).
+    """
+    with _http_cache_lock:
+        entry = _http_cache.get(url)
+        if entry:
+            _http_cache_used.add(url)
+    
+    headers = {}
+    if entry:
+        if entry.get('etag'):
+            headers['If-None-Match'] = entry['etag']
+        if entry.get('last_modified'):
+            headers['If-Modified-Since'] = entry['last_modified']
+    
+    response = http_get(url, headers=headers, **kwargs)
+    if headers:
+        count_event('http_not_modified' if response.status_code == 304 else 'http_modified')
+    if response.status_code == 304 and not headers:
+        response.raise_for_status()
+    return response, (entry if headers else None)
+
+def get_response_validators(response, count):
+    """Build a validator cache entry from response headers, or None if the server sent none"""
+    etag = response.headers.get('ETag')
+    last_modified = response.headers.get('Last-Modified')
+    if not etag and not last_modified:
+        return None
+    return {'etag': etag, 'last_modified': last_modified, 'count': count}
+
+def get_sejm_api_url(term, path):
+    """Build a Sejm API URL for the given term and path"""
+    return f"{_sejm_api_base_url}/sejm/term{term}/{path}"
+
+def get_config_path():
+    """Get absolute path to the configuration file"""
+    if os.getenv('INTERPELBOT_CONFIG'):
+        return os.path.abspath(os.getenv('INTERPELBOT_CONFIG'))
+    return os.path.join(os.path.dirname(os.path.abspath(__file__)), "config.json")
+
+def load_config():
+    """Load configuration from JSON file"""
+    config_file = get_config_path()
+    try:
+        with open(config_file, 'r', encoding='utf-8') as f:
+            return json.load(f)
     except Exception as e:
-        print(f"⚠️  Błąd podczas wczytywania poprzednich wyników: {e}")
+        log(f"⚠️  Błąd podczas wczytywania konfiguracji: {e}")
+        return None
+
+def validate_config(config):
+    """Validate configuration up front
+    
+    Prints warnings for recoverable problems and returns a list of fatal errors.
+    Numeric MP IDs are converted to text in place.
+    """
+    if not isinstance(config, dict):
+        return ["konfiguracja musi być obiektem JSON"]
+    
+    errors = []
+    mps = config.get('mps', [])
+    if not isinstance(mps, list):
+        errors.append("pole 'mps' musi być listą")
+        mps = []
+    
+    seen_ids = set()
+    for index, mp_config in enumerate(mps):
+        if not isinstance(mp_config, dict):
+            errors.append(f"mps[{index}] musi być obiektem")
+            continue
+        
+        mp_id = mp_config.get('id')
+        term = mp_config.get('term')
+        if term is not None and not str(term).isdigit():
+            errors.append(f"mps[{index}].term musi być numerem kadencji (np. \"9\")")
+        
+        if isinstance(mp_id, int) and not isinstance(mp_id, bool):
+            log(f"⚠️  mps[{index}].id powinno być tekstem - używam \"{mp_id}\"")
+            mp_config['id'] = mp_id = str(mp_id)
+        
+        if not mp_id:
+            log(f"⚠️  mps[{index}] nie ma ID - zostanie pominięty")
+        elif not isinstance(mp_id, str):
+            errors.append(f"mps[{index}].id musi być tekstem (np. \"{mp_id}\")")
+        else:
+            if (get_mp_term(mp_config, config), mp_id) in seen_ids:
+                log(f"⚠️  Poseł {mp_id} występuje w konfiguracji kilka razy")
+            seen_ids.add((get_mp_term(mp_config, config), mp_id))
+        
+        for name in ('mattermost_users', 'webhook_url'):
+            if mp_config.get(name) is not None and not isinstance(mp_config[name], str):
+                errors.append(f"mps[{index}].{name} musi być tekstem")
+    
+    subscriptions = config.get('subscriptions') or []
+    if not isinstance(subscriptions, list):
+        errors.append("pole 'subscriptions' musi być listą")
+        subscriptions = []
+    for index, subscription in enumerate(subscriptions):
+        if not isinstance(subscription, dict):
+            errors.append(f"subscriptions[{index}] musi być obiektem")
+            continue
+        criteria = [subscription.get(name) for name in ('club', 'clubs', 'ministry', 'ministries', 'keywords')]
+        if not any(criteria):
+            errors.append(f"subscriptions[{index}] musi mieć club, ministry lub keywords")
+        for name in ('club', 'clubs', 'ministry', 'ministries', 'keywords'):
+            value = subscription.get(name)
+            if value and not isinstance(value, str) and not (isinstance(value, list) and all(isinstance(v, str) for v in value)):
+                errors.append(f"subscriptions[{index}].{name} musi być tekstem lub listą tekstów")
+        for name in ('mattermost_users', 'webhook_url', 'name'):
+            if subscription.get(name) is not None and not isinstance(subscription[name], str):
+                errors.append(f"subscriptions[{index}].{name} musi być tekstem")
+    
+    for section in ('http', 'daemon', 'notifications'):
+        if config.get(section) is not None and not isinstance(config[section], dict):
+            errors.append(f"pole '{section}' musi być obiektem")
+    
+    own_webhooks = [isinstance(mp_config, dict) and bool(mp_config.get('webhook_url')) for mp_config in mps]
+    if not config.get('mattermost_webhook_url') and not os.getenv('MATTERMOST_WEBHOOK_URL'):
+        if not any(own_webhooks):
+            log("⚠️  Brak mattermost_webhook_url - powiadomienia nie będą wysyłane")
+        elif not all(own_webhooks):
+            log("⚠️  Brak mattermost_webhook_url - powiadomienia posłów bez własnego webhook_url nie będą wysyłane")
+    
+    return errors
+
+def build_mp_routes_index(config):
+    """Build a dict of term -> MP ID -> webhook URL -> Mattermost user handles from config
+    
+    MPs without their own webhook_url are stored under None (the main webhook, resolved when
+    notifying, since it may come from the environment).
+    """
+    index = {}
+    for mp_config in config.get('mps', []):
+        mp_id = mp_config.get('id')
+        if not mp_id:
+            continue
+        
+        # Split by space and merge users of MPs listed more than once, without duplicates
+        webhooks = index.setdefault(get_mp_term(mp_config, config), {}).setdefault(str(mp_id), {})
+        users = webhooks.setdefault(mp_config.get('webhook_url') or None, [])
+        for user in mp_config.get('mattermost_users', '').split():
+            if user not in users:
+                users.append(user)
+    return index
+
+def set_active_config(config):
+    """Make config the configuration used by this run and precompute its MP index and subscriptions"""
+    global _config, _mp_routes_index, _configured_mp_ids, _subscriptions
+    with _config_lock:
+        if config is _config:
+            return
+        _config = config
+        _mp_routes_index = build_mp_routes_index(config)
+        _configured_mp_ids = {term: frozenset(mp_routes) for term, mp_routes in _mp_routes_index.items()}
+        _subscriptions = build_subscription_matcher(config)
+
+def build_subscription_matcher(config):
+    """Compile the subscriptions from config, or None if there are none"""
+    rules = [SubscriptionRule.from_config(data, index) for index, data in enumerate(config.get('subscriptions') or [])]
+    return SubscriptionMatcher(rules) if rules else None
+
+def normalize_text(text):
+    """Normalize text for matching: lowercase ASCII words separated by single spaces"""
+    return NON_ALPHANUMERIC.sub(' ', str(text).translate(POLISH_TO_ASCII).lower()).strip()
+
+def get_item_clubs(from_ids, term):
+    """Get clubs of the authors of an item (only needed by club subscriptions)"""
+    if _subscriptions is None or not _subscriptions.clubs:
+        return ()
+    mp_ids = [mp_id.strip() for mp_id in from_ids.split(',') if mp_id.strip()]
+    return tuple(dict.fromkeys(fetch_mp_data(mp_id, term).get('club') or '' for mp_id in mp_ids))
+
+def match_subscriptions(title, recipients, from_ids, term):
+    """Get the subscription rules matching an item"""
+    if _subscriptions is None:
         return []
+    return _subscriptions.match(title, recipients, get_item_clubs(from_ids, term))
 
-def compare_and_notify_new_answers(current_results, previous_results, mp_id, term):
-    """Compare current and previous results and return new answers (without sending notifications)"""
-    if not previous_results:
-        print("📝 Pierwsze uruchomienie - brak poprzednich wyników do porównania")
-        print("📭 Brak nowych odpowiedzi")
+def get_notification_routes(title, recipients, from_ids, term):
+    """Get (webhook URL, Mattermost users) pairs of everyone to notify about an item
+    
+    Items of configured MPs of the term go to their webhooks (the main one unless an MP sets
+    its own) with the users of those MPs; matching subscriptions add their users to their
+    own webhook (or to the main one).
+    """
+    default_webhook_url = get_mattermost_webhook_url()
+    routes = {}
+    
+    mp_routes = _mp_routes_index.get(str(term), {})
+    for mp_id in from_ids.split(','):
+        for webhook_url, users in mp_routes.get(mp_id.strip(), {}).items():
+            webhook_url = webhook_url or default_webhook_url
+            if webhook_url:
+                routes.setdefault(webhook_url, []).extend(users)
+    
+    for rule in match_subscriptions(title, recipients, from_ids, term):
+        webhook_url = rule.webhook_url or default_webhook_url
+        if webhook_url:
+            routes.setdefault(webhook_url, []).extend(rule.mattermost_users.split())
+    
+    return tuple((webhook_url, " ".join(dict.fromkeys(users))) for webhook_url, users in routes.items())
+
+def select_subscribed_items(interpellations_by_mp, term):
+    """Get items of MPs outside the config that match a subscription (bulk mode)"""
+    if _subscriptions is None:
         return []
     
-    print(f"🔍 Porównuję z poprzednimi wynikami dla posła {mp_id}...")
+    configured_mp_ids = _configured_mp_ids.get(str(term), frozenset())
+    selected = {}
+    for mp_id, items in interpellations_by_mp.items():
+        if mp_id in configured_mp_ids:
+            continue
+        for item in items:
+            if item.key in selected:
+                continue
+            author_ids = {author_id.strip() for author_id in item.from_ids.split(',')}
+            if author_ids & configured_mp_ids:
+                continue
+            if match_subscriptions(item.title, item.recipients, item.from_ids, term):
+                selected[item.key] = item
+    return list(selected.values())
+
+def get_config():
+    """Get the configuration of the current run"""
+    with _config_lock:
+        return _config
+
+def reload_config_if_changed():
+    """Reload config.json if its modification time changed (daemon mode)
+    
+    Returns the active configuration; an invalid new file keeps the previous one.
+    """
+    global _config_mtime
+    
+    try:
+        mtime = os.path.getmtime(get_config_path())
+    except OSError:
+        return get_config()
+    
+    if _config_mtime is not None and mtime == _config_mtime and get_config() is not None:
+        return get_config()
     
-    # Get Mattermost users from config for this MP
+    first_load = _config_mtime is None
+    _config_mtime = mtime
     config = load_config()
-    mattermost_users = ""
-    if config:
-        for mp_config in config.get('mps', []):
-            if mp_config.get('id') == mp_id:
-                mattermost_users = mp_config.get('mattermost_users', '')
+    errors = validate_config(config) if config is not None else ["nie udało się wczytać pliku"]
+    if errors:
+        for error in errors:
+            log(f"❌ Błąd konfiguracji: {error}")
+        if get_config() is not None:
+            log("⚠️  Używam poprzedniej konfiguracji")
+        return get_config()
+    
+    if not first_load:
+        log("🔄 Wykryto zmianę config.json - wczytano nową konfigurację")
+    set_active_config(config)
+    return config
+
+def get_mattermost_users_for_interpellation(from_field, term):
+    """Get Mattermost users for all MPs of a term who submitted the interpellation"""
+    if not from_field:
+        return ""
+    mp_routes = _mp_routes_index.get(str(term), {})
+    
+    # Look up users of every co-signer (on any webhook), removing duplicates while preserving order
+    unique_users = {}
+    for mp_id in from_field.split(','):
+        for users in mp_routes.get(mp_id.strip(), {}).values():
+            for user in users:
+                unique_users[user] = None
+    
+    return " ".join(unique_users)
+
+@lru_cache(maxsize=8192)
+def parse_api_date(value):
+    """Parse an ISO 8601 date or date-time from the API into a naive datetime (UTC if zoned), or None"""
+    if not value or not isinstance(value, str):
+        return None
+    
+    text = value.strip()
+    if text.endswith('Z'):
+        text = text[:-1] + '+00:00'
+    
+    try:
+        parsed = datetime.fromisoformat(text)
+    except ValueError:
+        return None
+    
+    if parsed.tzinfo is not None:
+        parsed = parsed.astimezone(timezone.utc).replace(tzinfo=None)
+    return parsed
+
+def calculate_days_between_dates(date1_str, date2_str):
+    """Calculate days between two dates in ISO format"""
+    date1 = parse_api_date(date1_str)
+    date2 = parse_api_date(date2_str)
+    if date1 is None or date2 is None:
+        log(f"⚠️  Nie można sparsować daty: {date1_str if date1 is None else date2_str}")
+        return None
+    return (date2 - date1).days
+
+def fetch_item_details(interpellation_id, interpellation_type, term="10"):
+    """Fetch an interpellation or written question from the detail endpoint; returns the API object or None"""
+    try:
+        if interpellation_type == "INT":
+            url = get_sejm_api_url(term, f"interpellations/{interpellation_id}")
+        else:
+            url = get_sejm_api_url(term, f"writtenQuestions/{interpellation_id}")
+        
+        response = http_get(url, endpoint='detail')
+        response.raise_for_status()
+        
+        data = response.json()
+        return data if isinstance(data, dict) else None
+        
+    except Exception as e:
+        log(f"⚠️  Błąd podczas pobierania szczegółów interpelacji {interpellation_id} z API: {e}")
+        return None
+
+def get_interpellation_submission_date_from_api(interpellation_id, interpellation_type, term="10"):
+    """Get submission date from API for a specific interpellation"""
+    data = fetch_item_details(interpellation_id, interpellation_type, term)
+    if not data:
+        return None
+    # Look for submission date in various possible fields
+    return data.get('submissionDate') or data.get('date') or data.get('created') or data.get('receiptDate')
+
+def fill_submission_dates(changeset, term):
+    """Fill in missing submission dates of items with new replies
+    
+    Dates already stored are carried over by diff_results (they never change), so the detail
+    endpoint is only queried, in parallel, for items with new replies and no known date.
+    The filled dates are saved with the results and never looked up again.
+    """
+    if changeset.initial:
+        return
+    
+    missing = [change.item for change in changeset.with_new_replies if not change.item.submission_date]
+    if not missing:
+        return
+    
+    log(f"📅 Pobieranie dat złożenia dla {len(missing)} interpelacji...")
+    
+    def lookup(item):
+        return get_cached_submission_date(item.id, item.type, term)
+    
+    if _detail_workers <= 1 or len(missing) <= 1:
+        submission_dates = [lookup(item) for item in missing]
+    else:
+        submission_dates = list(get_detail_executor().map(lookup, missing))
+    
+    for item, submission_date in zip(missing, submission_dates):
+        if submission_date:
+            item.submission_date = submission_date
+            item.update_timing()
+
+def get_detail_executor():
+    """Get the thread pool shared by detail requests of all MP workers
+    
+    MP workers hand their detail requests to this one pool instead of starting their own,
+    so at most max_workers detail requests run at once however many MPs are processed.
+    """
+    global _detail_executor, _detail_executor_workers
+    with _detail_executor_lock:
+        if _detail_executor is None or _detail_executor_workers != _detail_workers:
+            if _detail_executor is not None:
+                _detail_executor.shutdown(wait=False)
+            _detail_executor = ThreadPoolExecutor(max_workers=_detail_workers, thread_name_prefix="detail")
+            _detail_executor_workers = _detail_workers
+        return _detail_executor
+
+def get_cached_submission_date(interpellation_id, interpellation_type, term):
+    """Get submission date from the per-process cache or the detail endpoint"""
+    key = (str(term), str(interpellation_id), interpellation_type)
+    with _submission_date_cache_lock:
+        if key in _submission_date_cache:
+            count_event('submission_date_cache_hits')
+            return _submission_date_cache[key]
+    count_event('submission_date_cache_misses')
+    
+    # Misses are remembered too - co-signers share items, and the detail won't change within a run
+    submission_date = get_interpellation_submission_date_from_api(interpellation_id, interpellation_type, term)
+    with _submission_date_cache_lock:
+        _submission_date_cache[key] = submission_date
+    return submission_date
+
+def get_settings_section(config, section, defaults):
+    """Get a settings section from config merged with defaults, casting values to default types"""
+    section_config = (config or {}).get(section, {}) or {}
+    settings = dict(defaults)
+    for name, default in defaults.items():
+        try:
+            value = section_config.get(name, default)
+            settings[name] = value if isinstance(default, bool) and isinstance(value, bool) else type(default)(value)
+        except (TypeError, ValueError):
+            log(f"⚠️  Nieprawidłowa wartość {section}.{name}, używam {default}")
+    return settings
+
+def post_mattermost_message(message, webhook_url):
+    """Post a message to a Mattermost webhook
+    
+    Returns (success, retry_after) where retry_after is the delay in seconds requested
+    by the server (HTTP 429/503 Retry-After), if any.
+    """
+    try:
+        payload = {
+            "text": message,
+            "username": "InterpelBot",
+            "icon_emoji": ":parliament:"
+        }
+        
+        response = http_post(webhook_url, json=payload)
+        if response.status_code in (429, 503):
+            retry_after = get_retry_after(response)
+            log(f"⏳ Mattermost ogranicza liczbę wiadomości (HTTP {response.status_code})")
+            return False, retry_after
+        response.raise_for_status()
+        return True, None
+        
+    except Exception as e:
+        log(f"❌ Błąd podczas wysyłania powiadomienia: {e}")
+        return False, None
+
+def format_answer_message(answer):
+    """Build the Mattermost message for an interpellation with new answers"""
+    # Prepare individual notification message
+    message = f"## 🆕 Nowa odpowiedź na interpelację!\n\n"
+    message += f"#### {answer.title} {answer.type} ({answer.id})\n"
+    
+    # Add information about MPs who submitted the interpellation
+    from_field = answer.from_names
+    if from_field:
+        message += f"**Zapytanie złożył/a/li:** {from_field}\n"
+    
+    message += f"Odpowiedzi: {answer.previous_replies} → {answer.current_replies} (+{answer.new_count})\n"
+    
+    # Add information about who provided the answers
+    reply_authors = answer.reply_authors
+    if reply_authors:
+        authors_text = ", ".join(reply_authors)
+        message += f"**Odpowiada:** {authors_text}\n"
+    
+    # Add timing information (computed when the interpellation was fetched)
+    if answer.submission_date:
+        # Format submission date
+        sub_date = parse_api_date(answer.submission_date)
+        formatted_submission_date = sub_date.strftime("%d.%m.%Y") if sub_date else answer.submission_date
+        message += f"**Złożono:** {formatted_submission_date}\n"
+    
+    if answer.days_to_response is not None:
+        message += f"**Dni do odpowiedzi:** {answer.days_to_response}\n"
+    
+    # Add prolongation information if available
+    if answer.has_prolongation:
+        message += f"⏰ **Przedłużenie terminu odpowiedzi**\n"
+    
+    # Extract href from URL object or use URL directly if it's a string
+    url_display = answer.url['href'] if isinstance(answer.url, dict) and 'href' in answer.url else answer.url
+    message += f"{url_display}\n\n--------------------------------\n\n"
+    
+    # Add Mattermost users for this specific interpellation
+    interpellation_users = answer.mattermost_users
+    if interpellation_users:
+        message += f"{interpellation_users}\n"
+    
+    return message
+
+def format_deadline_message(alert):
+    """Build the Mattermost message about an upcoming or missed answer deadline"""
+    if alert.stage == "overdue":
+        message = f"## 🚨 Minął termin odpowiedzi na interpelację!\n\n"
+    else:
+        message = f"## ⏰ Zbliża się termin odpowiedzi na interpelację\n\n"
+    message += f"#### {alert.title} {alert.type} ({alert.id})\n"
+    
+    if alert.from_names:
+        message += f"**Zapytanie złożył/a/li:** {alert.from_names}\n"
+    
+    if alert.submission_date:
+        sub_date = parse_api_date(alert.submission_date)
+        message += f"**Złożono:** {sub_date.strftime('%d.%m.%Y') if sub_date else alert.submission_date}\n"
+    
+    due_date = datetime.strptime(alert.due_date, "%Y-%m-%d").strftime("%d.%m.%Y")
+    message += f"**Termin odpowiedzi:** {due_date}{' (przedłużony)' if alert.prolonged else ''}\n"
+    
+    url_display = alert.url['href'] if isinstance(alert.url, dict) and 'href' in alert.url else alert.url
+    message += f"{url_display}\n\n--------------------------------\n\n"
+    
+    if alert.mattermost_users:
+        message += f"{alert.mattermost_users}\n"
+    
+    return message
+
+def format_outbox_message(entry):
+    """Build the Mattermost message of an outbox entry (new answers or a deadline alert)"""
+    if entry.get('kind') == "deadline":
+        return format_deadline_message(DeadlineAlert.from_dict(entry['alert']))
+    return format_answer_message(NewAnswer.from_dict(entry['answer']))
+
+def get_outbox_path():
+    """Get absolute path to the notification outbox file"""
+    return os.path.join(get_data_dir(), "outbox.json")
+
+def load_outbox():
+    """Load the notification outbox from disk (kept in memory between daemon cycles)"""
+    global _outbox
+    with _outbox_lock:
+        if _keep_state_warm and _outbox is not None:
+            return
+    
+    outbox = {'pending': [], 'delivered': {}, 'failed': []}
+    filename = get_outbox_path()
+    try:
+        if os.path.exists(filename):
+            with open(filename, 'r', encoding='utf-8') as f:
+                outbox.update(json.load(f))
+    except Exception as e:
+        log(f"⚠️  Błąd podczas wczytywania kolejki powiadomień: {e}")
+    
+    with _outbox_lock:
+        _outbox = outbox
+
+def save_outbox():
+    """Persist the notification outbox; must be called with _outbox_lock held"""
+    try:
+        write_json_atomic(get_outbox_path(), _outbox)
+    except Exception as e:
+        log(f"⚠️  Błąd podczas zapisywania kolejki powiadomień: {e}")
+
+def get_notification_id(answer, term):
+    """Get a deterministic ID of the notification about an answer
+    
+    The same replies to the same interpellation always map to the same ID, so re-diffing
+    after a crash (or co-signers reporting it twice) never queues it again.
+    """
+    key = f"{term}:{answer.type}:{answer.id}:{','.join(answer.reply_ids) or answer.current_replies}"
+    return hashlib.sha1(key.encode('utf-8')).hexdigest()
+
+def enqueue_notifications(new_answers, term):
+    """Persist notifications about new answers in the outbox before the state is saved"""
+    if not new_answers:
+        return
+    
+    if not any(answer.routes for answer in new_answers):
+        log("⚠️  Brak URL webhook Mattermost - pomijam powiadomienia")
+        return
+    
+    if _outbox is None:
+        load_outbox()
+    
+    default_webhook_url = get_mattermost_webhook_url()
+    with _outbox_lock:
+        pending_by_id = {entry['id']: entry for entry in _outbox['pending']}
+        queued_count = 0
+        
+        for answer in new_answers:
+            for webhook_url, users in answer.routes:
+                # The main webhook keeps the original ID, so entries queued before subscriptions still match
+                notification_id = get_notification_id(answer, term)
+                if webhook_url != default_webhook_url:
+                    notification_id = hashlib.sha1(f"{notification_id}:{webhook_url}".encode('utf-8')).hexdigest()
+                if notification_id in _outbox['delivered']:
+                    continue
+                
+                entry = pending_by_id.get(notification_id)
+                if entry:
+                    # Same interpellation from different MPs - merge their Mattermost users
+                    merged_users = entry['answer'].get('mattermost_users', '').split() + users.split()
+                    entry['answer']['mattermost_users'] = ' '.join(dict.fromkeys(merged_users))
+                    continue
+                
+                answer_data = answer.to_dict()
+                answer_data['mattermost_users'] = users
+                entry = {
+                    'id': notification_id,
+                    'answer': answer_data,
+                    'webhook_url': webhook_url,
+                    'created_at': time.time(),
+                    'attempts': 0,
+                    'next_attempt_at': 0,
+                    'last_error': None
+                }
+                _outbox['pending'].append(entry)
+                pending_by_id[notification_id] = entry
+                queued_count += 1
+        
+        save_outbox()
+    
+    if queued_count:
+        log(f"📥 Dodano {queued_count} powiadomień do kolejki")
+
+def get_deadlines_path():
+    """Get absolute path to the answer deadline index file"""
+    return os.path.join(get_data_dir(), "deadlines.json")
+
+def load_deadlines(config):
+    """Load the deadline index and build its heap (kept in memory between daemon cycles)"""
+    global _deadlines, _deadline_heap, _deadlines_dirty
+    
+    settings = get_settings_section(config, 'deadlines', DEFAULT_DEADLINE_SETTINGS)
+    with _deadlines_lock:
+        changed = settings != _deadline_settings
+        _deadline_settings.update(settings)
+        if not settings['enabled'] or (_keep_state_warm and _deadlines is not None and not changed):
+            return
+    
+    state = {'deadlines': {}, 'indexed': []}
+    filename = get_deadlines_path()
+    try:
+        if os.path.exists(filename):
+            with open(filename, 'r', encoding='utf-8') as f:
+                state.update(json.load(f))
+    except Exception as e:
+        log(f"⚠️  Błąd podczas wczytywania terminów odpowiedzi: {e}")
+    
+    with _deadlines_lock:
+        _deadlines = {
+            'entries': {key: Deadline.from_dict(data) for key, data in state['deadlines'].items()},
+            'indexed': set(state['indexed'])
+        }
+        _deadline_heap = []
+        for deadline in _deadlines['entries'].values():
+            push_deadline_stages(deadline)
+        heapq.heapify(_deadline_heap)
+        _deadlines_dirty = False
+
+def save_deadlines():
+    """Save the deadline index to disk if it changed"""
+    global _deadlines_dirty
+    with _deadlines_lock:
+        if _deadlines is None or not _deadlines_dirty:
+            return
+        state = {
+            'deadlines': {key: deadline.to_dict() for key, deadline in _deadlines['entries'].items()},
+            'indexed': sorted(_deadlines['indexed'])
+        }
+        _deadlines_dirty = False
+    
+    try:
+        write_json_atomic(get_deadlines_path(), state)
+    except Exception as e:
+        log(f"⚠️  Błąd podczas zapisywania terminów odpowiedzi: {e}")
+
+def get_due_date(item):
+    """Get the last day to answer an item and whether it was prolonged, or (None, False) if none applies
+    
+    Answered items have no deadline. A prolongation moves the deadline to prolongation_days
+    after the latest prolongation reply.
+    """
+    if any(not reply.prolongation for reply in item.replies_data):
+        return None, False
+    
+    prolongations = [reply.receipt_date or reply.last_modified for reply in item.replies_data]
+    prolongations = [parse_api_date(value) for value in prolongations if value]
+    prolongations = [value for value in prolongations if value]
+    if prolongations:
+        return (max(prolongations) + timedelta(days=_deadline_settings['prolongation_days'])).date(), True
+    
+    submitted_on = parse_api_date(item.submitted_on) if item.submitted_on else None
+    if submitted_on is None:
+        return None, False
+    return (submitted_on + timedelta(days=_deadline_settings['answer_days'])).date(), False
+
+def get_deadline_stage_times(deadline):
+    """Get the times at which the stages of a deadline are due (the deadline passes at the end of its day)"""
+    due_date = datetime.strptime(deadline.due_date, "%Y-%m-%d")
+    stages = {'overdue': (due_date + timedelta(days=1)).timestamp()}
+    if _deadline_settings['reminder_days'] > 0:
+        stages['reminder'] = (due_date - timedelta(days=_deadline_settings['reminder_days'])).timestamp()
+    return stages
+
+def push_deadline_stages(deadline):
+    """Add the stages not notified yet to the heap; must be called with _deadlines_lock held"""
+    for stage, fire_at in get_deadline_stage_times(deadline).items():
+        if stage not in deadline.notified:
+            heapq.heappush(_deadline_heap, (fire_at, deadline.key, stage, deadline.due_date))
+
+def track_deadline(item, term, bootstrap=False):
+    """Add, update or drop the deadline of an item; must be called with _deadlines_lock held
+    
+    When an item is first seen while bootstrapping, stages already in the past are marked as
+    notified, so enabling the tracker does not report the whole history as overdue.
+    """
+    global _deadlines_dirty
+    key = f"{term}:{item.type}:{item.id}"
+    due_date, prolonged = get_due_date(item)
+    existing = _deadlines['entries'].get(key)
+    
+    if due_date is None:
+        if existing:
+            del _deadlines['entries'][key]
+            _deadlines_dirty = True
+        return
+    
+    due_date = due_date.isoformat()
+    if existing and existing.due_date == due_date:
+        return
+    
+    deadline = Deadline(
+        id=item.id, type=item.type, term=str(term), title=item.title, url=item.url,
+        from_ids=item.from_ids, submission_date=item.submitted_on, due_date=due_date, prolonged=prolonged,
+        recipients=item.recipients
+    )
+    if bootstrap or not existing:
+        now = time.time()
+        deadline.notified = tuple(
+            stage for stage, fire_at in get_deadline_stage_times(deadline).items()
+            if fire_at <= now and (bootstrap or stage == "reminder"))
+    
+    _deadlines['entries'][key] = deadline
+    push_deadline_stages(deadline)
+    _deadlines_dirty = True
+
+def index_deadlines(mp_id, previous_results, term):
+    """Index the deadlines of the stored items of an MP the first time the tracker sees it"""
+    global _deadlines_dirty
+    if not _deadline_settings['enabled'] or _deadlines is None:
+        return
+    
+    with _deadlines_lock:
+        indexed_key = f"{term}:{mp_id}"
+        if indexed_key in _deadlines['indexed']:
+            return
+        for item in previous_results:
+            track_deadline(item, term, bootstrap=True)
+        _deadlines['indexed'].add(indexed_key)
+        _deadlines_dirty = True
+
+def update_deadlines(changeset, term):
+    """Update the deadline index from a changeset - only added, changed and removed items are touched"""
+    global _deadlines_dirty
+    if not _deadline_settings['enabled'] or _deadlines is None:
+        return
+    
+    with _deadlines_lock:
+        for change in changeset.added:
+            track_deadline(change.item, term, bootstrap=changeset.initial or changeset.baseline_added)
+        for change in changeset.changed:
+            track_deadline(change.item, term, bootstrap=changeset.initial)
+        for item in changeset.removed:
+            if _deadlines['entries'].pop(f"{term}:{item.type}:{item.id}", None):
+                _deadlines_dirty = True
+
+def pop_due_deadlines():
+    """Pop deadline stages whose time has come from the heap as (deadline, stage, heap entry)
+    
+    Heap entries of deadlines that were answered, moved or already notified are dropped.
+    Stages are only marked as notified by mark_deadlines_notified, once they were queued.
+    """
+    now = time.time()
+    due = []
+    seen = set()
+    with _deadlines_lock:
+        while _deadline_heap and _deadline_heap[0][0] <= now:
+            heap_entry = heapq.heappop(_deadline_heap)
+            _, key, stage, due_date = heap_entry
+            deadline = _deadlines['entries'].get(key)
+            if deadline is None or deadline.due_date != due_date or stage in deadline.notified or (key, stage) in seen:
+                continue
+            seen.add((key, stage))
+            due.append((deadline, stage, heap_entry))
+    return due
+
+def mark_deadlines_notified(stages):
+    """Mark (deadline, stage) pairs as notified once their alerts were queued"""
+    global _deadlines_dirty
+    with _deadlines_lock:
+        for deadline, stage in stages:
+            if stage not in deadline.notified:
+                deadline.notified += (stage,)
+                _deadlines_dirty = True
+
+def enqueue_deadline_alerts():
+    """Queue reminders and overdue notifications for deadlines whose time has come"""
+    if not _deadline_settings['enabled'] or _deadlines is None:
+        return
+    
+    due = pop_due_deadlines()
+    if not due:
+        return
+    
+    # Routes are resolved before taking the outbox lock (club subscriptions may look up MPs)
+    alerts = []
+    unroutable = []
+    for deadline, stage, heap_entry in due:
+        routes = get_notification_routes(deadline.title, deadline.recipients, deadline.from_ids, deadline.term)
+        if routes:
+            alerts.append((deadline, stage, routes, convert_mp_ids_to_names(deadline.from_ids, deadline.term)))
+        else:
+            unroutable.append(heap_entry)
+    
+    # Stages nobody could be told about stay due, e.g. until the webhook URL is configured again
+    if unroutable:
+        with _deadlines_lock:
+            for heap_entry in unroutable:
+                heapq.heappush(_deadline_heap, heap_entry)
+        log(f"⚠️  Brak URL webhook Mattermost - {len(unroutable)} powiadomień o terminach czeka na następne uruchomienie")
+    if not alerts:
+        return
+    
+    if _outbox is None:
+        load_outbox()
+    
+    with _outbox_lock:
+        pending_ids = {entry['id'] for entry in _outbox['pending']}
+        queued_count = 0
+        for deadline, stage, routes, from_names in alerts:
+            for webhook_url, users in routes:
+                key = f"{deadline.key}:{deadline.due_date}:{stage}:{webhook_url}"
+                notification_id = hashlib.sha1(f"deadline:{key}".encode('utf-8')).hexdigest()
+                if notification_id in _outbox['delivered'] or notification_id in pending_ids:
+                    continue
+                
+                alert = DeadlineAlert(
+                    id=deadline.id,
+                    type=deadline.type,
+                    title=deadline.title,
+                    url=deadline.url,
+                    from_names=from_names,
+                    stage=stage,
+                    due_date=deadline.due_date,
+                    prolonged=deadline.prolonged,
+                    submission_date=deadline.submission_date,
+                    mattermost_users=users
+                )
+                _outbox['pending'].append({
+                    'id': notification_id,
+                    'kind': "deadline",
+                    'alert': alert.to_dict(),
+                    'webhook_url': webhook_url,
+                    'created_at': time.time(),
+                    'attempts': 0,
+                    'next_attempt_at': 0,
+                    'last_error': None
+                })
+                pending_ids.add(notification_id)
+                queued_count += 1
+        
+        save_outbox()
+    
+    mark_deadlines_notified([(deadline, stage) for deadline, stage, _, _ in alerts])
+    count_event('deadline_alerts', queued_count)
+    if queued_count:
+        log(f"⏰ Dodano {queued_count} powiadomień o terminach odpowiedzi do kolejki")
+
+def wait_for_delivery_slot(rate_per_second):
+    """Block until the shared delivery rate limit allows the next webhook call"""
+    global _delivery_next_slot
+    if rate_per_second <= 0:
+        return
+    
+    with _delivery_rate_lock:
+        now = time.monotonic()
+        slot = max(now, _delivery_next_slot)
+        _delivery_next_slot = slot + 1.0 / rate_per_second
+    
+    if slot > now:
+        time.sleep(slot - now)
+
+def truncate_message(text, max_length):
+    """Shorten a message that would not fit in one Mattermost post"""
+    if len(text) <= max_length:
+        return text
+    marker = "\n\n… (wiadomość skrócona)\n\n"
+    return text[:max(0, max_length - len(marker))] + marker
+
+def build_delivery_batches(entries, settings):
+    """Group due outbox entries into messages (one per entry, or packed digests)
+    
+    An entry longer than max_message_length on its own is truncated, so it is never
+    rejected by Mattermost on every attempt.
+    """
+    max_length = settings['max_message_length']
+    if not settings['digest']:
+        return [([entry], truncate_message(format_outbox_message(entry), max_length)) for entry in entries]
+    
+    batches = []
+    by_webhook = {}
+    for entry in entries:
+        by_webhook.setdefault(entry['webhook_url'], []).append(entry)
+    
+    for webhook_entries in by_webhook.values():
+        batch_entries, batch_text = [], ""
+        for entry in webhook_entries:
+            text = truncate_message(format_outbox_message(entry), max_length)
+            if batch_entries and len(batch_text) + len(text) > max_length:
+                batches.append((batch_entries, batch_text))
+                batch_entries, batch_text = [], ""
+            batch_entries.append(entry)
+            batch_text += text
+        if batch_entries:
+            batches.append((batch_entries, batch_text))
+    
+    return batches
+
+def deliver_batch(batch, settings):
+    """Deliver one message, retrying with backoff
+    
+    Returns (success, retry_after) where retry_after is the last delay requested by the server.
+    A Retry-After longer than http.retry_max_delay is not waited for - the message is left
+    for a later run instead.
+    """
+    entries, message = batch
+    webhook_url = entries[0]['webhook_url']
+    
+    if _dry_run:
+        log(f"🧪 Powiadomienie (bez wysyłania):\n{message}")
+        return True, None
+    
+    retry_after = None
+    for attempt in range(max(1, settings['retries_per_run'])):
+        if attempt:
+            if retry_after is not None and retry_after > _http_settings['retry_max_delay']:
+                log(f"⏳ Mattermost prosi o {retry_after:.0f}s przerwy - ponowię w następnym uruchomieniu")
+                break
+            delay = min(2 ** attempt, 30)
+            if retry_after is not None:
+                delay = max(delay, retry_after)
+            if _shutdown_event.wait(delay):
                 break
+        
+        wait_for_delivery_slot(settings['rate_per_second'])
+        success, retry_after = post_mattermost_message(message, webhook_url)
+        if success:
+            return True, None
+    
+    return False, retry_after
+
+def deliver_outbox(config=None):
+    """Deliver due notifications from the outbox, marking each as delivered once accepted"""
+    settings = get_settings_section(config or get_config(), 'notifications', DEFAULT_NOTIFICATION_SETTINGS)
+    
+    if _outbox is None:
+        load_outbox()
+    
+    now = time.time()
+    with _outbox_lock:
+        # Forget old delivered IDs - by then the state can no longer re-report those answers
+        retention = settings['delivered_retention_days'] * 86400
+        _outbox['delivered'] = {
+            notification_id: delivered_at
+            for notification_id, delivered_at in _outbox['delivered'].items()
+            if now - delivered_at < retention
+        }
+        due = [entry for entry in _outbox['pending'] if entry.get('next_attempt_at', 0) <= now]
+    
+    if not due:
+        return
+    
+    batches = build_delivery_batches(due, settings)
+    if _dry_run:
+        log(f"🧪 Powiadomienia bez wysyłania: {len(batches)} ({len(due)} interpelacji)")
+    else:
+        log(f"📧 Wysyłam {len(batches)} powiadomień ({len(due)} interpelacji)...")
+    
+    def deliver(batch):
+        success, retry_after = deliver_batch(batch, settings)
+        finished_at = time.time()
+        
+        with _outbox_lock:
+            delivered_ids = {entry['id'] for entry in batch[0]}
+            if success:
+                _outbox['pending'] = [entry for entry in _outbox['pending'] if entry['id'] not in delivered_ids]
+                for notification_id in delivered_ids:
+                    _outbox['delivered'][notification_id] = finished_at
+            else:
+                for entry in batch[0]:
+                    entry['attempts'] = entry.get('attempts', 0) + 1
+                    entry['last_error'] = finished_at
+                    delay = settings['retry_base_seconds'] * 2 ** (entry['attempts'] - 1)
+                    if retry_after is not None:
+                        delay = max(delay, retry_after)
+                    entry['next_attempt_at'] = finished_at + min(delay, MAX_RETRY_DELAY_SECONDS)
+                    
+                    if entry['attempts'] >= settings['max_attempts']:
+                        item = entry.get('answer') or entry['alert']
+                        log(f"❌ Rezygnuję z powiadomienia o {item['type']} {item['id']} po {entry['attempts']} próbach")
+                        _outbox['pending'].remove(entry)
+                        _outbox['failed'] = (_outbox['failed'] + [entry])[-100:]
+            
+            # Persist after every message, so a crash never resends delivered ones
+            save_outbox()
+        return success
+    
+    workers = max(1, min(settings['workers'], len(batches)))
+    if workers == 1:
+        results = [deliver(batch) for batch in batches]
+    else:
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="notify") as executor:
+            results = list(executor.map(deliver, batches))
+    
+    # Nothing was sent in a dry run, so it is neither counted nor reported as delivered
+    if _dry_run:
+        log(f"🧪 Zalogowano {len(batches)} powiadomień bez wysyłania do Mattermost")
+        return
+    
+    delivered_count = sum(1 for success in results if success)
+    count_event('notifications_sent', delivered_count)
+    count_event('notifications_failed', len(batches) - delivered_count)
+    log(f"✅ Wysłano {delivered_count}/{len(batches)} powiadomień do Mattermost")
+    if delivered_count < len(batches):
+        log(f"🔁 {len(batches) - delivered_count} powiadomień pozostaje w kolejce do ponownej próby")
+
+def load_previous_results(mp_id):
+    """Load previous results for specific MP from the configured state backend"""
+    # In daemon mode results saved in an earlier cycle are kept in memory
+    if _keep_state_warm:
+        with _results_cache_lock:
+            if (_state_term, mp_id) in _results_cache:
+                return _results_cache[(_state_term, mp_id)]
+    
+    if _state_backend == "sqlite":
+        return load_previous_results_from_db(mp_id)
+    
+    filename = get_data_file_path(mp_id)
+    log(f"🔍 Sprawdzam plik dla posła {mp_id}: {filename}", "debug")
+    try:
+        if os.path.exists(filename):
+            log(f"✅ Plik istnieje, wczytuję dane...", "debug")
+            with get_mp_file_lock(mp_id), open(filename, 'r', encoding='utf-8') as f:
+                data = [Interpellation.from_dict(item) for item in json.load(f) if item.get('id')]
+                log(f"📊 Wczytano {len(data)} interpelacji z pliku")
+                return data
+        else:
+            log(f"❌ Plik nie istnieje: {filename}", "debug")
+        return []
+    except Exception as e:
+        log(f"⚠️  Błąd podczas wczytywania poprzednich wyników: {e}")
+        return []
+
+def diff_results(current_results, previous_results):
+    """Compare current results with the stored ones in a single linear pass
+    
+    Replies are matched by their key, so a replaced reply shows up as added (and removed)
+    even if the reply count did not change. Submission dates known from the stored results
+    are carried over to current items (they never change) before comparing.
+    """
+    previous_dict = {item.key: item for item in previous_results}
+    changeset = Changeset(initial=not previous_results)
+    seen_keys = set()
+    
+    for item in current_results:
+        # An item listed twice (e.g. an MP named twice among co-signers) is compared once
+        if item.key in seen_keys:
+            continue
+        seen_keys.add(item.key)
+        
+        previous = previous_dict.pop(item.key, None)
+        if previous is None:
+            reply_ids = tuple(reply.get_id(position) for position, reply in enumerate(item.replies_data))
+            changeset.added.append(ItemChange(item, None, item.replies_data, (), reply_ids))
+            continue
+        
+        if not item.submission_date and previous.submission_date:
+            item.submission_date = previous.submission_date
+            item.update_timing()
+        if item == previous:
+            continue
+        
+        previous_replies = {reply.get_id(position): reply for position, reply in enumerate(previous.replies_data)}
+        added_replies = []
+        added_reply_ids = []
+        for position, reply in enumerate(item.replies_data):
+            reply_id = reply.get_id(position)
+            if previous_replies.pop(reply_id, None) is None:
+                added_replies.append(reply)
+                added_reply_ids.append(reply_id)
+        
+        changeset.changed.append(ItemChange(
+            item, previous, tuple(added_replies), tuple(previous_replies.values()), tuple(added_reply_ids)))
+    
+    changeset.removed = list(previous_dict.values())
+    return changeset
+
+def get_new_answers(changeset, mp_id, term):
+    """Build new answers (without sending notifications) from a changeset"""
+    if changeset.initial:
+        log("📝 Pierwsze uruchomienie - brak poprzednich wyników do porównania")
+        log("📭 Brak nowych odpowiedzi")
+        return []
+    
+    log(f"🔍 Porównuję z poprzednimi wynikami dla posła {mp_id}...")
+    
+    changes = changeset.with_new_replies
+    if changeset.baseline_added:
+        # Items newly matched by changed subscriptions are old news - only stored ones are reported
+        log(f"📝 Zmieniono subskrypcje - {len(changeset.added)} nowo pasujących interpelacji zapisano bez powiadomień")
+        changes = [change for change in changes if change.previous is not None]
+    new_answers = [build_new_answer(change, term) for change in changes]
+    
+    if new_answers:
+        log(f"🎉 Znaleziono {len(new_answers)} interpelacji z nowymi odpowiedziami!")
+        
+        # Log IDs of interpelations with new answers
+        answer_ids = [answer.id for answer in new_answers]
+        log(f"📋 ID interpelacji z nowymi odpowiedziami: {', '.join(answer_ids)}")
+    else:
+        log("📭 Brak nowych odpowiedzi")
+    
+    return new_answers
+
+def build_new_answer(change, term):
+    """Build the new answer reported for an item with new replies"""
+    item = change.item
+    new_replies = change.added_replies
+    
+    return NewAnswer(
+        id=item.id,
+        type=item.type,
+        title=item.title,
+        url=item.url,
+        from_names=convert_mp_ids_to_names(item.from_ids, term),  # Convert MP IDs to names only for items with new answers
+        previous_replies=change.previous.replies if change.previous else 0,
+        current_replies=item.replies,
+        new_count=len(new_replies),
+        has_prolongation=any(reply.prolongation for reply in new_replies),
+        reply_authors=tuple(dict.fromkeys(reply.author for reply in new_replies if reply.author)),
+        mattermost_users=get_mattermost_users_for_interpellation(item.from_ids, term),
+        submission_date=item.submitted_on,
+        first_response_date=item.first_response_date,
+        days_to_response=item.days_to_response,
+        reply_ids=change.added_reply_ids,
+        routes=get_notification_routes(item.title, item.recipients, item.from_ids, term)
+    )
+
+def has_previous_results(mp_id):
+    """Check whether stored results exist for specific MP (an empty result of the last sync counts too)"""
+    if is_mp_synced_empty(mp_id):
+        return True
+    if _state_backend == "sqlite":
+        with _state_db_lock:
+            row = _state_db.execute(
+                "SELECT 1 FROM mp_interpellations WHERE mp_id = ? LIMIT 1", (str(mp_id),)).fetchone()
+        return row is not None
+    return os.path.exists(get_data_file_path(mp_id))
+
+def save_results(results, mp_id, changeset=None):
+    """Save search results for specific MP to the configured state backend
+    
+    With a changeset only the items it reports are written (nothing at all if it is empty).
+    """
+    if _keep_state_warm:
+        with _results_cache_lock:
+            _results_cache[(_state_term, mp_id)] = results
+    
+    if _state_backend == "sqlite":
+        return save_results_to_db(results, mp_id, changeset)
+    return save_results_to_json(results, mp_id, changeset)
+
+def save_results_to_json(results, mp_id, changeset=None):
+    """Save search results to JSON file for specific MP"""
+    filename = get_data_file_path(mp_id)
+    
+    if changeset is not None and not changeset and not changeset.initial:
+        written = False
+    else:
+        with get_mp_file_lock(mp_id):
+            written = write_json_atomic(filename, [item.to_dict() for item in results], indent=None if _compact_json else 2)
+    
+    if not written:
+        log(f"💤 Wyniki posła {mp_id} nie zmieniły się - pomijam zapis pliku")
+    print_results_summary(results, mp_id, filename)
+    return filename
+
+def print_results_summary(results, mp_id, location):
+    """Print answered/unanswered totals for specific MP"""
+    # Count answers
+    answered_count = sum(1 for item in results if item.replies > 0)
+    total_count = len(results)
+    
+    # Get current date and time
+    current_datetime = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+    
+    # Build the summary as a single block so parallel workers don't interleave its lines
+    summary = [
+        "\n" + "="*60,
+        f"PODSUMOWANIE WYNIKÓW DLA POSŁA {mp_id}",
+        "="*60,
+        f"Data sprawdzenia: {current_datetime}",
+        f"Wyniki zapisano do pliku: {location}",
+        f"Łączna liczba interpelacji: {total_count}",
+        f"Interpelacje z odpowiedziami: {answered_count}",
+        f"Interpelacje bez odpowiedzi: {total_count - answered_count}",
+    ]
+    
+    if total_count > 0:
+        answered_percentage = (answered_count / total_count) * 100
+        summary.append(f"Procent interpelacji z odpowiedziami: {answered_percentage:.1f}%")
+    
+    summary.append("="*60)
+    log("\n".join(summary))
+
+def get_stats_path():
+    """Get absolute path to the response time statistics file"""
+    return os.path.join(get_data_dir(), "stats.json")
+
+def load_stats():
+    """Load the response time statistics (kept in memory between daemon cycles)"""
+    global _stats, _stats_dirty
+    with _stats_lock:
+        if _keep_state_warm and _stats is not None:
+            return
+    
+    terms = {}
+    outdated = False
+    filename = get_stats_path()
+    try:
+        if os.path.exists(filename):
+            with open(filename, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+            if data.get('version') == STATS_VERSION:
+                terms = data.get('terms', {})
+            else:
+                log("🔄 Statystyki zapisano w innym formacie - zostaną przeliczone z zapisanych wyników")
+                outdated = True
+    except Exception as e:
+        log(f"⚠️  Błąd podczas wczytywania statystyk: {e}")
+        terms = {}
+    
+    with _stats_lock:
+        _stats = {}
+        for term, data in terms.items():
+            _stats[term] = {
+                'items': data.get('items', {}),
+                'indexed': set(data.get('indexed', [])),
+                'groups': {
+                    dimension: {group: ResponseStats.from_dict(stats) for group, stats in groups.items()}
+                    for dimension, groups in (data.get('groups') or {}).items()
+                }
+            }
+        # Outdated statistics are replaced right away, so MPs are re-indexed by the next run or report
+        _stats_dirty = outdated
+
+def save_stats():
+    """Save the response time statistics to disk if they changed"""
+    global _stats_dirty
+    with _stats_lock:
+        if _stats is None or not _stats_dirty:
+            return
+        terms = {
+            term: {
+                'items': data['items'],
+                'indexed': sorted(data['indexed']),
+                'groups': {
+                    dimension: {group: stats.to_dict() for group, stats in groups.items() if stats.items}
+                    for dimension, groups in data['groups'].items()
+                }
+            }
+            for term, data in _stats.items()
+        }
+        _stats_dirty = False
+    
+    try:
+        write_json_atomic(get_stats_path(), {'version': STATS_VERSION, 'terms': terms})
+    except Exception as e:
+        log(f"⚠️  Błąd podczas zapisywania statystyk: {e}")
+
+def get_stats_contribution(item):
+    """Get what an item adds to the statistics: answered flag, days to answer, ministry and MPs
+    
+    Prolongation notices are not answers (as in get_due_date), so an item whose only replies
+    prolong the deadline counts as unanswered.
+    """
+    answers = [reply for reply in item.replies_data if not reply.prolongation]
+    first_answer = min(answers, key=lambda reply: reply.last_modified or "9999", default=None)
+    days = None
+    if first_answer and first_answer.last_modified and item.submitted_on:
+        days = calculate_days_between_dates(item.submitted_on, first_answer.last_modified)
+    return {
+        'type': item.type,
+        'answered': first_answer is not None,
+        'days': days,
+        'ministry': first_answer.author if first_answer else None,
+        'mps': [mp_id.strip() for mp_id in item.from_ids.split(',') if mp_id.strip()]
+    }
+
+def apply_stats_contribution(term_stats, contribution, sign):
+    """Add (or retract) an item contribution to every group it belongs to; requires _stats_lock"""
+    groups = [("term", "all"), ("type", contribution['type']),
+              ("ministry", contribution['ministry'] or STATS_NO_REPLY_GROUP)]
+    groups.extend(("mp", mp_id) for mp_id in dict.fromkeys(contribution['mps']))
+    for dimension, group in groups:
+        stats = term_stats['groups'].setdefault(dimension, {}).setdefault(group, ResponseStats())
+        stats.add(contribution['answered'], contribution['days'], sign)
+
+def track_stats_item(term_stats, item):
+    """Replace the contribution of an item; requires _stats_lock. Co-signers share one contribution."""
+    global _stats_dirty
+    key = f"{item.type}:{item.id}"
+    contribution = get_stats_contribution(item)
+    previous = term_stats['items'].get(key)
+    if previous == contribution:
+        return
+    if previous:
+        apply_stats_contribution(term_stats, previous, -1)
+    apply_stats_contribution(term_stats, contribution, 1)
+    term_stats['items'][key] = contribution
+    _stats_dirty = True
+
+def get_term_stats(term):
+    """Get the statistics of a term, creating them if needed; requires _stats_lock"""
+    return _stats.setdefault(str(term), {'items': {}, 'indexed': set(), 'groups': {}})
+
+def index_stats(mp_id, previous_results, term):
+    """Add the stored items of an MP to the statistics the first time they see the MP"""
+    global _stats_dirty
+    if _stats is None:
+        return
+    with _stats_lock:
+        term_stats = get_term_stats(term)
+        if str(mp_id) in term_stats['indexed']:
+            return
+        for item in previous_results:
+            track_stats_item(term_stats, item)
+        term_stats['indexed'].add(str(mp_id))
+        _stats_dirty = True
+
+def update_stats(changeset, term):
+    """Update the statistics from a changeset - unchanged items are never touched"""
+    global _stats_dirty
+    if _stats is None or not changeset:
+        return
+    with _stats_lock:
+        term_stats = get_term_stats(term)
+        for change in changeset.added + changeset.changed:
+            track_stats_item(term_stats, change.item)
+        for item in changeset.removed:
+            previous = term_stats['items'].pop(f"{item.type}:{item.id}", None)
+            if previous:
+                apply_stats_contribution(term_stats, previous, -1)
+                _stats_dirty = True
+
+def build_report_rows(term, dimension, mp_ids=None):
+    """Build report rows for a dimension of the term statistics, largest groups first
+    
+    With mp_ids the "mp" dimension is limited to those MPs (co-signers outside the config only
+    have the items shared with configured MPs).
+    """
+    with _stats_lock:
+        groups = dict((_stats or {}).get(str(term), {}).get('groups', {}).get(dimension, {}))
+    
+    rows = []
+    for group, stats in groups.items():
+        if not stats.items or (dimension == "mp" and mp_ids is not None and group not in mp_ids):
+            continue
+        name = group
+        if dimension == "mp":
+            mp_data = get_cached_mp_data(group, term)
+            name = mp_data['name'] if mp_data and mp_data.get('name') else group
+        mean = stats.mean()
+        rows.append({
+            'group': name,
+            'items': stats.items,
+            'answered': stats.answered,
+            'unanswered': stats.items - stats.answered,
+            'answered_percent': round(stats.answered / stats.items * 100, 1),
+            'mean_days': round(mean, 1) if mean is not None else None,
+            'median_days': stats.percentile(0.5),
+            'p90_days': stats.percentile(0.9)
+        })
+    rows.sort(key=lambda row: (-row['items'], str(row['group'])))
+    return rows
+
+def format_report(rows, output_format, title):
+    """Render report rows as Markdown, CSV or JSON"""
+    if output_format == "json":
+        return json.dumps({'report': title, 'rows': rows}, ensure_ascii=False, indent=2) + "\n"
+    
+    columns = ['group', 'items', 'answered', 'unanswered', 'answered_percent', 'mean_days', 'median_days', 'p90_days']
+    if output_format == "csv":
+        buffer = io.StringIO()
+        writer = csv.DictWriter(buffer, fieldnames=columns, lineterminator="\n")
+        writer.writeheader()
+        writer.writerows(rows)
+        return buffer.getvalue()
+    
+    headers = ["Grupa", "Interpelacje", "Z odpowiedzią", "Bez odpowiedzi", "% z odpowiedzią",
+               "Średnio dni", "Mediana dni", "P90 dni"]
+    lines = [f"## {title}", "", "| " + " | ".join(headers) + " |", "|" + "---|" * len(headers)]
+    for row in rows:
+        values = ["" if row[column] is None else str(row[column]).replace("|", "\\|") for column in columns]
+        lines.append("| " + " | ".join(values) + " |")
+    return "\n".join(lines) + "\n"
+
+def run_report(config, args):
+    """Print response time statistics from the stored aggregates (no API requests)"""
+    global _log_level
+    term = str(args.term or config.get('sejm_term', '10'))
+    mp_ids = [str(mp_config.get('id')) for mp_config in config.get('mps', [])
+              if mp_config.get('id') and get_mp_term(mp_config, config) == term]
+    
+    # Keep the report output clean
+    _log_level = max(_log_level, LOG_LEVELS['warning'])
+    load_mp_cache(term, config)
+    load_stats()
+    owner = get_root_state_owner()
+    if owner is not None and owner != str(config.get('sejm_term', '10')):
+        # Moving state is left to a run holding the run lock
+        log(f"❌ Katalog danych zawiera stan kadencji {owner} - uruchom bota, aby przeniósł go po zmianie sejm_term", level="warning")
+        return
+    select_state_term(term, config)
+    configure_state_store(config)
+    
+    # MPs not seen by a run since the statistics were introduced are indexed from their stored results once
+    with _stats_lock:
+        missing = [mp_id for mp_id in mp_ids if mp_id not in get_term_stats(term)['indexed']]
+    for mp_id in missing:
+        index_stats(mp_id, load_previous_results(mp_id), term)
+    save_stats()
+    close_state_store()
+    
+    labels = {'term': "kadencja", 'type': "typ", 'ministry': "odpowiadający", 'mp': "poseł"}
+    rows = build_report_rows(term, args.by, mp_ids)
+    report = format_report(rows, args.format, f"Czas odpowiedzi na interpelacje - kadencja {term}, według: {labels[args.by]}")
+    
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8', newline='') as f:
+            f.write(report)
+        log(f"💾 Raport zapisano do {args.output}", level="warning")
+    else:
+        print(report, end="")
+
+def get_state_db_path():
+    """Get absolute path to the SQLite state store"""
+    return os.path.join(get_state_dir(), "interpelbot.db")
+
+def configure_state_store(config):
+    """Select the state backend from config and open the SQLite store if needed"""
+    global _state_backend, _state_db, _compact_json
+    
+    _compact_json = bool(config.get('compact_json', DEFAULT_COMPACT_JSON))
+    
+    backend = config.get('state_backend', DEFAULT_STATE_BACKEND)
+    if backend not in ("json", "sqlite"):
+        log(f"⚠️  Nieznany backend stanu '{backend}' - używam json")
+        backend = "json"
+    _state_backend = backend
+    
+    # Every term has its own store; in daemon mode all of them stay open
+    _state_db = _state_dbs.get(_state_term)
+    if backend != "sqlite" or _state_db is not None:
+        return
+    
+    filename = get_state_db_path()
+    os.makedirs(os.path.dirname(filename), exist_ok=True)
+    
+    # One connection shared by all workers, serialized by _state_db_lock
+    connection = sqlite3.connect(filename, check_same_thread=False)
+    connection.execute("PRAGMA journal_mode=WAL")
+    connection.execute("PRAGMA synchronous=NORMAL")
+    connection.executescript(STATE_DB_SCHEMA)
+    _state_db = _state_dbs[_state_term] = connection
+    
+    # The owning term tells a term rollover apart from the state of the new term
+    with _state_db_lock, _state_db:
+        _state_db.execute("INSERT OR REPLACE INTO meta (key, value) VALUES ('term', ?)", (_state_term,))
+    
+    migrate_json_state()
+
+def close_state_store(force=False):
+    """Close the SQLite state stores that are open (kept open between daemon cycles unless forced)"""
+    global _state_db
+    if _keep_state_warm and not force:
+        return
+    with _state_db_lock:
+        for connection in _state_dbs.values():
+            connection.close()
+        _state_dbs.clear()
+        _state_db = None
+
+def migrate_json_state():
+    """Import existing interpel_{mp_id}.json files into the SQLite store (once)"""
+    with _state_db_lock:
+        if _state_db.execute("SELECT 1 FROM meta WHERE key = 'json_imported'").fetchone():
+            return
+    
+    data_dir = get_state_dir()
+    filenames = sorted(
+        name for name in (os.listdir(data_dir) if os.path.isdir(data_dir) else [])
+        if name.startswith("interpel_") and name.endswith(".json")
+    )
+    
+    for name in filenames:
+        mp_id = name[len("interpel_"):-len(".json")]
+        try:
+            with open(os.path.join(data_dir, name), 'r', encoding='utf-8') as f:
+                results = [Interpellation.from_dict(item) for item in json.load(f) if item.get('id')]
+            write_results_to_db(results, mp_id)
+            log(f"📦 Zaimportowano {len(results)} interpelacji posła {mp_id} z {name}")
+        except Exception as e:
+            log(f"⚠️  Błąd podczas importu pliku {name}: {e}")
+    
+    with _state_db_lock, _state_db:
+        _state_db.execute(
+            "INSERT OR REPLACE INTO meta (key, value) VALUES ('json_imported', ?)",
+            (datetime.now().isoformat(),))
+
+def load_previous_results_from_db(mp_id):
+    """Load previous results for specific MP from the SQLite store"""
+    try:
+        with _state_db_lock:
+            rows = _state_db.execute(
+                "SELECT i.data FROM mp_interpellations m "
+                "JOIN interpellations i ON i.id = m.id AND i.type = m.type "
+                "WHERE m.mp_id = ? ORDER BY m.position",
+                (str(mp_id),)
+            ).fetchall()
+        data = [Interpellation.from_dict(json.loads(row[0])) for row in rows]
+        log(f"📊 Wczytano {len(data)} interpelacji posła {mp_id} z bazy danych")
+        return data
+    except Exception as e:
+        log(f"⚠️  Błąd podczas wczytywania poprzednich wyników: {e}")
+        return []
+
+def write_results_to_db(results, mp_id, changed_items=None):
+    """Upsert results of specific MP, touching only rows that changed
+    
+    With changed_items only those are upserted (membership is still updated from results).
+    Returns the number of interpellations inserted or updated.
+    """
+    mp_id = str(mp_id)
+    now = time.time()
+    changed_count = 0
+    
+    with _state_db_lock, _state_db:
+        for item in results if changed_items is None else changed_items:
+            key = item.key
+            data = json.dumps(item.to_dict(), ensure_ascii=False, sort_keys=True)
+            
+            cursor = _state_db.execute(
+                "INSERT INTO interpellations (id, type, title, url, from_ids, replies, submission_date, data, updated_at) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?) "
+                "ON CONFLICT (id, type) DO UPDATE SET title = excluded.title, url = excluded.url, "
+                "from_ids = excluded.from_ids, replies = excluded.replies, "
+                "submission_date = excluded.submission_date, data = excluded.data, updated_at = excluded.updated_at "
+                "WHERE interpellations.data != excluded.data",
+                key + (
+                    item.title,
+                    json.dumps(item.url, ensure_ascii=False),
+                    item.from_ids,
+                    item.replies,
+                    item.submission_date,
+                    data,
+                    now
+                )
+            )
+            
+            # Replies are rewritten only for interpellations whose data changed
+            if cursor.rowcount:
+                changed_count += 1
+                _state_db.execute("DELETE FROM replies WHERE interpellation_id = ? AND type = ?", key)
+                _state_db.executemany(
+                    "INSERT INTO replies (interpellation_id, type, position, key, prolongation, last_modified, receipt_date, author) "
+                    "VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                    [
+                        key + (
+                            position,
+                            reply.key,
+                            1 if reply.prolongation else 0,
+                            reply.last_modified,
+                            reply.receipt_date,
+                            reply.author
+                        )
+                        for position, reply in enumerate(item.replies_data)
+                    ]
+                )
+        
+        # Update MP membership, keeping the API order of items
+        current_keys = {}
+        for item in results:
+            current_keys.setdefault(item.key, len(current_keys))
+        
+        stored_keys = {
+            (row[0], row[1]): row[2]
+            for row in _state_db.execute(
+                "SELECT id, type, position FROM mp_interpellations WHERE mp_id = ?", (mp_id,))
+        }
+        
+        _state_db.executemany(
+            "DELETE FROM mp_interpellations WHERE mp_id = ? AND id = ? AND type = ?",
+            [(mp_id,) + key for key in stored_keys.keys() - current_keys.keys()]
+        )
+        _state_db.executemany(
+            "INSERT OR REPLACE INTO mp_interpellations (mp_id, id, type, position) VALUES (?, ?, ?, ?)",
+            [(mp_id,) + key + (position,) for key, position in current_keys.items() if stored_keys.get(key) != position]
+        )
+    
+    return changed_count
+
+def save_results_to_db(results, mp_id, changeset=None):
+    """Save search results for specific MP to the SQLite store"""
+    filename = get_state_db_path()
+    changed_count = write_results_to_db(results, mp_id, None if changeset is None else changeset.changed_items)
+    log(f"💾 Zaktualizowano {changed_count} interpelacji posła {mp_id} w bazie danych")
+    print_results_summary(results, mp_id, filename)
+    return filename
+
+def process_single_mp(mp_id, term, interpellations=None, modified_since=None):
+    """Process interpelations for a single MP and return new answers
+    
+    When interpellations are given (bulk mode) they are used instead of querying the API;
+    with modified_since they only hold items modified since that date.
+    """
+    log(f"\n{'='*60}")
+    log(f"PRZETWARZANIE POSŁA {mp_id}")
+    log(f"{'='*60}")
+    
+    # Load previous results for comparison
+    previous_results = load_previous_results(mp_id)
+    index_deadlines(mp_id, previous_results, term)
+    
+    # Statistics cover configured MPs only, not items followed through subscriptions
+    track_stats = mp_id != SUBSCRIPTIONS_STATE_ID
+    if track_stats:
+        index_stats(mp_id, previous_results, term)
+    
+    validators = {}
+    if interpellations is None:
+        modified_since = get_mp_modified_since(mp_id, previous_results)
+        log(f"Pobieranie interpelacji dla posła {mp_id} z API Sejmu...")
+        interpellations = fetch_interpellations_from_api(
+            mp_id, term, modified_since, get_conditional_validators(validators, previous_results or is_mp_synced_empty(mp_id)))
+        if interpellations is None:
+            log(f"Nie udało się pobrać interpelacji dla posła {mp_id} z API.")
+            return []
+    
+    # Hot stored items are re-checked even if the lists did not change
+    polled_items = []
+    if modified_since:
+        polled_items = poll_due_items(mp_id, previous_results, [] if interpellations is NOT_MODIFIED else interpellations, term)
+    
+    # Nothing changed since the last run - skip parsing, diffing and saving entirely
+    if interpellations is NOT_MODIFIED and not polled_items:
+        mark_mp_synced(mp_id, full=not modified_since)
+        return []
+    
+    if interpellations is NOT_MODIFIED:
+        interpellations = []
+    
+    if modified_since:
+        log(f"🔄 Zmienionych interpelacji od {modified_since}: {len(interpellations)}")
+        interpellations = merge_modified_items(previous_results, interpellations + polled_items)
+    
+    if not interpellations:
+        # An MP without any items (or no subscribed items) is a valid result, so the sync state still advances
+        log(f"📭 Brak interpelacji posła {mp_id} w API")
+        if not previous_results:
+            update_http_cache(validators)
+        mark_mp_synced(mp_id, full=not modified_since, empty=not previous_results)
+        return []
+    
+    log(f"Znaleziono {len(interpellations)} interpelacji dla posła {mp_id} w API.")
+    
+    # Porównaj z poprzednimi wynikami
+    with measure_stage('diff'):
+        changeset = diff_results(interpellations, previous_results)
+        changeset.baseline_added = mp_id == SUBSCRIPTIONS_STATE_ID and subscriptions_changed()
+    count_event('items_fetched', len(interpellations))
+    count_event('items_added', len(changeset.added))
+    count_event('items_changed', len(changeset.changed))
+    count_event('items_removed', len(changeset.removed))
+    
+    # Uzupełnij brakujące daty złożenia interpelacji z nowymi odpowiedziami (równolegle z API)
+    with measure_stage('details'):
+        fill_submission_dates(changeset, term)
+    
+    # Zbierz nowe odpowiedzi
+    with measure_stage('diff'):
+        new_answers = get_new_answers(changeset, mp_id, term)
+    count_event('new_answers', len(new_answers))
+    
+    # Zapisz powiadomienia w kolejce przed zapisem stanu, żeby awaria ich nie zgubiła
+    with measure_stage('notify'):
+        enqueue_notifications(new_answers, term)
+    
+    # Zaktualizuj terminy odpowiedzi i statystyki zmienionych interpelacji
+    update_deadlines(changeset, term)
+    if track_stats:
+        update_stats(changeset, term)
+    
+    # Zapisz wszystkie interpelacje po porównaniu
+    with measure_stage('save'):
+        save_results(interpellations, mp_id, changeset)
+    update_http_cache(validators)
+    mark_mp_synced(mp_id, full=not modified_since, empty=False)
+    
+    return new_answers
+
+def merge_modified_items(previous_results, modified_items):
+    """Merge items modified since the last sync into the previous results"""
+    merged = {item.key: item for item in previous_results}
+    for item in modified_items:
+        merged[item.key] = item
+    
+    return list(merged.values())
+
+def get_sync_state_path():
+    """Get absolute path to the sync state file"""
+    return os.path.join(get_state_dir(), "sync_state.json")
+
+def configure_sync(config):
+    """Apply paging and incremental sync settings from config and load the sync state"""
+    global _api_page_size, _streaming_json, _incremental_sync, _full_sync_interval, _sync_run_started_at, _detail_workers
+    global _sync_state, _item_checks
+    
+    _polling_settings.update(get_settings_section(config, 'polling', DEFAULT_POLLING_SETTINGS))
+    if is_snapshot_mode():
+        _polling_settings['tiers'] = False
+    
+    try:
+        _api_page_size = max(1, int(config.get('api_page_size', DEFAULT_API_PAGE_SIZE)))
+    except (TypeError, ValueError):
+        log(f"⚠️  Nieprawidłowa wartość api_page_size, używam {DEFAULT_API_PAGE_SIZE}")
+        _api_page_size = DEFAULT_API_PAGE_SIZE
     
-    # Create dictionary for quick lookup (use both id and type as key)
-    previous_dict = {}
-    for item in previous_results:
-        if item.get('id'):
-            key = f"{item['id']}_{item.get('type', '')}"
-            previous_dict[key] = item
+    default_full_sync_hours = DEFAULT_TIERED_FULL_SYNC_HOURS if _polling_settings['tiers'] else DEFAULT_FULL_SYNC_HOURS
+    try:
+        _full_sync_interval = float(config.get('full_sync_hours', default_full_sync_hours)) * 3600
+    except (TypeError, ValueError):
+        log(f"⚠️  Nieprawidłowa wartość full_sync_hours, używam {default_full_sync_hours}")
+        _full_sync_interval = default_full_sync_hours * 3600
     
-    new_answers = []
+    _streaming_json = bool(config.get('streaming_json', DEFAULT_STREAMING_JSON))
+    _incremental_sync = bool(config.get('incremental_sync', DEFAULT_INCREMENTAL_SYNC)) and not is_snapshot_mode()
+    _detail_workers = get_max_workers(config)
+    _sync_run_started_at = time.time()
     
-    for current_item in current_results:
-        current_id = current_item.get('id')
-        current_type = current_item.get('type', '')
-        if not current_id:
-            continue
-            
-        # Create key using both id and type
-        current_key = f"{current_id}_{current_type}"
-        previous_item = previous_dict.get(current_key)
-        
-        if previous_item:
-            previous_replies = previous_item.get('replies', 0)
-            current_replies = current_item.get('replies', 0)
-            
-            if current_replies > previous_replies:
-                new_count = current_replies - previous_replies
-                
-                # Check if any of the new replies has prolongation: true and collect author information
-                has_prolongation = False
-                new_reply_authors = []
-                current_replies_data = current_item.get('replies_data', [])
-                if isinstance(current_replies_data, list) and len(current_replies_data) > previous_replies:
-                    # Check only the newest replies (those beyond the previous count)
-                    new_replies = current_replies_data[previous_replies:]
-                    for reply in new_replies:
-                        if isinstance(reply, dict):
-                            if reply.get('prolongation') == True:
-                                has_prolongation = True
-                            # Collect author information
-                            author = reply.get('author', '')
-                            if author and author not in new_reply_authors:
-                                new_reply_authors.append(author)
-                
-                # Convert MP IDs to names only for interpelations with new answers
-                from_field = current_item.get('from', '')
-                from_field_names = convert_mp_ids_to_names(from_field, term)
-                
-                # Get Mattermost users for all MPs who submitted this interpellation
-                interpellation_mattermost_users = get_mattermost_users_for_interpellation(from_field, config)
-                
-                # Get timing information
-                replies_data = current_item.get('replies_data', [])
-                submission_date = current_item.get('submission_date')
-                first_response_date = None
-                days_to_response = None
-                
-                # If not available from object, try to get from API
-                if not submission_date:
-                    submission_date = get_interpellation_submission_date_from_api(current_id, current_item.get('type'), term)
-                
-                # If still not available, try to get from replies data
-                if not submission_date:
-                    submission_date, first_response_date, days_to_response = get_interpellation_timing_info(replies_data)
-                else:
-                    # Calculate days to first response using submission date
-                    for reply in replies_data:
-                        if isinstance(reply, dict):
-                            last_modified = reply.get('lastModified', '')
-                            if last_modified and (first_response_date is None or last_modified < first_response_date):
-                                first_response_date = last_modified
-                    
-                    if first_response_date:
-                        days_to_response = calculate_days_between_dates(submission_date, first_response_date)
-                
-                new_answers.append({
-                    'id': current_id,
-                    'type': current_item.get('type'),
-                    'title': current_item.get('title'),
-                    'url': current_item.get('url'),
-                    'from': from_field_names,  # Use converted names
-                    'previous_replies': previous_replies,
-                    'current_replies': current_replies,
-                    'new_count': new_count,
-                    'has_prolongation': has_prolongation,
-                    'reply_authors': new_reply_authors,  # Add author information
-                    'mattermost_users': interpellation_mattermost_users,  # Add Mattermost users for this interpellation
-                    'submission_date': submission_date,
-                    'first_response_date': first_response_date,
-                    'days_to_response': days_to_response
-                })
-        else:
-            # New interpellation with answers
-            current_replies = current_item.get('replies', 0)
-            if current_replies > 0:
-                # Check if any of the replies has prolongation: true and collect author information
-                has_prolongation = False
-                reply_authors = []
-                current_replies_data = current_item.get('replies_data', [])
-                if isinstance(current_replies_data, list):
-                    for reply in current_replies_data:
-                        if isinstance(reply, dict):
-                            if reply.get('prolongation') == True:
-                                has_prolongation = True
-                            # Collect author information
-                            author = reply.get('author', '')
-                            if author and author not in reply_authors:
-                                reply_authors.append(author)
-                
-                # Convert MP IDs to names only for interpelations with new answers
-                from_field = current_item.get('from', '')
-                from_field_names = convert_mp_ids_to_names(from_field, term)
-                
-                # Get Mattermost users for all MPs who submitted this interpellation
-                interpellation_mattermost_users = get_mattermost_users_for_interpellation(from_field, config)
-                
-                # Get timing information
-                replies_data = current_item.get('replies_data', [])
-                submission_date = current_item.get('submission_date')
-                first_response_date = None
-                days_to_response = None
-                
-                # If not available from object, try to get from API
-                if not submission_date:
-                    submission_date = get_interpellation_submission_date_from_api(current_id, current_item.get('type'), term)
-                
-                # If still not available, try to get from replies data
-                if not submission_date:
-                    submission_date, first_response_date, days_to_response = get_interpellation_timing_info(replies_data)
-                else:
-                    # Calculate days to first response using submission date
-                    for reply in replies_data:
-                        if isinstance(reply, dict):
-                            last_modified = reply.get('lastModified', '')
-                            if last_modified and (first_response_date is None or last_modified < first_response_date):
-                                first_response_date = last_modified
-                    
-                    if first_response_date:
-                        days_to_response = calculate_days_between_dates(submission_date, first_response_date)
-                
-                new_answers.append({
-                    'id': current_id,
-                    'type': current_item.get('type'),
-                    'title': current_item.get('title'),
-                    'url': current_item.get('url'),
-                    'from': from_field_names,  # Use converted names
-                    'previous_replies': 0,
-                    'current_replies': current_replies,
-                    'new_count': current_replies,
-                    'has_prolongation': has_prolongation,
-                    'reply_authors': reply_authors,  # Add author information
-                    'mattermost_users': interpellation_mattermost_users,  # Add Mattermost users for this interpellation
-                    'submission_date': submission_date,
-                    'first_response_date': first_response_date,
-                    'days_to_response': days_to_response
-                })
+    # Items polled and submission dates fetched in this run, shared by co-signers
+    with _sync_state_lock:
+        _polled_items.clear()
+    with _submission_date_cache_lock:
+        _submission_date_cache.clear()
     
-    # Return new answers if there are any
-    if new_answers:
-        print(f"🎉 Znaleziono {len(new_answers)} interpelacji z nowymi odpowiedziami!")
-        
-        # Log IDs of interpelations with new answers
-        answer_ids = [answer['id'] for answer in new_answers]
-        print(f"📋 ID interpelacji z nowymi odpowiedziami: {', '.join(answer_ids)}")
-        
-        return new_answers
-    else:
-        print("📭 Brak nowych odpowiedzi")
-        return []
-
-def save_results_to_json(results, mp_id):
-    """Save search results to JSON file for specific MP"""
-    filename = get_data_file_path(mp_id)
+    # In daemon mode the sync state of every term stays in memory between cycles
+    with _sync_state_lock:
+        if _keep_state_warm and _state_term in _sync_states:
+            _sync_state, _item_checks = _sync_states[_state_term]
+            return
     
-    # Ensure the directory exists (for Docker data directory)
-    os.makedirs(os.path.dirname(filename), exist_ok=True)
+    state = {}
+    filename = get_sync_state_path()
+    try:
+        if os.path.exists(filename):
+            with open(filename, 'r', encoding='utf-8') as f:
+                state = json.load(f)
+    except Exception as e:
+        log(f"⚠️  Błąd podczas wczytywania stanu synchronizacji: {e}")
     
-    with open(filename, 'w', encoding='utf-8') as f:
-        json.dump(results, f, ensure_ascii=False, indent=2)
+    with _sync_state_lock:
+        _sync_state = dict(state.get('mps', {}))
+        _item_checks = dict(state.get('items', {}))
+        _sync_states[_state_term] = (_sync_state, _item_checks)
+
+def save_sync_state():
+    """Save the sync state to disk"""
+    with _sync_state_lock:
+        state = {'term': _state_term, 'mps': dict(_sync_state)}
+        if _item_checks:
+            # Checks older than the longest interval make no difference any more
+            oldest = time.time() - max(_polling_settings[f'{tier}_hours'] for tier in POLLING_TIERS) * 3600
+            state['items'] = {key: checked_at for key, checked_at in _item_checks.items() if checked_at >= oldest}
     
-    # Count answers
-    answered_count = sum(1 for item in results if item.get('replies', 0) > 0)
-    total_count = len(results)
+    try:
+        write_json_atomic(get_sync_state_path(), state)
+    except Exception as e:
+        log(f"⚠️  Błąd podczas zapisywania stanu synchronizacji: {e}")
+
+def mark_mp_synced(mp_id, full, empty=None):
+    """Record a successful (full or incremental) sync of an MP at the start time of this run
     
-    # Get current date and time
-    current_datetime = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+    empty records whether the MP has no items at all (None keeps the recorded value).
+    """
+    if _sync_run_started_at is None:
+        return
+    with _sync_state_lock:
+        entry = _sync_state.setdefault(str(mp_id), {})
+        entry['last_sync'] = _sync_run_started_at
+        if full:
+            entry['last_full_sync'] = _sync_run_started_at
+        if empty:
+            entry['empty'] = True
+        elif empty is not None:
+            entry.pop('empty', None)
+        if mp_id == SUBSCRIPTIONS_STATE_ID:
+            entry['rules'] = get_subscriptions_fingerprint()
+
+def is_mp_synced_empty(mp_id):
+    """Check whether the last sync found no items of an MP (nothing is stored for it then)"""
+    with _sync_state_lock:
+        return bool(_sync_state.get(str(mp_id), {}).get('empty'))
+
+def get_subscriptions_fingerprint():
+    """Get a fingerprint of the criteria of the subscriptions (users and webhooks do not change which items match)"""
+    if _subscriptions is None:
+        return None
+    criteria = [[rule.clubs, rule.ministries, rule.keywords] for rule in _subscriptions.rules]
+    return hashlib.sha1(json.dumps(criteria, ensure_ascii=False).encode('utf-8')).hexdigest()
+
+def subscriptions_changed():
+    """Check whether the subscriptions state of the active term was built with other criteria"""
+    with _sync_state_lock:
+        entry = _sync_state.get(SUBSCRIPTIONS_STATE_ID)
+    return entry is not None and entry.get('rules') != get_subscriptions_fingerprint()
+
+def get_modified_since(mp_ids):
+    """Get the modifiedSince date covering all given MPs, or None if a full sync is due"""
+    if not _incremental_sync and not _polling_settings['tiers']:
+        return None
     
-    print(f"\n" + "="*60)
-    print(f"PODSUMOWANIE WYNIKÓW DLA POSŁA {mp_id}")
-    print(f"="*60)
-    print(f"Data sprawdzenia: {current_datetime}")
-    print(f"Wyniki zapisano do pliku: {filename}")
-    print(f"Łączna liczba interpelacji: {total_count}")
-    print(f"Interpelacje z odpowiedziami: {answered_count}")
-    print(f"Interpelacje bez odpowiedzi: {total_count - answered_count}")
+    with _sync_state_lock:
+        entries = [_sync_state.get(str(mp_id)) for mp_id in mp_ids]
     
-    if total_count > 0:
-        answered_percentage = (answered_count / total_count) * 100
-        print(f"Procent interpelacji z odpowiedziami: {answered_percentage:.1f}%")
+    now = time.time()
+    if not entries or any(not entry or not entry.get('last_sync') or not entry.get('last_full_sync') for entry in entries):
+        return None
+    if any(now - entry['last_full_sync'] >= _full_sync_interval for entry in entries):
+        return None
     
-    print(f"="*60)
-    return filename
+    last_sync = min(entry['last_sync'] for entry in entries)
+    return (datetime.fromtimestamp(last_sync) - INCREMENTAL_SYNC_OVERLAP).strftime("%Y-%m-%d")
 
+def get_mp_modified_since(mp_id, previous_results):
+    """Get the modifiedSince date for a single MP, or None if a full sync is needed"""
+    if not previous_results:
+        return None
+    return get_modified_since([mp_id])
 
+def get_polling_tier(item):
+    """Classify a stored item by how likely it is to change"""
+    if not item.replies_data:
+        return 'awaiting'
+    if item.replies_data[-1].prolongation:
+        return 'prolongation'
+    return 'answered'
 
+def get_item_check_key(item):
+    return f"{item.type}:{item.id}"
 
+def mark_items_checked(items, checked_at):
+    """Record that the current version of items was seen in a list or detail response"""
+    with _sync_state_lock:
+        for item in items:
+            _item_checks[get_item_check_key(item)] = checked_at
 
-def process_single_mp(mp_id, term):
-    """Process interpelations for a single MP and return new answers"""
-    print(f"\n{'='*60}")
-    print(f"PRZETWARZANIE POSŁA {mp_id}")
-    print(f"{'='*60}")
+def get_due_items(mp_id, previous_results, fresh_keys):
+    """Get stored items whose tier interval has passed since they were last checked, most overdue first"""
+    now = time.time()
+    with _sync_state_lock:
+        # Items never checked individually were last seen in the MP's last full list sync
+        last_full_sync = _sync_state.get(str(mp_id), {}).get('last_full_sync', 0)
+        
+        due = []
+        for item in previous_results:
+            if item.key in fresh_keys:
+                continue
+            interval = _polling_settings[f'{get_polling_tier(item)}_hours'] * 3600
+            checked_at = max(_item_checks.get(get_item_check_key(item), 0), last_full_sync)
+            if now - checked_at >= interval:
+                due.append(((now - checked_at) / max(interval, 1.0), item))
     
-    # Load previous results for comparison
-    previous_results = load_previous_results(mp_id)
+    due.sort(key=lambda entry: entry[0], reverse=True)
+    return [item for _, item in due[:max(0, _polling_settings['max_checks_per_mp'])]]
+
+def poll_due_items(mp_id, previous_results, modified_items, term):
+    """Re-check due stored items through the detail endpoint (polling tiers)
     
-    print(f"Pobieranie interpelacji dla posła {mp_id} z API Sejmu...")
-    interpellations = fetch_interpellations_from_api(mp_id, term)
+    Lists fetched with modifiedSince cover items the API reports as modified; hot items
+    (awaiting an answer or prolonged) are additionally re-checked often and answered ones
+    rarely, so the traffic follows open items instead of the whole history.
+    Returns the current versions of the checked items.
+    """
+    if not _polling_settings['tiers'] or not previous_results:
+        return []
     
-    if not interpellations:
-        print(f"Nie udało się pobrać interpelacji dla posła {mp_id} z API.")
+    mark_items_checked(modified_items, _sync_run_started_at)
+    due = get_due_items(mp_id, previous_results, {item.key for item in modified_items})
+    if not due:
         return []
     
-    print(f"Znaleziono {len(interpellations)} interpelacji dla posła {mp_id} w API.")
+    tiers = {}
+    for item in due:
+        tiers[get_polling_tier(item)] = tiers.get(get_polling_tier(item), 0) + 1
+    log(f"🌡️  Sprawdzanie {len(due)} interpelacji (oczekujące: {tiers.get('awaiting', 0)}, "
+        f"przedłużone: {tiers.get('prolongation', 0)}, z odpowiedzią: {tiers.get('answered', 0)})")
     
-    # Porównaj z poprzednimi wynikami i zwróć nowe odpowiedzi
-    new_answers = compare_and_notify_new_answers(interpellations, previous_results, mp_id, term)
+    def poll(item):
+        # Co-signers processed in the same run reuse the detail fetched for the first of them
+        key = (str(term), item.id, item.type)
+        with _sync_state_lock:
+            if key in _polled_items:
+                return _polled_items[key]
+        data = fetch_item_details(item.id, item.type, term)
+        polled = process_api_item(data, item.type) if data else None
+        if polled is not None:
+            with _sync_state_lock:
+                _polled_items[key] = polled
+        return polled
     
-    # Zapisz wszystkie interpelacje po porównaniu
-    save_results_to_json(interpellations, mp_id)
+    with measure_stage('details'):
+        if _detail_workers <= 1 or len(due) <= 1:
+            polled_items = [poll(item) for item in due]
+        else:
+            polled_items = list(get_detail_executor().map(poll, due))
     
-    return new_answers
+    # Items whose detail could not be fetched stay due and are retried in the next run
+    polled_items = [item for item in polled_items if item is not None]
+    mark_items_checked(polled_items, _sync_run_started_at)
+    count_event('items_polled', len(polled_items))
+    return polled_items
 
-def fetch_mp_data(mp_id, term="10"):
-    """Fetch MP data from Sejm API"""
+def get_mp_cache_path(term):
+    """Get absolute path to the MP cache file for specific term"""
+    return os.path.join(get_data_dir(), f"mp_cache_term{term}.json")
+
+def load_mp_cache(term, config=None):
+    """Load the MP cache for a term from disk and apply cache settings from config"""
+    global _mp_cache_ttl
+    
+    if config:
+        try:
+            _mp_cache_ttl = float(config.get('mp_cache_ttl_hours', DEFAULT_MP_CACHE_TTL_HOURS)) * 3600
+        except (TypeError, ValueError):
+            log(f"⚠️  Nieprawidłowa wartość mp_cache_ttl_hours, używam {DEFAULT_MP_CACHE_TTL_HOURS}")
+            _mp_cache_ttl = DEFAULT_MP_CACHE_TTL_HOURS * 3600
+    
+    # In daemon mode the cache stays in memory between cycles
+    with _mp_cache_lock:
+        loaded = str(term) in _mp_cache
+    
+    filename = get_mp_cache_path(term)
+    entries = {}
+    try:
+        if _keep_state_warm and loaded:
+            pass
+        elif os.path.exists(filename):
+            with open(filename, 'r', encoding='utf-8') as f:
+                entries = json.load(f).get('mps', {})
+            log(f"📇 Wczytano {len(entries)} posłów z pamięci podręcznej kadencji {term}")
+    except Exception as e:
+        log(f"⚠️  Błąd podczas wczytywania pamięci podręcznej posłów: {e}")
+    
+    if not (_keep_state_warm and loaded):
+        with _mp_cache_lock:
+            _mp_cache[str(term)] = entries
+    
+    prefetch = config.get('mp_cache_prefetch', DEFAULT_MP_CACHE_PREFETCH) if config else False
+    if prefetch and not is_mp_cache_fresh(term):
+        prefetch_mp_cache(term)
+
+def save_mp_cache(term):
+    """Save the MP cache for a term to disk if it changed"""
+    term = str(term)
+    with _mp_cache_lock:
+        if term not in _mp_cache_dirty:
+            return
+        entries = dict(_mp_cache.get(term, {}))
+        _mp_cache_dirty.discard(term)
+    
     try:
-        url = f"https://api.sejm.gov.pl/sejm/term{term}/MP/{mp_id}"
-        headers = {
-            'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/134.0.6998.205 Safari/537.36',
-            'Accept': 'application/json',
-            'Accept-Language': 'pl-PL,pl;q=0.9,en;q=0.8'
+        write_json_atomic(get_mp_cache_path(term), {'term': term, 'mps': entries})
+    except Exception as e:
+        log(f"⚠️  Błąd podczas zapisywania pamięci podręcznej posłów: {e}")
+
+def is_mp_cache_fresh(term):
+    """Check whether the MP cache for a term is non-empty and within TTL"""
+    with _mp_cache_lock:
+        entries = _mp_cache.get(str(term), {})
+        if not entries:
+            return False
+        oldest = min(entry.get('fetched_at', 0) for entry in entries.values())
+    return time.time() - oldest < _mp_cache_ttl
+
+def get_cached_mp_data(mp_id, term):
+    """Get MP data from the cache if present and within TTL"""
+    with _mp_cache_lock:
+        entry = _mp_cache.get(str(term), {}).get(str(mp_id))
+    if entry and time.time() - entry.get('fetched_at', 0) < _mp_cache_ttl:
+        return {'id': entry.get('id'), 'name': entry.get('name', ''), 'club': entry.get('club', '')}
+    return None
+
+def cache_mp_data(mp_data, term):
+    """Store MP data fetched from the API in the cache"""
+    term = str(term)
+    with _mp_cache_lock:
+        _mp_cache.setdefault(term, {})[str(mp_data['id'])] = {
+            'id': mp_data['id'],
+            'name': mp_data['name'],
+            'club': mp_data['club'],
+            'fetched_at': time.time()
         }
+        _mp_cache_dirty.add(term)
+
+def prefetch_mp_cache(term):
+    """Fill the MP cache with the whole MP list of a term in a single request"""
+    try:
+        url = get_sejm_api_url(term, "MP")
+        log(f"📇 Pobieranie listy wszystkich posłów kadencji {term}: {url}")
+        
+        response = http_get(url)
+        response.raise_for_status()
+        
+        mps_data = response.json()
+        if not isinstance(mps_data, list):
+            return
+        
+        for mp_data in mps_data:
+            if isinstance(mp_data, dict) and mp_data.get('id') is not None:
+                cache_mp_data({
+                    'id': mp_data.get('id'),
+                    'name': mp_data.get('firstLastName', ''),
+                    'club': mp_data.get('club', '')
+                }, term)
+        log(f"✅ Zapisano {len(mps_data)} posłów w pamięci podręcznej")
+        
+    except Exception as e:
+        log(f"⚠️  Błąd podczas pobierania listy posłów: {e}")
+
+def fetch_mp_data(mp_id, term="10"):
+    """Fetch MP data from the cache or Sejm API"""
+    cached = get_cached_mp_data(mp_id, term)
+    if cached:
+        count_event('mp_cache_hits')
+        return cached
+    count_event('mp_cache_misses')
+    
+    try:
+        url = get_sejm_api_url(term, f"MP/{mp_id}")
         
-        response = requests.get(url, headers=headers, timeout=10)
+        response = http_get(url, endpoint='mp')
         response.raise_for_status()
         
         mp_data = response.json()
-        return {
+        result = {
             'id': mp_data.get('id'),
             'name': mp_data.get('firstLastName', ''),
             'club': mp_data.get('club', '')
         }
+        if result['id'] is not None:
+            cache_mp_data(result, term)
+        return result
         
     except Exception as e:
-        print(f"⚠️  Błąd podczas pobierania danych posła {mp_id}: {e}")
+        log(f"⚠️  Błąd podczas pobierania danych posła {mp_id}: {e}")
         return {'id': mp_id, 'name': f'Poseł {mp_id}', 'club': ''}
 
 def convert_mp_ids_to_names(from_field, term="10"):
@@ -582,71 +3704,266 @@ def convert_mp_ids_to_names(from_field, term="10"):
     
     return ", ".join(mp_names)
 
-def fetch_interpellations_from_api(mp_id, term):
-    """Fetch interpellations from Sejm API for the specified MP"""
+def fetch_interpellations_from_api(mp_id, term, modified_since=None, validators=None):
+    """Fetch interpellations from Sejm API for the specified MP
+    
+    With modified_since only items modified since that date are fetched. With validators
+    the lists are requested conditionally and NOT_MODIFIED is returned if none changed.
+    Returns None if fetching failed.
+    """
     try:
-        print(f"🔍 Pobieranie interpelacji dla posła ID: {mp_id} z kadencji: {term}")
+        log(f"🔍 Pobieranie interpelacji dla posła ID: {mp_id} z kadencji: {term}")
+        
+        params = f"&from={mp_id}{get_modified_since_param(modified_since)}"
+        lists = fetch_endpoint_lists(term, params, validators)
+        if lists is NOT_MODIFIED:
+            log(f"💤 Listy interpelacji posła {mp_id} nie zmieniły się (304)")
+            return NOT_MODIFIED
         
-        # Fetch both types of interpellations
+        # Both types of interpellations, already processed while parsing
         interpellations = []
+        for path, _ in INTERPELLATION_ENDPOINTS:
+            interpellations.extend(lists[path])
         
-        # Fetch regular interpellations
-        int_url = f"https://api.sejm.gov.pl/sejm/term{term}/interpellations?limit=500&sort_by=num&from={mp_id}"
-        print(f"📋 Pobieranie interpelacji z: {int_url}")
+        log(f"✅ Pobrano {len(interpellations)} interpelacji z API")
+        return interpellations
         
-        headers = {
-            'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/134.0.6998.205 Safari/537.36',
-            'Accept': 'application/json',
-            'Accept-Language': 'pl-PL,pl;q=0.9,en;q=0.8'
-        }
+    except requests.RequestException as e:
+        log(f"❌ Błąd podczas pobierania z API: {e}")
+        return None
+    except json.JSONDecodeError as e:
+        log(f"❌ Błąd podczas parsowania JSON z API: {e}")
+        return None
+    except Exception as e:
+        log(f"❌ Nieoczekiwany błąd API: {e}")
+        return None
+
+def fetch_endpoint_lists(term, params="", validators=None):
+    """Fetch the interpellations and writtenQuestions lists
+    
+    Returns a dict of endpoint path -> processed items, or NOT_MODIFIED if validators were
+    given and every page of both lists answered 304.
+    """
+    lists = {}
+    for path, item_type in INTERPELLATION_ENDPOINTS:
+        if item_type == "INT":
+            log(f"📋 Pobieranie interpelacji z: {get_sejm_api_url(term, path)}")
+        else:
+            log(f"📋 Pobieranie zapytań pisemnych z: {get_sejm_api_url(term, path)}")
+        lists[path] = fetch_paged_list(path, item_type, term, params, validators)
+    
+    if all(items is NOT_MODIFIED for items in lists.values()):
+        return NOT_MODIFIED
+    
+    # Something changed, so lists that answered 304 have to be downloaded after all
+    for path, items in lists.items():
+        if items is NOT_MODIFIED:
+            lists[path] = fetch_paged_list(path, dict(INTERPELLATION_ENDPOINTS)[path], term, params)
+    
+    return lists
+
+def fetch_paged_list(path, item_type, term, params="", validators=None):
+    """Fetch all pages of a Sejm API list endpoint using offset paging
+    
+    Items are processed with process_api_item as they are parsed, so raw pages are never
+    kept. With validators (a dict collecting new cache entries) pages are requested
+    conditionally and NOT_MODIFIED is returned if every page answered 304.
+    """
+    pages = []
+    offset = 0
+    while True:
+        url = get_sejm_api_url(term, f"{path}?limit={_api_page_size}&offset={offset}&sort_by=num{params}")
+        with measure_stage('fetch'):
+            if validators is None:
+                response, entry = http_get(url, stream=_streaming_json), None
+            else:
+                response, entry = http_get_conditional(url, stream=_streaming_json)
         
-        response = requests.get(int_url, headers=headers, timeout=30)
-        response.raise_for_status()
+        with response:
+            if response.status_code == 304:
+                # Unchanged page - its cached item count tells whether more pages follow
+                page = None
+                count = entry.get('count', 0)
+            else:
+                response.raise_for_status()
+                page, count = read_list_page(response, item_type)
+                if validators is not None:
+                    page_validators = get_response_validators(response, count)
+                    if page_validators:
+                        validators[url] = page_validators
+        
+        pages.append((url, page))
+        if count < _api_page_size:
+            break
+        offset += count
+    
+    if validators is not None and pages and all(page is None for _, page in pages):
+        return NOT_MODIFIED
+    
+    items = []
+    for url, page in pages:
+        if page is None:
+            with measure_stage('fetch'):
+                response = http_get(url, stream=_streaming_json)
+            with response:
+                response.raise_for_status()
+                page, _ = read_list_page(response, item_type)
+        items.extend(page)
+    
+    return items
+
+def read_list_page(response, item_type):
+    """Parse a list page into processed items
+    
+    Returns the processed items and the number of raw items on the page (needed for paging).
+    When streaming, the parse stage includes downloading the body.
+    """
+    with measure_stage('parse'):
+        return parse_list_page(response, item_type)
+
+def parse_list_page(response, item_type):
+    """Parse a list page into processed items and the raw item count"""
+    if _streaming_json:
+        raw_items = iter_json_array(iter_counted_content(response, 'list'))
+    else:
+        page = response.json()
+        raw_items = page if isinstance(page, list) else []
+    
+    items = []
+    count = 0
+    for item in raw_items:
+        count += 1
+        processed_item = process_api_item(item, item_type)
+        if processed_item:
+            items.append(processed_item)
+    
+    return items, count
+
+def iter_counted_content(response, endpoint):
+    """Iterate over the body chunks of a streamed response, adding their size to the HTTP metrics"""
+    size = 0
+    try:
+        for chunk in response.iter_content(chunk_size=JSON_STREAM_CHUNK_SIZE):
+            size += len(chunk)
+            yield chunk
+    finally:
+        # Replayed responses are counted in full when they are built
+        if _snapshot_replay is None:
+            record_http_bytes(endpoint, size)
+
+def iter_json_array(chunks):
+    """Incrementally parse a JSON array from byte chunks, yielding its elements one by one
+    
+    Only the current element is held in memory besides a single chunk. A body that is not
+    an array yields nothing; a malformed or truncated array raises json.JSONDecodeError.
+    """
+    decoder = json.JSONDecoder()
+    text_decoder = codecs.getincrementaldecoder('utf-8')()
+    buffer = ""
+    pos = 0
+    started = False
+    expect_item = True
+    
+    for chunk in chunks:
+        buffer = buffer[pos:] + text_decoder.decode(chunk)
+        pos = 0
         
-        int_data = response.json()
-        if isinstance(int_data, list):
-            for item in int_data:
-                processed_item = process_api_item(item, "INT")
-                if processed_item:
-                    interpellations.append(processed_item)
+        while True:
+            pos = JSON_WHITESPACE.match(buffer, pos).end()
+            if pos >= len(buffer):
+                break
+            
+            if not started:
+                if buffer[pos] != '[':
+                    return
+                started = True
+                pos += 1
+                continue
+            
+            char = buffer[pos]
+            if char == ']':
+                return
+            if not expect_item:
+                if char != ',':
+                    raise json.JSONDecodeError("Expecting ',' delimiter", buffer, pos)
+                expect_item = True
+                pos += 1
+                continue
+            
+            try:
+                item, end = decoder.raw_decode(buffer, pos)
+            except json.JSONDecodeError:
+                # Most likely an element split across chunks - wait for more data
+                break
+            if not isinstance(item, (dict, list, str)) and (end == len(buffer) or buffer[end] not in JSON_VALUE_DELIMITERS):
+                # A number or literal is complete only once a delimiter follows - "1." | "5e10" decodes as 1 too
+                break
+            
+            yield item
+            pos = end
+            expect_item = False
+    
+    if started:
+        # The closing bracket never came - report the malformed element, if that is the cause
+        buffer = buffer[pos:] + text_decoder.decode(b"", final=True)
+        pos = JSON_WHITESPACE.match(buffer).end()
+        if pos < len(buffer):
+            decoder.raw_decode(buffer, pos)
+        raise json.JSONDecodeError("Unterminated array", buffer, len(buffer))
+
+def get_modified_since_param(modified_since):
+    """Build the query string fragment for an incremental fetch"""
+    return f"&modifiedSince={modified_since}" if modified_since else ""
+
+def fetch_all_interpellations_from_api(term, modified_since=None, validators=None):
+    """Fetch term-wide interpellation lists once and index them by author MP ID
+    
+    Returns a dict of MP ID -> list of processed items, NOT_MODIFIED if validators were
+    given and nothing changed, or None if fetching failed.
+    """
+    try:
+        log(f"🔍 Pobieranie wszystkich interpelacji z kadencji: {term}")
         
-        # Fetch written questions
-        zap_url = f"https://api.sejm.gov.pl/sejm/term{term}/writtenQuestions?limit=500&sort_by=num&from={mp_id}"
-        print(f"📋 Pobieranie zapytań pisemnych z: {zap_url}")
+        lists = fetch_endpoint_lists(term, get_modified_since_param(modified_since), validators)
+        if lists is NOT_MODIFIED:
+            log("💤 Listy interpelacji całej kadencji nie zmieniły się (304)")
+            return NOT_MODIFIED
         
-        response = requests.get(zap_url, headers=headers, timeout=30)
-        response.raise_for_status()
+        interpellations_by_mp = {}
+        total_count = 0
         
-        zap_data = response.json()
-        if isinstance(zap_data, list):
-            for item in zap_data:
-                processed_item = process_api_item(item, "ZAP")
-                if processed_item:
-                    interpellations.append(processed_item)
+        for path, _ in INTERPELLATION_ENDPOINTS:
+            for processed_item in lists[path]:
+                total_count += 1
+                # Co-signed items are stored once and shared by every author
+                for author_id in dict.fromkeys(author_id.strip() for author_id in processed_item.from_ids.split(',')):
+                    if author_id:
+                        interpellations_by_mp.setdefault(author_id, []).append(processed_item)
         
-        print(f"✅ Pobrano {len(interpellations)} interpelacji z API")
-        return interpellations
+        log(f"✅ Pobrano {total_count} interpelacji z API dla {len(interpellations_by_mp)} posłów")
+        return interpellations_by_mp
         
     except requests.RequestException as e:
-        print(f"❌ Błąd podczas pobierania z API: {e}")
-        return []
+        log(f"❌ Błąd podczas pobierania z API: {e}")
+        return None
     except json.JSONDecodeError as e:
-        print(f"❌ Błąd podczas parsowania JSON z API: {e}")
-        return []
+        log(f"❌ Błąd podczas parsowania JSON z API: {e}")
+        return None
     except Exception as e:
-        print(f"❌ Nieoczekiwany błąd API: {e}")
-        return []
+        log(f"❌ Nieoczekiwany błąd API: {e}")
+        return None
 
 def process_api_item(item, item_type):
-    """Process a single API item and extract required fields"""
+    """Process a single API item into an Interpellation, or None if it is unusable"""
     try:
-
+        interpellation_id = item.get('num', "")
+        if interpellation_id in ("", None):
+            return None
         
         # Extract required fields
         links = item.get('links', [])
         url = links[0] if links else ""
         
-        interpellation_id = item.get('num', "")
         title = item.get('title', "")
         from_field = item.get('from', "")
         
@@ -656,84 +3973,493 @@ def process_api_item(item, item_type):
         elif not isinstance(from_field, str):
             from_field = str(from_field) if from_field else ""
         
-        # Count replies
-        replies = item.get('replies', [])
-        replies_count = len(replies) if isinstance(replies, list) else 0
+        recipients = item.get('to') or ()
+        if isinstance(recipients, str):
+            recipients = (recipients,)
         
-        # Filter replies to keep key, prolongation, lastModified, and author information
-        filtered_replies = []
-        if isinstance(replies, list):
-            for reply in replies:
-                if isinstance(reply, dict):
-
-                    
-                    filtered_reply = {
-                        'key': reply.get('key', ''),
-                        'prolongation': reply.get('prolongation', False),
-                        'lastModified': reply.get('lastModified', ''),
-                        'receiptDate': reply.get('receiptDate', ''),  # Add receipt date
-                        'author': reply.get('from', '')  # Use 'from' field as author information
-                    }
-                    filtered_replies.append(filtered_reply)
+        # Count replies and keep key, prolongation, lastModified, and author information
+        replies = item.get('replies', [])
+        if not isinstance(replies, list):
+            replies = []
         
-        return {
-            'id': str(interpellation_id),
-            'type': item_type,
-            'title': title,
-            'url': url,
-            'from': from_field,  # Keep original IDs for now
-            'replies': replies_count,
-            'replies_data': filtered_replies,
-            'submission_date': item.get('submissionDate') or item.get('date') or item.get('created') or item.get('receiptDate')
-        }
+        interpellation = Interpellation(
+            id=str(interpellation_id),
+            type=item_type,
+            title=title,
+            url=url,
+            from_ids=from_field,
+            replies=len(replies),
+            replies_data=tuple(Reply.from_api(reply) for reply in replies if isinstance(reply, dict)),
+            submission_date=item.get('submissionDate') or item.get('date') or item.get('created') or item.get('receiptDate'),
+            recipients=tuple(str(recipient) for recipient in recipients)
+        )
+        interpellation.update_timing()
+        return interpellation
         
     except Exception as e:
-        print(f"  ⚠️  Błąd podczas przetwarzania elementu API: {e}")
+        log(f"  ⚠️  Błąd podczas przetwarzania elementu API: {e}")
+        return None
+
+def get_max_workers(config):
+    """Get the number of MPs processed in parallel from config"""
+    try:
+        max_workers = int(config.get('max_workers', DEFAULT_MAX_WORKERS))
+    except (TypeError, ValueError):
+        log(f"⚠️  Nieprawidłowa wartość max_workers, używam {DEFAULT_MAX_WORKERS}")
+        return DEFAULT_MAX_WORKERS
+    return max(1, max_workers)
+
+def process_single_mp_safe(mp_id, term, interpellations=None, modified_since=None):
+    """Process a single MP, logging errors instead of raising them"""
+    _log_context.mp_id = mp_id
+    try:
+        with measure_stage('total'):
+            return process_single_mp(mp_id, term, interpellations, modified_since)
+    except Exception as e:
+        log(f"❌ Błąd podczas przetwarzania posła {mp_id}: {e}")
         return None
+    finally:
+        _log_context.mp_id = None
+
+def process_all_mps(mp_ids, term, max_workers, interpellations_by_mp=None, modified_since=None, stagger=0):
+    """Process MPs (in parallel if max_workers > 1) and return new answers in config order
+    
+    With interpellations_by_mp (bulk mode) each MP gets its items from the index instead of the API.
+    With stagger consecutive MPs are started that many seconds apart. MPs whose processing
+    failed (or was skipped because of shutdown) get None instead of a list.
+    """
+    def get_items(mp_id):
+        if interpellations_by_mp is None:
+            return None
+        return interpellations_by_mp.get(str(mp_id), [])
+    
+    def wait_for_turn(index):
+        # Returns False once shutdown was requested, so remaining MPs are skipped
+        if index and stagger > 0:
+            _shutdown_event.wait(stagger)
+        return not _shutdown_event.is_set()
+    
+    if max_workers <= 1 or len(mp_ids) <= 1:
+        results = []
+        for index, mp_id in enumerate(mp_ids):
+            if not wait_for_turn(index):
+                results.append(None)
+                continue
+            results.append(process_single_mp_safe(mp_id, term, get_items(mp_id), modified_since))
+        return results
+    
+    log(f"⚡ Przetwarzanie równoległe: {min(max_workers, len(mp_ids))} wątków")
+    with ThreadPoolExecutor(max_workers=min(max_workers, len(mp_ids)), thread_name_prefix="mp") as executor:
+        futures = []
+        for index, mp_id in enumerate(mp_ids):
+            if not wait_for_turn(index):
+                futures.append(None)
+                continue
+            futures.append(executor.submit(process_single_mp_safe, mp_id, term, get_items(mp_id), modified_since))
+        return [future.result() if future else None for future in futures]
 
 def main():
     """Main function to run the interpellation search for multiple MPs"""
-    # Load configuration
+    parser = argparse.ArgumentParser(description="Monitorowanie odpowiedzi na interpelacje i zapytania pisemne posłów")
+    parser.add_argument('--daemon', action='store_true',
+                        help="działaj w trybie ciągłym z wbudowanym harmonogramem zamiast pojedynczego uruchomienia")
+    parser.add_argument('--record', action='store_true',
+                        help="zapisz odpowiedzi API z tego uruchomienia do późniejszego odtworzenia")
+    parser.add_argument('--replay', nargs='*', metavar='NAGRANIE',
+                        help="odtwórz zapisane nagrania (domyślnie ostatnie, 'all' - wszystkie po kolei) "
+                             "bez dostępu do API i bez wysyłania powiadomień")
+    subparsers = parser.add_subparsers(dest='command')
+    report_parser = subparsers.add_parser('report', help="wypisz statystyki czasu odpowiedzi bez zapytań do API")
+    report_parser.add_argument('--by', choices=STATS_DIMENSIONS, default="ministry",
+                               help="grupowanie: kadencja, typ, odpowiadający (domyślnie) lub poseł")
+    report_parser.add_argument('--format', choices=("markdown", "csv", "json"), default="markdown")
+    report_parser.add_argument('--term', help="kadencja (domyślnie sejm_term z konfiguracji)")
+    report_parser.add_argument('--output', help="zapisz raport do pliku zamiast wypisywać go")
+    args = parser.parse_args()
+    
+    # Load and validate configuration once for the whole run
     config = load_config()
     if not config:
-        print("❌ Nie udało się wczytać konfiguracji.")
-        print("📝 Utwórz plik config.json z konfiguracją posłów.")
+        log("❌ Nie udało się wczytać konfiguracji.")
+        log("📝 Utwórz plik config.json z konfiguracją posłów.")
         return
     
-    # Get term from config
-    term = config.get('sejm_term', '10')
-    mps = config.get('mps', [])
+    if isinstance(config, dict):
+        configure_logging(config)
     
-    if not mps:
-        print("❌ Brak posłów w konfiguracji")
+    errors = validate_config(config)
+    if errors:
+        for error in errors:
+            log(f"❌ Błąd konfiguracji: {error}")
         return
     
-    print(f"📋 Znaleziono {len(mps)} posłów w konfiguracji\n")
+    set_active_config(config)
+    
+    if args.command == "report":
+        run_report(config, args)
+    elif args.replay is not None:
+        run_replay(config, args.replay)
+    elif args.daemon:
+        run_daemon(config, record=args.record)
+    else:
+        run_once(config, record=args.record)
+
+def run_once(config, record=False):
+    """Run a single check cycle under the run lock; returns True if every MP was processed
+    
+    With record the raw API responses of the cycle are stored as a snapshot for --replay.
+    """
+    # Make sure overlapping runs (e.g. a slow cron run) cannot corrupt the state
+    lock_file = acquire_run_lock()
+    if lock_file is None:
+        log("⏳ Inne uruchomienie bota wciąż trwa - pomijam to uruchomienie")
+        return False
+    
+    success = False
+    start_run_metrics()
+    if _snapshot_replay is None:
+        start_snapshot_recording(config, force=record)
+    try:
+        success = run_checks(config)
+        return success
+    finally:
+        finish_snapshot_recording(config, success)
+        finish_run_metrics(success)
+        release_run_lock(lock_file)
+
+def run_replay(config, run_ids):
+    """Replay recorded runs in order against a fresh temporary state, without network access
+    
+    Every run goes through the same fetch, diff and outbox code as a live run, but responses
+    come from the snapshot and notifications are only logged. The real state is never touched.
+    """
+    global _snapshot_replay, _snapshot_dir, _dry_run
+    
+    available = list_snapshot_runs()
+    if not available:
+        log(f"❌ Brak nagrań w {get_snapshot_dir()} - uruchom bota z --record")
+        return False
+    if not run_ids:
+        run_ids = available[-1:]
+    elif run_ids == ["all"]:
+        run_ids = available
+    missing = [run_id for run_id in run_ids if run_id not in available]
+    if missing:
+        log(f"❌ Nie znaleziono nagrań: {', '.join(missing)}")
+        return False
+    
+    _snapshot_dir = get_snapshot_dir()
+    data_dir = get_data_dir()
+    previous_data_dir = os.environ.get('INTERPELBOT_DATA_DIR')
+    _dry_run = True
+    all_successful = True
+    try:
+        with tempfile.TemporaryDirectory(prefix="interpelbot-replay-") as replay_dir:
+            os.environ['INTERPELBOT_DATA_DIR'] = replay_dir
+            
+            # MP names do not affect diffs, so reuse the cache instead of requiring MP lookups in the snapshot
+            for name in os.listdir(data_dir):
+                if name.startswith("mp_cache_") and name.endswith(".json"):
+                    shutil.copy(os.path.join(data_dir, name), replay_dir)
+            
+            for run_id in run_ids:
+                manifest = load_snapshot_run(run_id)
+                replay_config = dict(config, sejm_term=manifest['term'], fetch_mode=manifest['fetch_mode'],
+                                     api_page_size=manifest['api_page_size'])
+                replay_config['mattermost_webhook_url'] = get_mattermost_webhook_url() or "dry-run"
+                
+                log(f"▶️  Odtwarzanie nagrania {run_id} ({len(manifest['responses'])} odpowiedzi API)")
+                _snapshot_replay = manifest
+                started_at = time.perf_counter()
+                success = run_once(replay_config)
+                all_successful = all_successful and success
+                log(f"⏱️  Odtworzono nagranie {run_id} w {time.perf_counter() - started_at:.2f}s")
+    finally:
+        _snapshot_replay = None
+        _snapshot_dir = None
+        _dry_run = False
+        if previous_data_dir is None:
+            os.environ.pop('INTERPELBOT_DATA_DIR', None)
+        else:
+            os.environ['INTERPELBOT_DATA_DIR'] = previous_data_dir
+    return all_successful
+
+def get_daemon_settings(config):
+    """Get daemon settings from config merged with defaults"""
+    return get_settings_section(config, 'daemon', DEFAULT_DAEMON_SETTINGS)
+
+def run_daemon(config, record=False):
+    """Run check cycles on an internal schedule until SIGTERM/SIGINT"""
+    global _keep_state_warm, _config_mtime, _prometheus_enabled
+    
+    settings = get_daemon_settings(config)
+    interval = max(1.0, settings['interval_minutes'] * 60)
+    _keep_state_warm = True
+    
+    # config.json is only re-read when its modification time changes
+    try:
+        _config_mtime = os.path.getmtime(get_config_path())
+    except OSError:
+        _config_mtime = None
+    
+    def request_shutdown(signum, frame):
+        log(f"🛑 Otrzymano sygnał {signum} - kończę po bieżącym cyklu")
+        _shutdown_event.set()
+    
+    signal.signal(signal.SIGTERM, request_shutdown)
+    signal.signal(signal.SIGINT, request_shutdown)
+    
+    with _daemon_status_lock:
+        _daemon_status['started_at'] = time.time()
+        _daemon_status['interval'] = interval
+        _daemon_status['jitter'] = settings['jitter_seconds']
+    
+    health_server = None
+    _prometheus_enabled = settings['metrics']
+    if settings['health_port']:
+        health_server = start_health_server(settings['health_port'])
+    
+    log(f"🤖 Tryb ciągły: sprawdzanie co {interval / 60:g} min (+ do {settings['jitter_seconds']:g} s losowo)")
+    
+    try:
+        while not _shutdown_event.is_set():
+            config = reload_config_if_changed()
+            settings = get_daemon_settings(config)
+            _prometheus_enabled = settings['metrics']
+            interval = max(1.0, settings['interval_minutes'] * 60)
+            
+            cycle_started_at = time.time()
+            with _daemon_status_lock:
+                _daemon_status['last_cycle_started_at'] = cycle_started_at
+                _daemon_status['interval'] = interval
+                _daemon_status['jitter'] = settings['jitter_seconds']
+            
+            try:
+                success = run_once(config, record=record)
+            except Exception as e:
+                log(f"❌ Błąd podczas cyklu sprawdzania: {e}")
+                success = False
+            
+            with _daemon_status_lock:
+                _daemon_status['cycles'] += 1
+                _daemon_status['last_cycle_finished_at'] = time.time()
+                if success:
+                    _daemon_status['last_success_at'] = time.time()
+            
+            # Schedule from the cycle start so the cadence doesn't drift with cycle length
+            delay = cycle_started_at + interval + random.uniform(0, settings['jitter_seconds']) - time.time()
+            if delay > 0:
+                log(f"💤 Następne sprawdzenie za {int(delay)} s")
+                _shutdown_event.wait(delay)
+    finally:
+        _keep_state_warm = False
+        close_state_store()
+        if health_server is not None:
+            health_server.shutdown()
+        log("👋 Zakończono tryb ciągły")
+
+def get_health_status():
+    """Get the daemon health status and whether it is healthy"""
+    with _daemon_status_lock:
+        status = dict(_daemon_status)
+    
+    now = time.time()
+    reference = status['last_success_at'] or status['started_at'] or now
+    # Healthy until two full intervals (each with the configured jitter) pass without a successful cycle
+    jitter = status['jitter'] if status['jitter'] is not None else DEFAULT_DAEMON_SETTINGS['jitter_seconds']
+    healthy = now - reference < 2 * ((status['interval'] or 3600) + jitter)
+    status['status'] = "ok" if healthy else "stale"
+    return healthy, status
+
+class HealthRequestHandler(BaseHTTPRequestHandler):
+    """Serve the daemon health status on /health (and Prometheus metrics on /metrics)"""
+    
+    def do_GET(self):
+        if self.path.rstrip('/') == '/metrics' and _prometheus_enabled:
+            body = render_prometheus_metrics().encode('utf-8')
+            self.send_response(200)
+            self.send_header('Content-Type', 'text/plain; version=0.0.4; charset=utf-8')
+            self.send_header('Content-Length', str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+            return
+        
+        if self.path.rstrip('/') not in ('', '/health'):
+            self.send_error(404)
+            return
+        
+        healthy, status = get_health_status()
+        body = json.dumps(status).encode('utf-8')
+        self.send_response(200 if healthy else 503)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
     
-    # Collect all new answers from all MPs first
-    all_new_answers = []
+    def log_message(self, format, *args):
+        # Health checks every 30 s would flood the log
+        pass
+
+def start_health_server(port):
+    """Start the health endpoint in a background thread"""
+    try:
+        server = ThreadingHTTPServer(('', port), HealthRequestHandler)
+    except OSError as e:
+        log(f"⚠️  Nie udało się uruchomić endpointu /health na porcie {port}: {e}")
+        return None
     
-    # Process each MP and collect new answers
-    for mp_config in mps:
+    threading.Thread(target=server.serve_forever, name="health", daemon=True).start()
+    log(f"🩺 Endpoint /health nasłuchuje na porcie {port}")
+    return server
+
+def get_mp_ids_by_term(config):
+    """Group MP IDs from config by term (sejm_term first), skipping duplicates so no two workers write the same data file"""
+    mp_ids_by_term = {str(config.get('sejm_term', '10')): []}
+    for mp_config in config.get('mps', []):
         mp_id = mp_config.get('id')
         
         if not mp_id:
-            print("⚠️  Pomijam posła bez ID")
+            log("⚠️  Pomijam posła bez ID")
             continue
         
-        try:
-            new_answers = process_single_mp(mp_id, term)
-            if new_answers:
-                all_new_answers.extend(new_answers)
-        except Exception as e:
-            print(f"❌ Błąd podczas przetwarzania posła {mp_id}: {e}")
+        mp_ids = mp_ids_by_term.setdefault(get_mp_term(mp_config, config), [])
+        if mp_id in mp_ids:
+            log(f"⚠️  Pomijam zduplikowanego posła {mp_id}")
             continue
+        
+        mp_ids.append(mp_id)
+    return {term: mp_ids for term, mp_ids in mp_ids_by_term.items() if mp_ids}
+
+def run_checks(config):
+    """Fetch, compare and notify for all MPs from config; returns True if every MP was processed"""
+    set_active_config(config)
+    configure_logging(config)
+    
+    mps = config.get('mps', [])
+    
+    if not mps:
+        log("❌ Brak posłów w konfiguracji")
+        return False
+    
+    log(f"📋 Znaleziono {len(mps)} posłów w konfiguracji\n")
+    
+    # Set up the shared HTTP client used by all API and Mattermost calls
+    configure_http_client(config)
+    
+    # Load ETag/Last-Modified validators for conditional requests
+    load_http_cache(config)
+    
+    # Load notifications still waiting for delivery and the answer deadlines
+    load_outbox()
+    load_deadlines(config)
+    load_stats()
+    
+    # After sejm_term changed, the state of the previous term leaves the data root
+    if not migrate_root_state(config):
+        return False
+    
+    # Every term is checked with its own state; the HTTP pool, caches and outbox are shared
+    mp_ids_by_term = get_mp_ids_by_term(config)
+    all_processed = True
+    for term, mp_ids in mp_ids_by_term.items():
+        if len(mp_ids_by_term) > 1:
+            log(f"\n🗳️  Kadencja {term}: {len(mp_ids)} posłów")
+        if not check_term(config, term, mp_ids):
+            all_processed = False
+    
+    # Deliver queued notifications (including ones left over from earlier runs and deadline alerts)
+    with measure_stage('notify'):
+        enqueue_deadline_alerts()
+        deliver_outbox(config)
+    
+    save_deadlines()
+    save_stats()
+    save_http_cache()
+    
+    log(f"\n✅ Zakończono przetwarzanie wszystkich {len(mps)} posłów")
+    return all_processed
+
+def check_term(config, term, mp_ids):
+    """Fetch and compare the MPs of one term using that term's state; returns True if every MP was processed"""
+    select_state_term(term, config)
+    
+    # Load cached MP names so co-signers are resolved locally
+    load_mp_cache(term, config)
+    
+    # Apply paging settings and load the incremental sync state
+    configure_sync(config)
+    
+    # Open the state store (importing JSON state into SQLite on first use)
+    configure_state_store(config)
+    
+    # In bulk mode fetch the term-wide lists once and fan them out to every MP
+    mp_ids = list(mp_ids)
+    interpellations_by_mp = None
+    modified_since = None
+    bulk_validators = {}
+    fetch_mode = config.get('fetch_mode', DEFAULT_FETCH_MODE)
+    if fetch_mode == "bulk":
+        # Items of MPs outside the config matching a subscription are kept as one more state
+        rules_changed = False
+        if _subscriptions is not None:
+            mp_ids.append(SUBSCRIPTIONS_STATE_ID)
+            if _subscriptions.clubs and not is_mp_cache_fresh(term):
+                prefetch_mp_cache(term)
+            
+            # Changed criteria need the whole term lists to find the items they match now
+            rules_changed = subscriptions_changed()
+            if rules_changed:
+                log("🔁 Zmieniono kryteria subskrypcji - pobieram pełne listy kadencji")
+        
+        modified_since = None if rules_changed else get_modified_since(mp_ids)
+        
+        # Conditional requests are only safe when every MP already has stored results
+        has_all_results = not rules_changed and all(has_previous_results(mp_id) for mp_id in mp_ids)
+        interpellations_by_mp = fetch_all_interpellations_from_api(
+            term, modified_since, get_conditional_validators(bulk_validators, has_all_results))
+        
+        # With polling tiers every MP still re-checks its hot items
+        if interpellations_by_mp is NOT_MODIFIED and modified_since and _polling_settings['tiers']:
+            log("💤 Listy kadencji nie zmieniły się (304) - sprawdzam tylko interpelacje wg priorytetu")
+            interpellations_by_mp = {}
+        
+        if interpellations_by_mp is NOT_MODIFIED:
+            for mp_id in mp_ids:
+                mark_mp_synced(mp_id, full=not modified_since)
+            save_mp_cache(term)
+            save_sync_state()
+            close_state_store()
+            log(f"✅ Brak zmian w API kadencji {term}")
+            return True
+        
+        if interpellations_by_mp is None:
+            modified_since = None
+            if SUBSCRIPTIONS_STATE_ID in mp_ids:
+                mp_ids.remove(SUBSCRIPTIONS_STATE_ID)
+            log("⚠️  Nie udało się pobrać list dla całej kadencji - pobieram interpelacje dla każdego posła osobno")
+        elif _subscriptions is not None:
+            interpellations_by_mp[SUBSCRIPTIONS_STATE_ID] = select_subscribed_items(interpellations_by_mp, term)
+    elif fetch_mode != "per_mp":
+        log(f"⚠️  Nieznany tryb pobierania '{fetch_mode}' - używam trybu per_mp")
+    
+    if _subscriptions is not None and interpellations_by_mp is None:
+        log("ℹ️  Subskrypcje obejmują tylko interpelacje posłów z konfiguracji (pełne pokrycie w trybie bulk)")
+    
+    # Process each MP; new answers are queued in the outbox as each MP is saved
+    all_processed = True
+    stagger = get_daemon_settings(config)['mp_stagger_seconds'] if _keep_state_warm else 0
+    for new_answers in process_all_mps(mp_ids, term, get_max_workers(config), interpellations_by_mp, modified_since, stagger):
+        if new_answers is None:
+            all_processed = False
     
-    # Send consolidated notification if there are any new answers
-    if all_new_answers:
-        send_consolidated_notification(all_new_answers, term)
+    # Bulk validators cover every MP, so they are only kept if every MP was saved
+    if all_processed:
+        update_http_cache(bulk_validators)
     
-    print(f"\n✅ Zakończono przetwarzanie wszystkich {len(mps)} posłów")
+    save_mp_cache(term)
+    save_sync_state()
+    close_state_store()
+    return all_processed
 
 if __name__ == "__main__":
     main()
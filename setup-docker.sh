@@ -22,4 +22,4 @@ echo "   - mps (list of MPs with their IDs and Mattermost users)"
 echo "2. Run: docker-compose up -d"
 echo "3. Check logs: docker-compose logs -f"
 echo ""
-echo "The bot will run every hour automatically." 
\ No newline at end of file
+echo "The bot runs as a daemon and checks every hour by default (daemon.interval_minutes)." 
\ No newline at end of file
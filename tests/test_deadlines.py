@@ -0,0 +1,83 @@
+import heapq
+import time
+from datetime import date
+
+import pytest
+
+import interpelbot
+from interpelbot import Deadline, Interpellation, Reply, get_due_date
+
+def make_item(*replies, submission_date="2024-01-02"):
+    return Interpellation(
+        id="1", type="INT", title="w sprawie terminów", from_ids="1",
+        replies=len(replies), replies_data=tuple(replies), submission_date=submission_date
+    )
+
+def make_reply(prolongation, last_modified="2024-01-20T10:00:00", receipt_date=""):
+    return Reply(key="A", last_modified=last_modified, receipt_date=receipt_date, prolongation=prolongation)
+
+def test_unanswered_item_is_due_after_answer_days():
+    assert get_due_date(make_item()) == (date(2024, 1, 23), False)
+
+def test_prolongation_moves_the_deadline():
+    item = make_item(make_reply(True, receipt_date="2024-01-20"))
+    assert get_due_date(item) == (date(2024, 2, 19), True)
+
+def test_answered_item_has_no_deadline():
+    assert get_due_date(make_item(make_reply(True), make_reply(False))) == (None, False)
+    assert get_due_date(make_item(submission_date=None)) == (None, False)
+
+@pytest.fixture
+def engine(monkeypatch):
+    deadline = Deadline(id="1", type="INT", term="10", title="w sprawie terminów", due_date="2024-01-23")
+    heap = []
+    monkeypatch.setattr(interpelbot, '_deadlines', {'entries': {deadline.key: deadline}, 'indexed': set()})
+    monkeypatch.setattr(interpelbot, '_deadline_heap', heap)
+    monkeypatch.setattr(interpelbot, '_deadline_settings', dict(interpelbot.DEFAULT_DEADLINE_SETTINGS, enabled=True))
+    monkeypatch.setattr(interpelbot, '_deadlines_dirty', False)
+    monkeypatch.setattr(interpelbot, '_outbox', {'pending': [], 'delivered': {}, 'failed': []})
+    monkeypatch.setattr(interpelbot, 'save_outbox', lambda: None)
+    monkeypatch.setattr(interpelbot, 'convert_mp_ids_to_names', lambda from_ids, term: "Jan Kowalski")
+    return deadline, heap
+
+def test_stale_heap_entries_are_dropped(engine):
+    deadline, heap = engine
+    past = time.time() - 60
+    deadline.notified = ('reminder',)
+    heapq.heappush(heap, (past, deadline.key, 'reminder', deadline.due_date))   # already notified
+    heapq.heappush(heap, (past, deadline.key, 'overdue', "2024-01-01"))         # moved by a prolongation
+    heapq.heappush(heap, (past, "10:INT:2", 'overdue', "2024-01-23"))           # answered and dropped
+    heapq.heappush(heap, (past, deadline.key, 'overdue', deadline.due_date))
+    heapq.heappush(heap, (past + 1, deadline.key, 'overdue', deadline.due_date))  # duplicate push
+    heapq.heappush(heap, (time.time() + 3600, deadline.key, 'overdue', deadline.due_date))
+
+    due = interpelbot.pop_due_deadlines()
+
+    assert [(item.key, stage) for item, stage, _ in due] == [(deadline.key, 'overdue')]
+    assert deadline.notified == ('reminder',)
+    assert len(heap) == 1
+
+def test_unroutable_stage_stays_due(engine, monkeypatch):
+    deadline, heap = engine
+    entry = (time.time() - 60, deadline.key, 'overdue', deadline.due_date)
+    heapq.heappush(heap, entry)
+    monkeypatch.setattr(interpelbot, 'get_notification_routes', lambda *args: [])
+
+    interpelbot.enqueue_deadline_alerts()
+
+    assert deadline.notified == ()
+    assert heap == [entry]
+    assert interpelbot._outbox['pending'] == []
+
+def test_queued_stage_is_marked_notified(engine, monkeypatch):
+    deadline, heap = engine
+    heapq.heappush(heap, (time.time() - 60, deadline.key, 'overdue', deadline.due_date))
+    monkeypatch.setattr(interpelbot, 'get_notification_routes', lambda *args: [("https://mm.example/hooks/a", ())])
+
+    interpelbot.enqueue_deadline_alerts()
+
+    assert deadline.notified == ('overdue',)
+    assert interpelbot._deadlines_dirty
+    assert heap == []
+    [entry] = interpelbot._outbox['pending']
+    assert entry['kind'] == "deadline"
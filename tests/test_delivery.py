@@ -0,0 +1,27 @@
+import interpelbot
+from interpelbot import DEFAULT_NOTIFICATION_SETTINGS, build_delivery_batches, deliver_batch
+
+def make_entry(num, text):
+    return {'id': str(num), 'webhook_url': "https://mm.example/hooks/a", 'text': text}
+
+def test_oversized_entries_are_truncated(monkeypatch):
+    monkeypatch.setattr(interpelbot, 'format_outbox_message', lambda entry: entry['text'])
+    entries = [make_entry(1, "a" * 500), make_entry(2, "b" * 50), make_entry(3, "c" * 60)]
+
+    for digest in (False, True):
+        settings = dict(DEFAULT_NOTIFICATION_SETTINGS, digest=digest, max_message_length=100)
+        batches = build_delivery_batches(entries, settings)
+        assert all(len(text) <= 100 for _, text in batches)
+        assert [entry['id'] for batch_entries, _ in batches for entry in batch_entries] == ["1", "2", "3"]
+
+def test_long_retry_after_is_left_for_a_later_run(monkeypatch):
+    calls = []
+    def post(message, webhook_url):
+        calls.append(message)
+        return False, 3600.0
+    monkeypatch.setattr(interpelbot, 'post_mattermost_message', post)
+    monkeypatch.setattr(interpelbot, '_dry_run', False)
+    settings = dict(DEFAULT_NOTIFICATION_SETTINGS, retries_per_run=3, rate_per_second=0)
+
+    assert deliver_batch(([make_entry(1, "")], "wiadomość"), settings) == (False, 3600.0)
+    assert len(calls) == 1
@@ -0,0 +1,95 @@
+from interpelbot import Interpellation, Reply, diff_results, get_new_answers
+
+def make_item(num, *replies, item_type="INT", submission_date="2024-01-02"):
+    item = Interpellation(
+        id=str(num), type=item_type, title=f"w sprawie {num}", from_ids="1",
+        replies=len(replies), replies_data=tuple(replies), submission_date=submission_date
+    )
+    item.update_timing()
+    return item
+
+def make_reply(key, last_modified="2024-02-01T10:00:00", prolongation=False):
+    return Reply(key=key, last_modified=last_modified, author="Minister Zdrowia", prolongation=prolongation)
+
+def test_unchanged_items_are_skipped():
+    previous = [make_item(1, make_reply("A")), make_item(2)]
+    current = [make_item(1, make_reply("A")), make_item(2)]
+    changeset = diff_results(current, previous)
+    assert not changeset
+    assert not changeset.initial
+
+def test_initial_run_adds_everything_without_new_answers():
+    changeset = diff_results([make_item(1, make_reply("A"))], [])
+    assert changeset.initial
+    assert [change.item.id for change in changeset.added] == ["1"]
+    assert get_new_answers(changeset, "1", "10") == []
+
+def test_replaced_reply_with_the_same_count_is_a_new_reply():
+    previous = [make_item(1, make_reply("A"))]
+    current = [make_item(1, make_reply("B", "2024-03-01T10:00:00"))]
+    changeset = diff_results(current, previous)
+
+    [change] = changeset.changed
+    assert change.previous is previous[0]
+    assert [reply.key for reply in change.added_replies] == ["B"]
+    assert [reply.key for reply in change.removed_replies] == ["A"]
+    assert change.added_reply_ids == ("B",)
+    assert [change.item.id for change in changeset.with_new_replies] == ["1"]
+
+def test_changed_metadata_without_new_replies_is_not_a_new_answer():
+    previous = [make_item(1, make_reply("A"))]
+    current = [make_item(1, make_reply("A"))]
+    current[0].title = "w sprawie zmienionego tytułu"
+    changeset = diff_results(current, previous)
+
+    [change] = changeset.changed
+    assert change.added_replies == ()
+    assert changeset.with_new_replies == []
+
+def test_keyless_replies_are_matched_by_position():
+    previous = [make_item(1, make_reply(""))]
+    current = [make_item(1, make_reply(""), make_reply("", "2024-03-01T10:00:00"))]
+    changeset = diff_results(current, previous)
+
+    [change] = changeset.changed
+    assert change.added_reply_ids == ("#1",)
+    assert [reply.last_modified for reply in change.added_replies] == ["2024-03-01T10:00:00"]
+    assert change.removed_replies == ()
+
+def test_keyless_reply_gaining_a_key_replaces_it():
+    previous = [make_item(1, make_reply(""))]
+    current = [make_item(1, make_reply("A"))]
+    [change] = diff_results(current, previous).changed
+    assert change.added_reply_ids == ("A",)
+    assert len(change.removed_replies) == 1
+
+def test_duplicate_items_are_compared_once():
+    previous = [make_item(1)]
+    current = [make_item(1, make_reply("A")), make_item(1, make_reply("A")), make_item(2)]
+    changeset = diff_results(current, previous)
+
+    assert [change.item.id for change in changeset.changed] == ["1"]
+    assert [change.item.id for change in changeset.added] == ["2"]
+    assert changeset.removed == []
+
+def test_same_number_of_different_types_are_different_items():
+    previous = [make_item(1, item_type="INT")]
+    current = [make_item(1, item_type="INT"), make_item(1, make_reply("A"), item_type="ZAP")]
+    changeset = diff_results(current, previous)
+
+    assert changeset.changed == []
+    assert [change.item.key for change in changeset.added] == [("1", "ZAP")]
+
+def test_removed_items_are_reported():
+    previous = [make_item(1), make_item(2)]
+    changeset = diff_results([make_item(2)], previous)
+    assert changeset.removed == [previous[0]]
+
+def test_stored_submission_date_is_carried_over():
+    previous = [make_item(1, make_reply("A", "2024-01-12T10:00:00"), submission_date="2024-01-02")]
+    current = [make_item(1, make_reply("A", "2024-01-12T10:00:00"), submission_date=None)]
+    changeset = diff_results(current, previous)
+
+    assert not changeset
+    assert current[0].submission_date == "2024-01-02"
+    assert current[0].days_to_response == 10
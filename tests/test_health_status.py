@@ -0,0 +1,16 @@
+import time
+
+import interpelbot
+
+def set_status(monkeypatch, seconds_ago, jitter):
+    status = dict(interpelbot._daemon_status, interval=600, jitter=jitter, last_success_at=time.time() - seconds_ago)
+    monkeypatch.setattr(interpelbot, '_daemon_status', status)
+
+def test_configured_jitter_extends_the_margin(monkeypatch):
+    set_status(monkeypatch, 1500, jitter=300)
+    assert interpelbot.get_health_status()[0]
+
+    set_status(monkeypatch, 1500, jitter=0)
+    healthy, status = interpelbot.get_health_status()
+    assert not healthy
+    assert status['status'] == "stale"
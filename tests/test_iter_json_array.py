@@ -0,0 +1,41 @@
+import json
+
+import pytest
+
+from interpelbot import iter_json_array
+
+BODIES = [
+    '[1.5e10]',
+    '[1.5e10, -0.25, 12, 3E-2]',
+    '[{"num": 1, "title": "w sprawie ochrony zdrowia"}, {"num": 2, "replies": []}]',
+    '[true, false, null, "ż\\u0105", [1, [2.5]], 1e-7]',
+    ' [ 10 , 20 ] ',
+    '[]',
+]
+
+def split_at(data, *positions):
+    bounds = [0, *positions, len(data)]
+    return [data[start:end] for start, end in zip(bounds, bounds[1:])]
+
+@pytest.mark.parametrize("body", BODIES)
+def test_every_single_split(body):
+    data = body.encode('utf-8')
+    for position in range(len(data) + 1):
+        assert list(iter_json_array(split_at(data, position))) == json.loads(body), position
+
+@pytest.mark.parametrize("body", BODIES)
+def test_byte_by_byte(body):
+    data = body.encode('utf-8')
+    assert list(iter_json_array([data[i:i + 1] for i in range(len(data))])) == json.loads(body)
+
+def test_number_split_inside_exponent():
+    assert list(iter_json_array([b'[1.5e', b'10]'])) == [1.5e10]
+    assert list(iter_json_array([b'[1.', b'5e10]'])) == [1.5e10]
+
+def test_not_an_array_yields_nothing():
+    assert list(iter_json_array([b'{"error": ', b'"not found"}'])) == []
+
+@pytest.mark.parametrize("chunks", [[b'[1, 2'], [b'[1,', b' {"a": '], [b'[1 2]']])
+def test_malformed_or_truncated_array_raises(chunks):
+    with pytest.raises(json.JSONDecodeError):
+        list(iter_json_array(chunks))
@@ -0,0 +1,26 @@
+import pytest
+
+from interpelbot import ResponseStats, get_percentile
+
+@pytest.mark.parametrize("values, fraction, expected", [
+    ([1, 2], 0.5, 1),
+    (list(range(1, 101)), 0.5, 50),
+    (list(range(1, 101)), 0.9, 90),
+    (list(range(1, 101)), 0.99, 99),
+    ([7], 0.99, 7),
+    ([3, 1, 2], 0.9, 3),
+])
+def test_nearest_rank(values, fraction, expected):
+    assert get_percentile(values, fraction) == expected
+
+def test_empty_and_rounding():
+    assert get_percentile([], 0.5) is None
+    assert get_percentile([0.12345, 0.5], 0.5, 2) == 0.12
+
+@pytest.mark.parametrize("fraction", [0.1, 0.5, 0.9, 0.99])
+def test_matches_response_stats(fraction):
+    values = [3, 3, 8, 1, 20, 14, 2, 2, 9, 30, 5]
+    stats = ResponseStats()
+    for days in values:
+        stats.add(True, days)
+    assert get_percentile(values, fraction) == stats.percentile(fraction)
@@ -0,0 +1,63 @@
+import json
+import sqlite3
+
+import pytest
+
+import interpelbot
+
+@pytest.fixture
+def data_dir(tmp_path, monkeypatch):
+    monkeypatch.setenv('INTERPELBOT_DATA_DIR', str(tmp_path))
+    monkeypatch.setattr(interpelbot, '_root_state_checked', None)
+    return tmp_path
+
+def write_json(path, data):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(json.dumps(data), encoding='utf-8')
+
+def test_rollover_moves_previous_term_out_and_new_term_in(data_dir):
+    write_json(data_dir / "sync_state.json", {'term': "10", 'mps': {'1': {'last_sync': 1}}})
+    write_json(data_dir / "interpel_1.json", [{'id': "1", 'type': "INT", 'title': "kadencja 10"}])
+    write_json(data_dir / "term11" / "interpel_1.json", [{'id': "1", 'type': "INT", 'title': "kadencja 11"}])
+    write_json(data_dir / "outbox.json", {'pending': []})
+
+    assert interpelbot.migrate_root_state({'sejm_term': "11"})
+
+    assert json.loads((data_dir / "term10" / "interpel_1.json").read_text())[0]['title'] == "kadencja 10"
+    assert json.loads((data_dir / "term10" / "sync_state.json").read_text())['term'] == "10"
+    assert json.loads((data_dir / "interpel_1.json").read_text())[0]['title'] == "kadencja 11"
+    assert not (data_dir / "sync_state.json").exists()
+    assert not (data_dir / "term11").exists()
+    # State shared by all terms stays in the root
+    assert (data_dir / "outbox.json").exists()
+
+def test_same_term_and_unrecorded_owner_move_nothing(data_dir):
+    write_json(data_dir / "interpel_1.json", [])
+    assert interpelbot.migrate_root_state({'sejm_term': "10"})
+    assert (data_dir / "interpel_1.json").exists()
+
+    write_json(data_dir / "sync_state.json", {'term': "10", 'mps': {}})
+    interpelbot._root_state_checked = None
+    assert interpelbot.migrate_root_state({'sejm_term': "10"})
+    assert sorted(path.name for path in data_dir.iterdir()) == ["interpel_1.json", "sync_state.json"]
+
+def test_owner_is_read_from_the_sqlite_store(data_dir):
+    connection = sqlite3.connect(data_dir / "interpelbot.db")
+    connection.executescript(interpelbot.STATE_DB_SCHEMA)
+    connection.execute("INSERT INTO meta (key, value) VALUES ('term', '10')")
+    connection.commit()
+    connection.close()
+
+    assert interpelbot.get_root_state_owner() == "10"
+    assert interpelbot.migrate_root_state({'sejm_term': "11"})
+    assert (data_dir / "term10" / "interpelbot.db").exists()
+    assert not (data_dir / "interpelbot.db").exists()
+
+def test_conflicting_files_stop_the_run(data_dir):
+    write_json(data_dir / "sync_state.json", {'term': "10", 'mps': {}})
+    write_json(data_dir / "interpel_1.json", [])
+    write_json(data_dir / "term10" / "interpel_1.json", [])
+
+    assert not interpelbot.migrate_root_state({'sejm_term': "11"})
+    assert (data_dir / "sync_state.json").exists()
+    assert interpelbot._root_state_checked is None
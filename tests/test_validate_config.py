@@ -0,0 +1,11 @@
+from interpelbot import validate_config
+
+def test_numeric_mp_id_is_converted_with_a_warning(capsys):
+    config = {'mps': [{'id': 12}, {'id': "12", 'term': 9}]}
+    assert validate_config(config) == []
+    assert config['mps'][0]['id'] == "12"
+    assert "mps[0].id" in capsys.readouterr().out
+
+def test_other_mp_id_types_are_fatal():
+    assert validate_config({'mps': [{'id': ["12"]}]}) == ["mps[0].id musi być tekstem (np. \"['12']\")"]
+    assert validate_config({'mps': [{'id': True}]})